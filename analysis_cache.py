@@ -0,0 +1,127 @@
+"""
+Cache persistant (SQLite) des analyses de compatibilité Gemini
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class AnalysisCache:
+    """
+    Cache disque des analyses, indexé par une empreinte du contenu.
+    
+    La clé combine le texte normalisé de l'offre, le profil candidat, le
+    modèle et la version du prompt : toute modification de l'un d'eux
+    invalide naturellement les entrées existantes.
+    """
+    
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        """
+        Args:
+            path: Chemin du fichier SQLite
+            ttl_seconds: Durée de validité d'une entrée
+            max_entries: Nombre maximum d'entrées conservées (éviction LRU)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        
+        # Connexion partagée entre les workers du pipeline, protégée par un verrou
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analyses (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analyses_accessed ON analyses (accessed_at)"
+            )
+    
+    @staticmethod
+    def make_key(job_text: str, profile: str, model_name: str, prompt_version: str) -> str:
+        """
+        Calcule la clé de cache d'une analyse.
+        
+        Args:
+            job_text: Texte de l'offre d'emploi
+            profile: Profil du candidat
+            model_name: Nom du modèle Gemini
+            prompt_version: Version du gabarit de prompt
+            
+        Returns:
+            Empreinte SHA-256 hexadécimale
+        """
+        parts = [' '.join(job_text.split()), ' '.join(profile.split()), model_name, prompt_version]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Retourne l'analyse en cache pour une clé, ou None si absente ou expirée.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM analyses WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            
+            self._conn.execute(
+                "UPDATE analyses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        
+        return json.loads(row[0])
+    
+    def set(self, key: str, analysis: Dict) -> None:
+        """
+        Enregistre une analyse puis applique l'éviction (TTL et taille).
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, result, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(analysis, ensure_ascii=False), now, now)
+            )
+            
+            # Supprimer les entrées expirées
+            self._conn.execute(
+                "DELETE FROM analyses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            
+            # Supprimer les entrées les moins récemment utilisées au-delà de la limite
+            self._conn.execute(
+                """
+                DELETE FROM analyses WHERE key IN (
+                    SELECT key FROM analyses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Retourne les compteurs du cache (succès, échecs, nombre d'entrées).
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
\ No newline at end of file
@@ -2,13 +2,43 @@
 Application Streamlit - Assistant de Carrière
 Interface principale et orchestration du pipeline
 """
+import os
+import time
+from datetime import date
+from urllib.parse import urlparse
 import streamlit as st
 import pandas as pd
-from reliefweb_client import find_job_urls
-from scraper import scrape_job_description
-from gemini_analyzer import get_compatibility_analysis
+from reliefweb_client import find_job_records, commit_sync_state
+from scraper import fetch_job_page, parse_job_pages
+from gemini_analyzer import (
+    GeminiAnalyzer, ScreeningAnalyzer, CascadeAnalyzer, FakeGenerativeModel
+)
 from report_utils import generate_excel_export
-from config import SEARCH_QUERIES
+from pipeline import Stage, run_pipeline
+from prerank import rank_jobs
+from condenser import condense_job_text, estimate_tokens
+from dedup import find_near_duplicates, group_duplicates
+from rate_limit import limiter_stats
+from hedging import hedger_stats
+from circuit_breaker import CircuitBreaker
+from token_budget import RunBudget
+from profiles import load_profiles
+from embeddings import (
+    GeminiEmbedder, LocalEmbedder, HashingEmbedder, VectorStore, rank_jobs_semantic
+)
+from analysis_cache import AnalysisCache
+from page_cache import PageCache
+from job_store import JobStore, SORT_COLUMNS, text_hash
+from config import (
+    SEARCH_QUERIES, PRERANK_MIN_SCORE, RANKING_MODE,
+    EMBEDDING_BACKEND, EMBEDDING_MODEL, LOCAL_EMBEDDING_MODEL, VECTOR_STORE_DIR,
+    SCRAPE_WORKERS, ANALYSIS_WORKERS, PARSE_WORKERS, PARSE_CHUNKSIZE,
+    ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_TTL_DAYS, ANALYSIS_CACHE_MAX_ENTRIES, JOB_STORE_PATH,
+    PAGE_CACHE_PATH, PAGE_CACHE_MAX_MB, ANALYSIS_BATCH_MAX_JOBS, CASCADE_ENABLED,
+    CONDENSER_TOKEN_BUDGET, DEDUP_MAX_HAMMING,
+    CIRCUIT_BREAKER_FAILURES, CIRCUIT_BREAKER_COOLDOWN,
+    RUN_TOKEN_BUDGET, RUN_COST_BUDGET_USD
+)
 from credits import initialize_credits, show_credits_fixed_footer
 
 
@@ -21,69 +51,415 @@ st.set_page_config(
 # Initialiser les crédits dans la sidebar
 #initialize_credits(location="sidebar", language="fr")
 
-@st.cache_data(show_spinner=False)
-def run_full_analysis(api_key: str, max_jobs: int = None):
+
+@st.cache_resource
+def get_analysis_cache() -> AnalysisCache:
+    """
+    Ouvre le cache persistant des analyses (une instance par processus).
+    """
+    return AnalysisCache(
+        ANALYSIS_CACHE_PATH,
+        ttl_seconds=ANALYSIS_CACHE_TTL_DAYS * 24 * 3600,
+        max_entries=ANALYSIS_CACHE_MAX_ENTRIES
+    )
+
+
+@st.cache_resource
+def get_page_cache() -> PageCache:
+    """
+    Ouvre le cache disque des pages scrapées (une instance par processus).
+    """
+    return PageCache(PAGE_CACHE_PATH, max_bytes=PAGE_CACHE_MAX_MB * 1024 * 1024)
+
+
+@st.cache_resource
+def get_job_store() -> JobStore:
+    """
+    Ouvre l'historique des offres analysées (une instance par processus).
+    """
+    return JobStore(JOB_STORE_PATH)
+
+
+def selected_profiles(profile_ids):
+    """
+    Retourne les profils sélectionnés, dans l'ordre du registre.
+    
+    Args:
+        profile_ids: Identifiants des profils à évaluer (vide = tous)
+    """
+    profiles = load_profiles()
+    if not profile_ids:
+        return profiles
+    return [profile for profile in profiles if profile.id in profile_ids] or profiles
+
+
+@st.cache_resource
+def get_gemini_analyzer(api_key: str, offline: bool = False, profile_ids: tuple = ()):
+    """
+    Crée l'analyseur Gemini une seule fois par processus, par clé API et
+    par ensemble de profils.
+    
+    En mode cascade, un modèle rapide filtre les offres avant l'analyse
+    complète (voir CASCADE_ENABLED dans config.py).
+    
+    Args:
+        api_key: Clé API Gemini
+        offline: Utiliser le modèle local simulé au lieu de Gemini
+        profile_ids: Identifiants des profils évalués (vide = tous)
+    """
+    cache = get_analysis_cache()
+    profiles = selected_profiles(profile_ids)
+    scorer = GeminiAnalyzer(
+        api_key, cache=cache, model=FakeGenerativeModel(profiles) if offline else None,
+        profiles=profiles
+    )
+    if not CASCADE_ENABLED:
+        return scorer
+    
+    screener = ScreeningAnalyzer(
+        api_key, cache=cache, model=FakeGenerativeModel(profiles) if offline else None,
+        profiles=profiles
+    )
+    return CascadeAnalyzer(screener, scorer)
+
+
+@st.cache_resource
+def get_embedder(api_key: str, offline: bool = False):
+    """
+    Crée l'embedder configuré une seule fois par processus.
+    
+    Args:
+        api_key: Clé API Gemini
+        offline: Utiliser l'embedder local déterministe
+    """
+    if offline or EMBEDDING_BACKEND == "hashing":
+        return HashingEmbedder()
+    if EMBEDDING_BACKEND == "local":
+        return LocalEmbedder(LOCAL_EMBEDDING_MODEL)
+    return GeminiEmbedder(api_key, EMBEDDING_MODEL)
+
+
+@st.cache_resource
+def get_vector_store(name: str) -> VectorStore:
+    """
+    Ouvre le stockage vectoriel d'un embedder (une instance par processus).
+    """
+    return VectorStore(VECTOR_STORE_DIR, name)
+
+
+def score_job_records(job_records, api_key: str, offline: bool, profiles):
+    """
+    Calcule le score de pré-classement local de chaque offre (0 à 1).
+    
+    Une offre est classée selon le profil auquel elle correspond le mieux.
+    
+    Args:
+        job_records: Fiches d'offres
+        api_key: Clé API Gemini (embeddings distants)
+        offline: Utiliser l'embedder local déterministe
+        profiles: Profils évalués
+        
+    Returns:
+        Scores relatifs, dans l'ordre des fiches
+    """
+    job_texts = [f"{record['title']} {record['body']}" for record in job_records]
+    
+    if RANKING_MODE == "embedding":
+        try:
+            embedder = get_embedder(api_key, offline)
+            store = get_vector_store(embedder.name)
+            texts_by_url = {record["url"]: text for record, text in zip(job_records, job_texts)}
+            profile_scores = [
+                rank_jobs_semantic(store, embedder, texts_by_url, profile.text)[1]
+                for profile in profiles
+            ]
+            return [max(scores) for scores in zip(*profile_scores)]
+        except Exception as e:
+            st.warning(f"⚠️ Classement sémantique indisponible, repli sur BM25: {e}")
+    
+    profile_scores = [rank_jobs(job_texts, profile.text, SEARCH_QUERIES) for profile in profiles]
+    return [max(scores) for scores in zip(*profile_scores)]
+
+
+# Verdict des offres non envoyées au modèle faute de budget
+OVER_BUDGET = "HORS BUDGET"
+
+
+def analyze_condensed(analyzer, condensed_texts, budget: RunBudget):
+    """
+    Analyse un lot d'offres condensées pour tous les profils et y reporte
+    les tokens économisés et l'empreinte du texte analysé.
+    
+    Chaque offre n'est envoyée que si sa consommation projetée (tous
+    profils confondus) tient dans le budget de l'exécution ; la projection
+    est ensuite remplacée par la consommation réelle.
+    
+    Args:
+        analyzer: Analyseur exposant analyze_batch et project (Gemini ou cascade)
+        condensed_texts: Liste de CondensedText
+        budget: Budget de l'exécution
+        
+    Returns:
+        Pour chaque offre, dans l'ordre, un dictionnaire {identifiant du
+        profil: analyse}, ou OVER_BUDGET pour les offres non analysées
+    """
+    # Admission sur l'estimation locale des tokens : pas d'appel réseau par offre
+    projections = [analyzer.project(condensed.text, condensed.condensed_tokens)
+                   for condensed in condensed_texts]
+    admitted = [budget.admit(tokens, cost) for tokens, cost in projections]
+    
+    analyses = iter(analyzer.analyze_batch([
+        condensed.text for condensed, is_admitted in zip(condensed_texts, admitted)
+        if is_admitted
+    ]))
+    
+    results = []
+    for condensed, (tokens, cost), is_admitted in zip(condensed_texts, projections, admitted):
+        if not is_admitted:
+            results.append(OVER_BUDGET)
+            continue
+        profile_analyses = next(analyses)
+        for analysis in profile_analyses.values():
+            analysis["empreinte_texte"] = text_hash(condensed.text)
+        # La condensation est faite une fois par offre : économie comptée une fois
+        next(iter(profile_analyses.values()))["tokens_economises"] = condensed.tokens_saved
+        budget.settle(
+            tokens, cost,
+            sum(analysis.get("tokens_utilises", 0) for analysis in profile_analyses.values()),
+            sum(analysis.get("cout_usd", 0.0) for analysis in profile_analyses.values())
+        )
+        results.append(profile_analyses)
+    return results
+
+
+def run_full_analysis(api_key: str, max_jobs: int = None, incremental: bool = False,
+                      offline: bool = False, token_budget: int = 0, cost_budget: float = 0.0,
+                      profile_ids: tuple = ()):
     """
     Exécute le pipeline complet d'analyse des offres d'emploi.
     
+    La recherche, le scraping et la condensation sont faits une fois par
+    offre ; chaque offre est ensuite évaluée pour tous les profils dans les
+    mêmes requêtes. Les résultats sont enregistrés au fil de l'eau dans
+    l'historique des offres (voir job_store.py).
+    
     Args:
         api_key: Clé API Gemini
         max_jobs: Nombre maximum d'offres à analyser (None = toutes)
+        incremental: Ne traiter que les offres nouvelles ou modifiées
+            depuis la dernière synchronisation
+        offline: Utiliser le modèle local simulé au lieu de Gemini
+        token_budget: Tokens maximum de l'exécution (0 = illimité)
+        cost_budget: Coût maximum de l'exécution en dollars (0 = illimité)
+        profile_ids: Identifiants des profils évalués (vide = tous)
         
     Returns:
-        Liste de dictionnaires contenant les résultats d'analyse
+        Nombre d'offres analysées pendant l'exécution
     """
-    results = []
+    analyzed = set()
+    job_store = get_job_store()
+    profiles = selected_profiles(profile_ids)
+    profile_names = {profile.id: profile.name for profile in profiles}
+    analyzer = get_gemini_analyzer(api_key, offline, profile_ids)
+    page_cache = get_page_cache()
     
-    # Étape 1: Recherche des URLs
+    # Étape 1: Recherche des offres (métadonnées et texte via l'API)
     with st.spinner("🔍 Recherche des offres d'emploi sur ReliefWeb..."):
-        job_urls = find_job_urls(SEARCH_QUERIES)
+        job_records = find_job_records(SEARCH_QUERIES, incremental=incremental)
     
-    if not job_urls:
+    if not job_records:
         st.warning("Aucune offre d'emploi trouvée.")
-        return results
+        return 0
+    
+    # Pré-classement local : les offres les plus prometteuses d'abord
+    found_records = job_records
+    found_count = len(job_records)
+    scores = score_job_records(job_records, api_key, offline, profiles)
+    for record, score in zip(job_records, scores):
+        record["prerank_score"] = float(score)
+    
+    # Offres traitées, dont les marqueurs de synchronisation peuvent avancer :
+    # les offres écartées au pré-classement le sont d'emblée
+    handled = {record["url"] for record in job_records
+               if record["prerank_score"] < PRERANK_MIN_SCORE}
+    job_records = sorted(
+        (record for record in job_records if record["prerank_score"] >= PRERANK_MIN_SCORE),
+        key=lambda record: record["prerank_score"],
+        reverse=True
+    )
+    
+    # Doublons (reposts, versions linguistiques) : une seule analyse par groupe,
+    # le représentant étant l'offre la mieux pré-classée
+    duplicates = find_near_duplicates(
+        {record["url"]: record["body"] for record in job_records if record["body"]},
+        max_distance=DEDUP_MAX_HAMMING
+    )
+    duplicate_groups = group_duplicates(duplicates)
+    records_by_url = {record["url"]: record for record in job_records}
+    job_records = [record for record in job_records if record["url"] not in duplicates]
     
     # Limiter le nombre d'offres si spécifié
     if max_jobs:
-        job_urls = job_urls[:max_jobs]
+        job_records = job_records[:max_jobs]
+    
+    if not job_records:
+        st.warning("Aucune offre pertinente après pré-classement.")
+        commit_sync_state(found_records, handled)
+        return 0
+    
+    # Projection locale de la consommation (textes plafonnés au budget de condensation)
+    budget = RunBudget(token_budget or None, cost_budget or None)
+    projected_tokens, projected_cost = 0, 0.0
+    for record in job_records:
+        text_tokens = estimate_tokens(record["body"]) if record["body"] else CONDENSER_TOKEN_BUDGET
+        tokens, cost = analyzer.project(record["body"], min(text_tokens, CONDENSER_TOKEN_BUDGET))
+        projected_tokens += tokens
+        projected_cost += cost
     
-    st.info(f"📊 {len(job_urls)} offres trouvées. Analyse en cours...")
+    duplicate_count = sum(len(duplicate_groups.get(record["url"], [])) for record in job_records)
+    projected_tokens_label = f"{projected_tokens:,} tokens".replace(",", " ")
+    st.info(f"📊 {found_count} offres trouvées, {len(job_records)} retenues "
+            f"après pré-classement ({duplicate_count} doublons rattachés). "
+            f"Coût projeté : ${projected_cost:.3f} ({projected_tokens_label}). "
+            f"Analyse en cours...")
+    if (cost_budget and projected_cost > cost_budget) or (token_budget and projected_tokens > token_budget):
+        st.warning("💰 La projection dépasse le budget : les offres les moins bien "
+                   "pré-classées ne seront pas analysées.")
     
-    # Étape 2: Analyse de chaque offre
+    # Consommation projetée affichée avant l'exécution, réelle à la fin
+    with st.sidebar:
+        st.markdown("### 💰 Consommation")
+        col_projected, col_actual = st.columns(2)
+        col_projected.metric("Projetée", f"${projected_cost:.3f}", projected_tokens_label,
+                             delta_color="off")
+        actual_spend = col_actual.empty()
+        actual_spend.metric("Réelle", "…", "en cours", delta_color="off")
+        if token_budget or cost_budget:
+            limits = [f"{token_budget:,} tokens".replace(",", " ")] if token_budget else []
+            limits += [f"${cost_budget:.2f}"] if cost_budget else []
+            st.caption(f"Budget : {' / '.join(limits)}")
+    
+    # Étape 2: Scraping et analyse en pipeline (les étapes se recouvrent)
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for idx, url in enumerate(job_urls):
-        status_text.text(f"Analyse de l'offre {idx + 1}/{len(job_urls)}...")
-        
-        # Scraping
-        job_text = scrape_job_description(url)
-        
-        if not job_text:
-            st.warning(f"⚠️ Impossible de récupérer le contenu de: {url}")
-            continue
-        
-        # Analyse avec Gemini
-        analysis = get_compatibility_analysis(job_text, api_key)
+    # Disjoncteur par hôte : un site lent ou en panne est ignoré après
+    # quelques échecs au lieu de ralentir toute l'exécution
+    page_breaker = CircuitBreaker(CIRCUIT_BREAKER_FAILURES, CIRCUIT_BREAKER_COOLDOWN)
+    
+    def fetch(record):
+        """Texte de l'offre : champ body de l'API, sinon page scrapée (heure notée)."""
+        if record["body"]:
+            return {"url": record["url"], "text": record["body"]}
+        page = fetch_job_page(record["url"], page_cache, page_breaker)
+        if page is not None:
+            record["fetched_at"] = time.time()
+        return page
+    
+    stages = [
+        # Le scraping n'intervient que si l'API n'a pas fourni le texte
+        Stage("scraping", fetch, workers=SCRAPE_WORKERS),
+        # Parsing HTML par lots dans le pool de processus
+        Stage(
+            "parsing",
+            lambda pages: parse_job_pages(pages, page_cache),
+            workers=PARSE_WORKERS or os.cpu_count() or 1,
+            batch_size=PARSE_CHUNKSIZE
+        ),
+        # Condensation par sections sous le budget de tokens
+        Stage(
+            "condensation",
+            lambda job_text: condense_job_text(job_text, CONDENSER_TOKEN_BUDGET),
+            workers=1
+        ),
+        # Analyse groupée : plusieurs offres par requête Gemini
+        Stage(
+            "analyse",
+            lambda condensed_texts: analyze_condensed(analyzer, condensed_texts, budget),
+            workers=ANALYSIS_WORKERS,
+            batch_size=ANALYSIS_BATCH_MAX_JOBS,
+            batch_wait=1.0
+        )
+    ]
+    
+    unreachable = set()
+    over_budget = []
+    
+    def collect(outcome):
+        record = outcome.item
+        url = record["url"]
         
-        # Stocker les résultats
-        result = {
-            "URL": url,
-            "Verdict": analysis["verdict"],
-            "Score": analysis["score_pertinence"],
-            "Analyse": analysis["analyse_succincte"],
-            "Points Forts": ", ".join(analysis["points_forts"]),
-            "Points Faibles": ", ".join(analysis["points_faibles"])
-        }
-        results.append(result)
+        if outcome.dropped_at in ("scraping", "parsing"):
+            unreachable.add(url)
+        elif outcome.result == OVER_BUDGET:
+            over_budget.append(url)
+        elif outcome.result is not None:
+            unreachable.discard(url)
+            analyzed.add(url)
+            # Une analyse en erreur (Gemini, réponse illisible) reste à refaire
+            if all(analysis["verdict"] != "ERREUR" for analysis in outcome.result.values()):
+                handled.add(url)
+                handled.update(duplicate_groups.get(url, []))
+            
+            # Enregistrer une analyse par profil, verdicts recopiés sur les doublons
+            profile_analyses = [
+                (profile_id, profile_names[profile_id], analysis)
+                for profile_id, analysis in outcome.result.items()
+            ]
+            job_store.save_job(record, profile_analyses,
+                               profile_analyses[0][2]["empreinte_texte"])
+            for duplicate_url in duplicate_groups.get(url, []):
+                # Même empreinte que si le doublon avait été analysé lui-même
+                duplicate = records_by_url[duplicate_url]
+                condensed = condense_job_text(duplicate["body"], CONDENSER_TOKEN_BUDGET)
+                job_store.save_job(duplicate, profile_analyses,
+                                   text_hash(condensed.text), duplicate_of=url)
+    
+    for done, outcome in enumerate(run_pipeline(job_records, stages), start=1):
+        status_text.text(f"Analyse de l'offre {done}/{len(job_records)}...")
+        collect(outcome)
         
         # Mise à jour de la barre de progression
-        progress_bar.progress((idx + 1) / len(job_urls))
+        progress_bar.progress(done / len(job_records))
+    
+    # Nouvelle tentative pour les pages ignorées dont l'hôte a récupéré
+    skipped = page_breaker.pop_skipped()
+    open_hosts = set(page_breaker.open_hosts())
+    retry_records = [records_by_url[url] for url in skipped
+                     if urlparse(url).hostname not in open_hosts]
+    if retry_records:
+        status_text.text(f"Nouvelle tentative pour {len(retry_records)} pages ignorées...")
+        for outcome in run_pipeline(retry_records, stages):
+            collect(outcome)
+    skipped = set(skipped) - {record["url"] for record in retry_records}
+    skipped.update(page_breaker.pop_skipped())
     
     progress_bar.empty()
     status_text.empty()
     
-    return results
+    for url in sorted(unreachable - skipped):
+        st.warning(f"⚠️ Impossible de récupérer le contenu de: {url}")
+    if skipped:
+        with st.expander(f"⏭️ {len(skipped)} pages ignorées (hôtes indisponibles), "
+                         f"à relancer plus tard"):
+            st.markdown("\n".join(f"- {url}" for url in sorted(skipped)))
+    if over_budget:
+        st.warning(f"💰 Budget atteint : {len(over_budget)} offres n'ont pas été analysées.")
+    
+    # Les offres non traitées (coupure à max_jobs, budget, hôtes indisponibles,
+    # analyses en erreur) seront redemandées à la prochaine synchronisation
+    # incrémentale ; une page définitivement inaccessible ne doit pas bloquer
+    # le marqueur
+    handled.update(unreachable - skipped)
+    commit_sync_state(found_records, handled)
+    
+    # Consommation réelle de l'exécution
+    spend = budget.stats()
+    actual_spend.metric("Réelle", f"${spend['actual_cost']:.3f}",
+                        f"{spend['actual_tokens']:,.0f} tokens".replace(",", " "),
+                        delta_color="off")
+    
+    return len(analyzed)
 
 
 # Interface utilisateur
@@ -108,6 +484,45 @@ with st.sidebar:
         help="Limiter le nombre d'offres pour un test rapide"
     )
     
+    sync_mode = st.radio(
+        "Synchronisation",
+        ["Incrémentale", "Complète"],
+        help="Incrémentale : uniquement les offres nouvelles ou modifiées depuis "
+             "la dernière recherche. Complète : resynchronise toutes les offres publiées."
+    )
+    
+    offline = st.checkbox(
+        "Mode hors ligne (modèle simulé)",
+        help="Remplace Gemini par un modèle local déterministe, sans clé API ni quota"
+    )
+    
+    cost_budget = st.number_input(
+        "Budget par exécution ($)",
+        min_value=0.0,
+        value=float(RUN_COST_BUDGET_USD),
+        step=0.5,
+        help="Les offres les moins prioritaires ne sont plus analysées une fois "
+             "le budget atteint (0 = illimité)"
+    )
+    
+    token_budget = st.number_input(
+        "Budget de tokens par exécution",
+        min_value=0,
+        value=RUN_TOKEN_BUDGET,
+        step=10000,
+        help="0 = illimité"
+    )
+    
+    available_profiles = {profile.id: profile.name for profile in load_profiles()}
+    profile_ids = st.multiselect(
+        "Profils évalués",
+        list(available_profiles),
+        default=list(available_profiles),
+        format_func=available_profiles.get,
+        help="Chaque offre est évaluée pour chacun des profils (fichiers du "
+             "répertoire profiles/), en une seule recherche"
+    )
+    
     st.markdown("---")
     st.markdown("### 📋 Catégories de recherche")
     for category, queries in SEARCH_QUERIES.items():
@@ -117,68 +532,169 @@ with st.sidebar:
 
 # Bouton principal
 if st.button("🚀 Lancer l'analyse", type="primary", use_container_width=True):
-    if not api_key:
+    if not api_key and not offline:
         st.error("⚠️ Veuillez entrer votre clé API Gemini dans la barre latérale.")
     else:
-        # Exécuter l'analyse
-        results = run_full_analysis(api_key, max_jobs)
+        # Exécuter l'analyse (résultats enregistrés dans l'historique)
+        analyzed_count = run_full_analysis(api_key, max_jobs, sync_mode == "Incrémentale",
+                                           offline, token_budget, cost_budget,
+                                           tuple(profile_ids))
         
-        if results:
-            st.success(f"✅ Analyse terminée ! {len(results)} offres analysées.")
-            
-            # Afficher les résultats
-            df = pd.DataFrame(results)
-            
-            # Tri par score décroissant
-            df = df.sort_values("Score", ascending=False)
-            
-            # Affichage avec couleurs conditionnelles
-            st.subheader("📊 Résultats de l'analyse")
+        if analyzed_count:
+            st.success(f"✅ Analyse terminée ! {analyzed_count} offres analysées.")
+        else:
+            st.warning("Aucune nouvelle offre analysée.")
+
+# Résultats de l'historique, filtrés et triés par le stockage
+job_store = get_job_store()
+choices = job_store.distinct_values()
+
+if choices["profiles"]:
+    st.subheader("📊 Résultats de l'analyse")
+    
+    col_profiles, col_verdicts, col_categories = st.columns(3)
+    filter_profiles = col_profiles.multiselect("Profils", choices["profiles"])
+    filter_verdicts = col_verdicts.multiselect("Verdicts", choices["verdicts"])
+    filter_categories = col_categories.multiselect("Catégories", choices["categories"])
+    col_score, col_sort, col_open = st.columns(3)
+    min_score = col_score.slider("Score minimum", 0, 100, 0)
+    order_by = col_sort.selectbox("Trier par", list(SORT_COLUMNS))
+    open_only = col_open.checkbox("Offres encore ouvertes uniquement", value=True)
+    
+    filters = {
+        "profiles": filter_profiles or None,
+        "verdicts": filter_verdicts or None,
+        "categories": filter_categories or None,
+        "min_score": min_score,
+        "closing_after": date.today().isoformat() if open_only else ""
+    }
+    df = pd.DataFrame(job_store.query(order_by=order_by, **filters))
+    
+    if df.empty:
+        st.info("Aucun résultat ne correspond aux filtres.")
+    else:
+        summary = job_store.summary(**filters)
+        profile_names = sorted(df["Profil"].unique())
+        st.caption(f"{summary['jobs']} offres, {summary['rows']} analyses "
+                   f"pour {len(profile_names)} profil(s)")
+        
+        # Créer des onglets pour les différentes vues, dont un par profil
+        # lorsque plusieurs profils sont évalués
+        profile_tabs = [f"👤 {name}" for name in profile_names] if len(profile_names) > 1 else []
+        tab1, tab2, tab3, tab_matrix, *tabs_by_profile = st.tabs(
+            ["📋 Tableau complet", "✅ Compatibles", "📈 Statistiques", "🧮 Matrice"]
+            + profile_tabs
+        )
+        
+        with tab1:
+            st.dataframe(
+                df,
+                use_container_width=True,
+                column_config={
+                    "URL": st.column_config.LinkColumn("Lien"),
+                    "Score": st.column_config.ProgressColumn(
+                        "Score",
+                        format="%d",
+                        min_value=0,
+                        max_value=100
+                    )
+                }
+            )
+        
+        with tab2:
+            compatible_verdicts = [
+                verdict for verdict in ("COMPATIBLE", "MOYENNEMENT COMPATIBLE")
+                if not filter_verdicts or verdict in filter_verdicts
+            ]
+            compatibles = pd.DataFrame(job_store.query(
+                order_by=order_by, **{**filters, "verdicts": compatible_verdicts}
+            ))
+            st.write(f"**{len(compatibles)} offres compatibles trouvées**")
+            st.dataframe(compatibles, use_container_width=True)
+        
+        with tab3:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Score moyen", f"{summary['mean_score']:.1f}")
+            with col2:
+                st.metric("Score maximum", f"{summary['max_score']:.0f}")
+            with col3:
+                st.metric("Taux de compatibilité",
+                          f"{summary['compatible']/summary['rows']*100:.1f}%")
             
-            # Créer des onglets pour les différentes vues
-            tab1, tab2, tab3 = st.tabs(["📋 Tableau complet", "✅ Compatibles", "📈 Statistiques"])
+            st.metric(
+                "Tokens économisés par la condensation",
+                f"{summary['tokens_saved']:,}".replace(",", " ")
+            )
             
-            with tab1:
+            # Répartition des offres par catégorie de recherche
+            st.markdown("**Répartition par catégorie**")
+            st.bar_chart(pd.Series(job_store.category_counts(**filters), dtype="int64"))
+        
+        with tab_matrix:
+            # Matrice offres × profils des scores de compatibilité
+            score_matrix = df.pivot_table(
+                index=["Titre", "URL"], columns="Profil", values="Score", aggfunc="max"
+            )[profile_names]
+            score_matrix = score_matrix.loc[
+                score_matrix.max(axis=1).sort_values(ascending=False).index
+            ]
+            st.dataframe(score_matrix, use_container_width=True)
+        
+        for profile_name, profile_tab in zip(profile_names, tabs_by_profile):
+            with profile_tab:
+                profile_df = pd.DataFrame(job_store.query(
+                    order_by=order_by, **{**filters, "profiles": [profile_name]}
+                ))
+                profile_compatibles = profile_df["Verdict"].eq("COMPATIBLE").sum()
+                st.write(f"**{profile_compatibles} offres compatibles sur {len(profile_df)}**")
                 st.dataframe(
-                    df,
+                    profile_df,
                     use_container_width=True,
-                    column_config={
-                        "URL": st.column_config.LinkColumn("Lien"),
-                        "Score": st.column_config.ProgressColumn(
-                            "Score",
-                            format="%d",
-                            min_value=0,
-                            max_value=100
-                        )
-                    }
+                    column_config={"URL": st.column_config.LinkColumn("Lien")}
                 )
-            
-            with tab2:
-                compatibles = df[df["Verdict"].str.contains("COMPATIBLE", na=False)]
-                st.write(f"**{len(compatibles)} offres compatibles trouvées**")
-                st.dataframe(compatibles, use_container_width=True)
-            
-            with tab3:
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Score moyen", f"{df['Score'].mean():.1f}")
-                with col2:
-                    st.metric("Score maximum", f"{df['Score'].max():.0f}")
-                with col3:
-                    compatible_count = len(df[df["Verdict"] == "COMPATIBLE"])
-                    st.metric("Taux de compatibilité", f"{compatible_count/len(df)*100:.1f}%")
-            
-            # Bouton d'export
-            st.markdown("---")
-            excel_data = generate_excel_export(df)
-            st.download_button(
-                label="📥 Télécharger les résultats (Excel)",
-                data=excel_data,
-                file_name="resultats_analyse_emploi.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        
+        # Bouton d'export
+        st.markdown("---")
+        excel_data = generate_excel_export(df)
+        st.download_button(
+            label="📥 Télécharger les résultats (Excel)",
+            data=excel_data,
+            file_name="resultats_analyse_emploi.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+# Statistiques du cache d'analyse (affichées après l'exécution pour être à jour)
+with st.sidebar:
+    st.markdown("---")
+    st.markdown("### 💾 Cache d'analyse")
+    cache_stats = get_analysis_cache().stats()
+    col_hits, col_misses = st.columns(2)
+    col_hits.metric("Succès", cache_stats["hits"])
+    col_misses.metric("Échecs", cache_stats["misses"])
+    st.caption(f"{cache_stats['entries']} analyses en cache")
+    
+    # Limites courantes des services amont (ajustées pendant l'exécution)
+    current_limits = limiter_stats()
+    if current_limits:
+        st.markdown("### 🚦 Débits")
+        for name, limits in sorted(current_limits.items()):
+            st.caption(
+                f"**{name}** : {limits['rate']:.2f} req/s, "
+                f"{limits['concurrency']} en parallèle, "
+                f"{limits['throttled']} limitations"
+            )
+    
+    # Percentiles de latence des appels Gemini et requêtes couvertes
+    latencies = {name: stats for name, stats in hedger_stats().items() if stats["p50"] is not None}
+    if latencies:
+        st.markdown("### ⏱️ Latences Gemini")
+        for name, stats in sorted(latencies.items()):
+            st.caption(
+                f"**{name}** : p50 {stats['p50']:.1f}s, p95 {stats['p95']:.1f}s, "
+                f"p99 {stats['p99']:.1f}s ({stats['hedges']} doublons, "
+                f"{stats['hedge_wins']} gagnants sur {stats['calls']} appels)"
             )
-        else:
-            st.warning("Aucun résultat à afficher.")
 
 # Instructions
 with st.expander("ℹ️ Comment utiliser cette application"):
@@ -191,7 +707,8 @@ with st.expander("ℹ️ Comment utiliser cette application"):
     
     L'application recherche automatiquement les offres d'emploi sur ReliefWeb,
     les analyse avec l'IA Gemini, et vous fournit un verdict de compatibilité
-    basé sur votre profil (configuré dans `config.py`).
+    basé sur votre profil (configuré dans `config.py`), ou sur chacun des profils
+    placés dans le répertoire `profiles/` (un fichier `.md` ou `.txt` par personne).
     """)
 
 # Footer avec crédits
@@ -0,0 +1,59 @@
+"""
+Micro-benchmark des backends d'extraction sur des pages d'offres enregistrées
+
+Usage:
+    python bench_extraction.py <dossier_de_pages_html> [répétitions]
+"""
+import glob
+import os
+import sys
+import time
+
+from extraction import available_backends, extract_text
+
+
+def run_benchmark(pages_dir: str, repeat: int = 5) -> None:
+    """
+    Compare le temps d'extraction et la taille du texte produit par backend.
+    
+    Les fichiers *.html du dossier sont utilisés tels quels ; un fichier
+    voisin <nom>.url peut contenir l'URL d'origine pour activer les
+    sélecteurs propres au site.
+    
+    Args:
+        pages_dir: Dossier contenant les pages HTML enregistrées
+        repeat: Nombre de passes par backend
+    """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        with open(path, "rb") as f:
+            html = f.read()
+        url_path = os.path.splitext(path)[0] + ".url"
+        url = ""
+        if os.path.exists(url_path):
+            with open(url_path, "r", encoding="utf-8") as f:
+                url = f.read().strip()
+        pages.append((html, url))
+    
+    if not pages:
+        print(f"Aucune page HTML trouvée dans {pages_dir}")
+        return
+    
+    print(f"{len(pages)} pages, {repeat} passes par backend")
+    print(f"{'Backend':<14}{'ms/page':>10}{'caractères moyens':>20}")
+    for backend in available_backends():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            texts = [extract_text(html, url, backend) for html, url in pages]
+        elapsed = time.perf_counter() - start
+        
+        ms_per_page = elapsed / (repeat * len(pages)) * 1000
+        mean_chars = sum(len(text) for text in texts) / len(texts)
+        print(f"{backend:<14}{ms_per_page:>10.2f}{mean_chars:>20.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    run_benchmark(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 5)
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Disjoncteur par hôte : suivi de santé des sites d'offres et échec rapide
+"""
+import threading
+import time
+from typing import Dict, List
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur partagé entre threads, un circuit par hôte.
+
+    Après `failure_threshold` échecs consécutifs, le circuit d'un hôte
+    s'ouvre : ses URLs sont ignorées pendant `cooldown` secondes et notées
+    pour une nouvelle tentative. Passé ce délai, un seul appel d'essai est
+    autorisé ; il referme le circuit s'il réussit, le rouvre sinon.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        """
+        Args:
+            failure_threshold: Échecs consécutifs avant ouverture du circuit
+            cooldown: Durée d'ouverture du circuit (secondes)
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        self._trial_in_flight: Dict[str, bool] = {}
+        self._skipped: List[str] = []
+
+    def allow(self, host: str) -> bool:
+        """
+        Indique si un appel vers l'hôte est autorisé.
+
+        Un appel autorisé doit être suivi de record_success ou record_failure,
+        ou à défaut de release_trial.
+        """
+        with self._lock:
+            open_until = self._open_until.get(host)
+            if open_until is None:
+                return True
+            if time.monotonic() < open_until or self._trial_in_flight.get(host):
+                return False
+            # Circuit semi-ouvert : un seul appel d'essai à la fois
+            self._trial_in_flight[host] = True
+            return True
+
+    def record_success(self, host: str) -> None:
+        """Referme le circuit de l'hôte après un appel réussi."""
+        with self._lock:
+            self._failures.pop(host, None)
+            self._open_until.pop(host, None)
+            self._trial_in_flight.pop(host, None)
+
+    def release_trial(self, host: str) -> None:
+        """
+        Libère l'appel d'essai d'un hôte terminé sans verdict (ex: erreur
+        locale imprévue) : le circuit reste ouvert et un nouvel essai est
+        permis.
+        """
+        with self._lock:
+            self._trial_in_flight.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        """Compte un échec (erreur, timeout) et ouvre le circuit au seuil."""
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            trial = self._trial_in_flight.pop(host, False)
+            if trial or failures >= self.failure_threshold:
+                # Les appels encore en vol prolongent l'ouverture sans la signaler
+                if trial or failures == self.failure_threshold:
+                    print(f"Hôte {host} ignoré pendant {self.cooldown:.0f}s "
+                          f"après {failures} échecs consécutifs")
+                self._open_until[host] = time.monotonic() + self.cooldown
+
+    def record_skip(self, url: str) -> None:
+        """Note une URL ignorée à cause d'un circuit ouvert."""
+        with self._lock:
+            self._skipped.append(url)
+
+    def pop_skipped(self) -> List[str]:
+        """Retourne et vide la liste des URLs ignorées."""
+        with self._lock:
+            skipped, self._skipped = self._skipped, []
+            return skipped
+
+    def open_hosts(self) -> List[str]:
+        """Retourne les hôtes dont le circuit est ouvert."""
+        now = time.monotonic()
+        with self._lock:
+            return [host for host, until in self._open_until.items() if until > now]
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Condensation des offres d'emploi par sections, sous un budget de tokens
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+
+# Sections prioritaires : le cœur du poste et des exigences
+CORE_SECTION_PATTERN = re.compile(
+    r"responsibilit|duties|tasks|scope of work|deliverables|key functions|"
+    r"what you will do|role|qualification|requirement|skills|competenc|"
+    r"experience|education|profile|expertise|languages?|"
+    r"responsabilit|missions?|tâches|profil|compétences|exigences|formation|expérience",
+    re.IGNORECASE
+)
+
+# Titres de sections sans intérêt pour l'analyse de compatibilité (titre entier)
+BOILERPLATE_SECTION_PATTERN = re.compile(
+    r"how to apply|application (process|procedure|instructions)|disclaimer|"
+    r"equal (employment )?opportunit(y|ies)( employer)?|diversity( (and|&) inclusion)?|"
+    r"safeguarding( policy)?|about (us|the organi[sz]ation|the company)|who we are|"
+    r"our values|what we offer|"
+    r"(salary|remuneration|compensation|benefits)( (and|&) "
+    r"(salary|remuneration|compensation|benefits|conditions))?|"
+    r"fraud (warning|alert|notice)|privacy( notice| policy)?|"
+    r"comment postuler|candidature|avertissement|qui sommes-nous|à propos( de nous)?|"
+    r"rémunération|avantages",
+    re.IGNORECASE
+)
+
+# Paragraphes types de fin d'annonce, à écarter où qu'ils se trouvent
+BOILERPLATE_PARAGRAPH_PATTERN = re.compile(
+    r"equal opportunit|only shortlisted candidates|does not charge (a|any) fee|"
+    r"zero tolerance|sexual exploitation|all applications will be treated|"
+    r"we regret that we|will not be considered|"
+    r"seul(e)?s les candidat(e)?s présélectionné(e)?s",
+    re.IGNORECASE
+)
+
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+(.*)$")
+_BOLD_HEADING = re.compile(r"^\*\*(.+?)\*\*:?$")
+_LIST_ITEM = re.compile(r"^([-*•·]|\d+[.)])\s")
+
+# Part minimale du texte conservée par les filtres ; en deçà, la découpe en
+# sections est jugée erronée et le texte d'origine est utilisé
+MIN_KEPT_RATIO = 0.25
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estime grossièrement le nombre de tokens d'un texte (~4 caractères par token).
+    """
+    return len(text) // 4 + 1
+
+
+def normalize_lines(text: str) -> str:
+    """
+    Normalise les espaces ligne par ligne en conservant les retours à la ligne,
+    qui portent la structure en sections de l'offre.
+    """
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _heading(line: str) -> str:
+    """Retourne le titre de section porté par une ligne, ou une chaîne vide."""
+    for pattern in (_MARKDOWN_HEADING, _BOLD_HEADING):
+        match = pattern.match(line)
+        if match:
+            return match.group(1).strip()
+    
+    # Ligne courte terminée par ":", hors éléments de liste
+    if len(line) <= 60 and line.endswith(":") and not _LIST_ITEM.match(line):
+        return line.rstrip(":").strip()
+    return ""
+
+
+def split_sections(text: str) -> List[Tuple[str, List[str]]]:
+    """
+    Découpe le texte d'une offre en sections (titre, paragraphes).
+    
+    Args:
+        text: Texte de l'offre, une ligne par paragraphe ou titre
+        
+    Returns:
+        Liste de tuples (titre, paragraphes) ; le titre de la première section
+        est vide si le texte ne commence pas par un titre
+    """
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in normalize_lines(text).splitlines():
+        heading = _heading(line)
+        if heading:
+            sections.append((heading, []))
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[0] or section[1]]
+
+
+def _section_priority(heading: str) -> int:
+    """Priorité d'une section : 0 = essentielle, 1 = neutre, None = à écarter."""
+    if not heading:
+        return 1
+    if BOILERPLATE_SECTION_PATTERN.fullmatch(heading.strip(" *:.!?")):
+        return None
+    if CORE_SECTION_PATTERN.search(heading):
+        return 0
+    return 1
+
+
+@dataclass
+class CondensedText:
+    """Texte condensé d'une offre et tokens économisés."""
+    text: str
+    original_tokens: int
+    condensed_tokens: int
+    
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.original_tokens - self.condensed_tokens, 0)
+
+
+def condense_job_text(text: str, token_budget: int) -> CondensedText:
+    """
+    Condense le texte d'une offre en gardant l'essentiel sous un budget de tokens.
+    
+    Seuls les titres explicites (markdown "#", gras, ligne terminée par ":")
+    délimitent les sections. Les sections de boilerplate (candidature,
+    avertissements, présentation de l'organisation) et les paragraphes en
+    double sont écartés ; si ces filtres retirent presque tout le texte, le
+    texte d'origine est conservé, tronqué au budget. Si le budget
+    reste dépassé, les responsabilités, qualifications et compétences sont
+    conservées en priorité ; l'ordre d'origine du texte est préservé.
+    
+    Args:
+        text: Texte complet de l'offre
+        token_budget: Nombre maximum de tokens estimés du texte condensé
+        
+    Returns:
+        CondensedText avec le texte condensé et les tokens économisés
+    """
+    original_tokens = estimate_tokens(text)
+    
+    # Blocs candidats : (position, priorité, texte)
+    blocks = []
+    seen = set()
+    for heading, paragraphs in split_sections(text):
+        priority = _section_priority(heading)
+        if priority is None:
+            continue
+        if heading:
+            blocks.append((len(blocks), priority, f"{heading}:"))
+        for paragraph in paragraphs:
+            key = paragraph.lower()
+            if key in seen or BOILERPLATE_PARAGRAPH_PATTERN.search(paragraph):
+                continue
+            seen.add(key)
+            blocks.append((len(blocks), priority, paragraph))
+    
+    # Filtres trop destructeurs (titres mal reconnus) : texte d'origine tronqué
+    normalized = normalize_lines(text)
+    if sum(len(block) for _, _, block in blocks) < len(normalized) * MIN_KEPT_RATIO:
+        fallback = normalized[:token_budget * 4]
+        return CondensedText(fallback, original_tokens, estimate_tokens(fallback))
+    
+    # Sélection par priorité puis par ordre d'apparition, dans le budget
+    selected = []
+    used_tokens = 0
+    for position, priority, block in sorted(blocks, key=lambda block: (block[1], block[0])):
+        block_tokens = estimate_tokens(block)
+        if used_tokens + block_tokens > token_budget:
+            remaining_chars = (token_budget - used_tokens) * 4
+            if remaining_chars < 200:
+                continue
+            block = block[:remaining_chars]
+            block_tokens = estimate_tokens(block)
+        selected.append((position, block))
+        used_tokens += block_tokens
+    
+    condensed = "\n".join(block for _, block in sorted(selected))
+    return CondensedText(condensed, original_tokens, estimate_tokens(condensed))
\ No newline at end of file
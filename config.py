@@ -1,6 +1,7 @@
 """
 Configuration et constantes pour l'application Assistant de Carrière
 """
+import os
 
 # Profil du candidat - Zakaria BENHOUMAD
 CANDIDATE_PROFILE = """
@@ -39,6 +40,10 @@ INTERNATIONAL EXPERIENCE: Morocco, Sint Maarten, Tunisia, Sudan, Belize, Burkina
 INTERESTS: Humanitarian sector, international development, education technology, data-driven policy development
 """
 
+# Répertoire des profils de candidats évalués (un fichier .md ou .txt par
+# profil) ; à défaut, seul CANDIDATE_PROFILE est évalué
+PROFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+
 # Requêtes de recherche optimisées selon expertise HR
 SEARCH_QUERIES = {
     "core_data_roles": [
@@ -81,4 +86,134 @@ SEARCH_QUERIES = {
         "EdTech",
         "data governance education"
     ]
-}
\ No newline at end of file
+}
+
+# Concurrence du pipeline d'analyse (nombre de workers par étape)
+SCRAPE_WORKERS = 8
+ANALYSIS_WORKERS = 4
+
+
+# Cache persistant des analyses Gemini
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+ANALYSIS_CACHE_PATH = os.path.join(CACHE_DIR, "analyses.sqlite")
+ANALYSIS_CACHE_TTL_DAYS = 7
+ANALYSIS_CACHE_MAX_ENTRIES = 5000
+
+# Historique des offres analysées et de leurs résultats, conservé entre les
+# exécutions et relu par l'interface à l'ouverture
+JOB_STORE_PATH = os.path.join(CACHE_DIR, "jobs.sqlite")
+
+# Modèle Gemini utilisé pour l'analyse
+GEMINI_MODEL = "gemini-2.5-pro"
+
+# Mise en cache côté serveur du contexte statique (profil et consignes).
+# Ignorée automatiquement si le contexte est trop court pour le modèle.
+GEMINI_CONTEXT_CACHE = True
+GEMINI_CONTEXT_CACHE_TTL_MINUTES = 60
+
+# Cascade : un modèle rapide filtre toutes les offres, le modèle GEMINI_MODEL
+# n'analyse en détail que celles dont le score de filtrage atteint le seuil
+CASCADE_ENABLED = True
+SCREENING_MODEL = "gemini-2.5-flash"
+CASCADE_THRESHOLD = 50
+
+# Synchronisation incrémentale : dernière date de modification vue par requête
+SYNC_STATE_PATH = os.path.join(CACHE_DIR, "sync_state.json")
+
+# Longueur maximale d'une requête ReliefWeb fusionnée (mots-clés regroupés en OR)
+QUERY_MAX_LENGTH = 500
+
+# Pagination ReliefWeb : pages demandées simultanément
+RELIEFWEB_MAX_IN_FLIGHT = 4
+
+# Couche HTTP partagée (client ReliefWeb et scraper)
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+HTTP_TIMEOUT = (10, 30)  # (connexion, lecture) en secondes
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 1.0  # Délai de base du backoff exponentiel (secondes)
+HTTP_BACKOFF_MAX = 60.0
+HTTP_POOL_CONNECTIONS = 10  # Nombre d'hôtes gardés en pool
+HTTP_POOL_MAXSIZE = 16  # Connexions simultanées par hôte
+
+# Cache des pages scrapées (GET conditionnel)
+PAGE_CACHE_PATH = os.path.join(CACHE_DIR, "pages.sqlite")
+PAGE_CACHE_MAX_MB = 200
+
+# Backend d'extraction HTML : "auto", "selectolax", "lxml" ou "html.parser"
+EXTRACTION_BACKEND = "auto"
+
+# Parsing HTML en pool de processus (0 = dans le processus courant, None = tous les cœurs)
+PARSE_WORKERS = None
+PARSE_CHUNKSIZE = 8  # Pages envoyées par échange inter-processus
+
+# Analyse groupée : plusieurs offres par requête Gemini
+ANALYSIS_BATCH_MAX_JOBS = 5
+ANALYSIS_BATCH_TOKEN_BUDGET = 12000  # Tokens estimés par requête (profil et consignes inclus)
+
+# Pré-classement local (BM25) : offres sous ce score relatif (0-1) ignorées
+PRERANK_MIN_SCORE = 0.1
+
+# Classement des offres : "bm25" (lexical) ou "embedding" (sémantique)
+RANKING_MODE = "bm25"
+# Embeddings : "gemini" (API), "local" (sentence-transformers) ou "hashing" (tests)
+EMBEDDING_BACKEND = "gemini"
+EMBEDDING_MODEL = "models/text-embedding-004"
+LOCAL_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+VECTOR_STORE_DIR = os.path.join(CACHE_DIR, "vectors")
+
+# Condensation des offres : budget de tokens du texte envoyé au modèle
+CONDENSER_TOKEN_BUDGET = 2000
+
+# Doublons : écart maximal (en bits sur 64) entre empreintes SimHash de deux offres
+DEDUP_MAX_HAMMING = 3
+
+# Limites de débit adaptatives par service amont : débit initial et maximal
+# (appels/seconde), appels simultanés initiaux et maximaux, et latence (s)
+# au-delà de laquelle les limites n'augmentent plus. Les limites "pages"
+# s'appliquent à chaque hôte, celles de "gemini" à chaque modèle.
+RATE_LIMITS = {
+    "reliefweb": {"rate": 2.0, "max_rate": 5.0, "concurrency": 2,
+                  "max_concurrency": RELIEFWEB_MAX_IN_FLIGHT, "latency_target": 5.0},
+    "pages": {"rate": 2.0, "max_rate": 8.0, "concurrency": 2,
+              "max_concurrency": SCRAPE_WORKERS, "latency_target": 5.0},
+    "gemini": {"rate": 0.5, "max_rate": 2.0, "concurrency": 2,
+               "max_concurrency": ANALYSIS_WORKERS, "latency_target": 60.0}
+}
+RATE_LIMIT_MIN_RATE = 0.1  # Débit plancher après limitations successives
+
+# Scraping des pages d'offres : délais courts et peu de retries, un hôte
+# défaillant étant ignoré après plusieurs échecs consécutifs (disjoncteur)
+SCRAPER_TIMEOUT = (3.05, 10)  # (connexion, lecture) en secondes
+SCRAPER_MAX_RETRIES = 1
+CIRCUIT_BREAKER_FAILURES = 3
+CIRCUIT_BREAKER_COOLDOWN = 120  # Secondes pendant lesquelles l'hôte est ignoré
+SCRAPER_MAX_BYTES = 5 * 1024 * 1024  # Taille maximale lue par page ou document
+SCRAPER_CHUNK_SIZE = 64 * 1024  # Taille des blocs lus en flux
+
+# Sortie structurée de Gemini : tokens de sortie autorisés par requête
+# (base, qui couvre aussi le raisonnement des modèles 2.5, plus une part par
+# offre) et nombre d'appels pour obtenir une analyse lisible
+GEMINI_OUTPUT_TOKENS_BASE = 2048
+GEMINI_OUTPUT_TOKENS_PER_JOB = 1024
+SCREENING_OUTPUT_TOKENS_PER_JOB = 128
+ANALYSIS_MAX_ATTEMPTS = 2
+
+# Délai maximal d'un appel Gemini (secondes) et requêtes couvertes : un appel
+# plus lent que le percentile de latence observé est doublé, dans la limite
+# d'une part d'appels supplémentaires
+GEMINI_CALL_TIMEOUT = 120
+GEMINI_HEDGING = True
+GEMINI_HEDGE_PERCENTILE = 95
+GEMINI_HEDGE_MIN_SAMPLES = 20
+GEMINI_HEDGE_BUDGET = 0.1
+
+# Comptage des tokens et budget par exécution. Les tarifs (dollars par
+# million de tokens envoyés, générés) servent aux projections et au suivi.
+GEMINI_PRICES_PER_MILLION = {
+    "gemini-2.5-pro": (1.25, 10.0),
+    "gemini-2.5-flash": (0.30, 2.50)
+}
+ANALYSIS_EXPECTED_OUTPUT_TOKENS = 800  # Réponse et raisonnement attendus par offre
+SCREENING_EXPECTED_OUTPUT_TOKENS = 100
+RUN_TOKEN_BUDGET = 0  # Tokens par exécution (0 = illimité)
+RUN_COST_BUDGET_USD = 0.0  # Dollars par exécution (0 = illimité)
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Détection des offres quasi identiques (SimHash et index LSH)
+"""
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+
+FINGERPRINT_BITS = 64
+
+# En dessous de ce nombre de mots, l'empreinte n'est pas assez fiable
+MIN_TOKENS = 20
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Calcule l'empreinte SimHash 64 bits d'un texte.
+    
+    Des textes proches (reposts, dates prolongées, petites retouches) ont
+    des empreintes qui ne diffèrent que de quelques bits.
+    
+    Args:
+        text: Texte de l'offre
+        shingle_size: Nombre de mots par fragment
+        
+    Returns:
+        Empreinte sous forme d'entier
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    shingles = [
+        " ".join(tokens[index:index + shingle_size])
+        for index in range(max(len(tokens) - shingle_size + 1, 1))
+    ]
+    
+    digests = b"".join(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in shingles
+    )
+    # Une ligne par fragment, octets inversés : la colonne k porte le bit k
+    digest_bytes = np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8)[:, ::-1]
+    bits = np.unpackbits(digest_bytes, axis=1, bitorder="little")
+    
+    # Vote signé par bit : +1 si le bit est à 1 dans le fragment, -1 sinon
+    weights = 2 * bits.sum(axis=0, dtype=np.int64) - len(shingles)
+    return int.from_bytes(np.packbits(weights > 0, bitorder="little").tobytes(), "little")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Nombre de bits différents entre deux empreintes."""
+    return bin(a ^ b).count("1")
+
+
+def find_near_duplicates(texts: Dict[str, str], max_distance: int = 3) -> Dict[str, str]:
+    """
+    Regroupe les offres quasi identiques et désigne un représentant par groupe.
+    
+    Les empreintes sont découpées en max_distance + 1 bandes : deux
+    empreintes à au plus max_distance bits d'écart partagent forcément une
+    bande identique, ce qui limite les comparaisons aux candidats d'un même
+    compartiment.
+    
+    Args:
+        texts: Dictionnaire {identifiant: texte}, dans l'ordre de priorité
+            (le premier de chaque groupe en devient le représentant)
+        max_distance: Écart maximal en bits pour considérer deux offres identiques
+        
+    Returns:
+        Dictionnaire {identifiant du doublon: identifiant du représentant}
+    """
+    fingerprints = {
+        item_id: simhash(text) for item_id, text in texts.items()
+        if len(_TOKEN_PATTERN.findall(text)) >= MIN_TOKENS
+    }
+    order = {item_id: position for position, item_id in enumerate(texts)}
+    
+    # Index LSH : une table de compartiments par bande
+    bands = max_distance + 1
+    band_bits = FINGERPRINT_BITS // bands
+    mask = (1 << band_bits) - 1
+    buckets = defaultdict(list)
+    for item_id, fingerprint in fingerprints.items():
+        for band in range(bands):
+            buckets[(band, fingerprint >> (band * band_bits) & mask)].append(item_id)
+    
+    # Union-find : le représentant d'un groupe est l'offre la plus prioritaire
+    parent = {item_id: item_id for item_id in fingerprints}
+    
+    def find(item_id: str) -> str:
+        while parent[item_id] != item_id:
+            parent[item_id] = parent[parent[item_id]]
+            item_id = parent[item_id]
+        return item_id
+    
+    for candidates in buckets.values():
+        for index, first in enumerate(candidates):
+            for second in candidates[index + 1:]:
+                if hamming_distance(fingerprints[first], fingerprints[second]) > max_distance:
+                    continue
+                root_first, root_second = find(first), find(second)
+                if root_first != root_second:
+                    if order[root_first] > order[root_second]:
+                        root_first, root_second = root_second, root_first
+                    parent[root_second] = root_first
+    
+    return {
+        item_id: find(item_id) for item_id in fingerprints
+        if find(item_id) != item_id
+    }
+
+
+def group_duplicates(duplicates: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Inverse le résultat de find_near_duplicates : {représentant: [doublons]}.
+    """
+    groups = defaultdict(list)
+    for item_id, representative in duplicates.items():
+        groups[representative].append(item_id)
+    return dict(groups)
\ No newline at end of file
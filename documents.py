@@ -0,0 +1,95 @@
+"""
+Extraction du texte des offres publiées en document (PDF, DOCX)
+"""
+import io
+import zipfile
+from typing import Optional
+from urllib.parse import urlparse
+from xml.etree import ElementTree
+
+from condenser import normalize_lines
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+
+# Types de contenu reconnus, par type MIME
+CONTENT_TYPES = {
+    "text/html": "html",
+    "application/xhtml+xml": "html",
+    "text/plain": "html",
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx"
+}
+
+# Extensions utilisées quand le serveur envoie un type générique
+EXTENSION_TYPES = {".pdf": "pdf", ".docx": "docx"}
+
+# Espace de noms WordprocessingML du corps d'un document DOCX
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def detect_document_type(content_type: Optional[str], url: str = "") -> Optional[str]:
+    """
+    Détermine le type d'une réponse à partir de son en-tête Content-Type.
+
+    Args:
+        content_type: Valeur de l'en-tête Content-Type (None si absent)
+        url: URL de la page, pour les types génériques (octet-stream)
+
+    Returns:
+        "html", "pdf" ou "docx", ou None si le contenu n'est pas exploitable
+    """
+    mime_type = (content_type or "").split(";")[0].strip().lower()
+    if mime_type in CONTENT_TYPES:
+        return CONTENT_TYPES[mime_type]
+
+    if not mime_type or mime_type in ("application/octet-stream", "binary/octet-stream"):
+        path = urlparse(url).path.lower()
+        for extension, document_type in EXTENSION_TYPES.items():
+            if path.endswith(extension):
+                return document_type
+        # Sans indication, le contenu est traité comme une page HTML
+        return "html" if not mime_type else None
+
+    return None
+
+
+def extract_pdf_text(content: bytes) -> str:
+    """
+    Extrait le texte d'un document PDF (nécessite pypdf).
+
+    Args:
+        content: Contenu binaire du PDF
+
+    Returns:
+        Texte du document, ou chaîne vide si pypdf n'est pas installé
+    """
+    if PdfReader is None:
+        print("pypdf n'est pas installé : document PDF ignoré")
+        return ""
+
+    reader = PdfReader(io.BytesIO(content))
+    return normalize_lines("\n".join(page.extract_text() or "" for page in reader.pages))
+
+
+def extract_docx_text(content: bytes) -> str:
+    """
+    Extrait le texte d'un document DOCX, un paragraphe par ligne.
+
+    Args:
+        content: Contenu binaire du DOCX (archive ZIP)
+
+    Returns:
+        Texte du document
+    """
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+
+    paragraphs = [
+        "".join(node.text or "" for node in paragraph.iter(f"{_WORD_NAMESPACE}t"))
+        for paragraph in root.iter(f"{_WORD_NAMESPACE}p")
+    ]
+    return normalize_lines("\n".join(paragraphs))
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Appariement sémantique par embeddings et stockage vectoriel sur disque
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from rate_limit import get_limiter
+
+
+class HashingEmbedder:
+    """
+    Embedder local déterministe par hachage des termes, sans modèle ni
+    réseau. Destiné aux tests et au mode hors ligne.
+    """
+    
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+        self.name = f"hashing-{dimension}"
+    
+    def embed(self, texts: List[str], is_query: bool = False) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in re.findall(r"[a-z0-9]{3,}", text.lower()):
+                digest = hashlib.md5(token.encode("utf-8")).digest()
+                column = int.from_bytes(digest[:4], "little") % self.dimension
+                sign = 1.0 if digest[4] % 2 == 0 else -1.0
+                vectors[row, column] += sign
+        return vectors
+
+
+class GeminiEmbedder:
+    """Embedder distant utilisant l'API d'embeddings Gemini."""
+    
+    def __init__(self, api_key: str, model_name: str, batch_size: int = 100):
+        import google.generativeai as genai
+        
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.name = model_name.replace("/", "-")
+    
+    def embed(self, texts: List[str], is_query: bool = False) -> np.ndarray:
+        task_type = "retrieval_query" if is_query else "retrieval_document"
+        limiter = get_limiter("gemini", self.name)
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            result = limiter.call(lambda: self._genai.embed_content(
+                model=self.model_name,
+                content=batch,
+                task_type=task_type
+            ), max_retries=2)
+            vectors.extend(result["embedding"])
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class LocalEmbedder:
+    """Embedder local basé sur sentence-transformers (dépendance optionnelle)."""
+    
+    def __init__(self, model_name: str):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "Le backend d'embeddings 'local' nécessite le paquet sentence-transformers"
+            )
+        self._model = SentenceTransformer(model_name)
+        self.name = model_name.replace("/", "-")
+    
+    def embed(self, texts: List[str], is_query: bool = False) -> np.ndarray:
+        return np.asarray(self._model.encode(texts), dtype=np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Normalise les vecteurs (norme L2) pour que le produit scalaire soit un cosinus."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class VectorStore:
+    """
+    Stockage des vecteurs d'offres dans un fichier mappé en mémoire.
+    
+    Les vecteurs, normalisés à l'insertion, sont ajoutés à la fin d'un
+    fichier float32 ; un index JSON associe chaque identifiant à sa ligne et
+    à l'empreinte du texte embeddé. Le vecteur d'une offre dont le texte a
+    changé remplace l'ancien sur sa ligne. La similarité cosinus avec toutes
+    les offres est un seul produit matrice-vecteur.
+    """
+    
+    def __init__(self, directory: str, name: str):
+        """
+        Args:
+            directory: Dossier du stockage
+            name: Nom du stockage (un par embedder, les dimensions différant)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, f"{name}.f32")
+        self.index_path = os.path.join(directory, f"{name}.json")
+        self._lock = threading.Lock()
+        
+        self.dimension = 0
+        self.index: Dict[str, Dict] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.dimension = state["dimension"]
+            self.index = state["index"]
+            # Lignes orphelines laissées par une version antérieure du stockage
+            if self._row_count() > len(self.index):
+                self._compact()
+    
+    def _save_index(self) -> None:
+        """Écrit l'index JSON de façon atomique."""
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dimension": self.dimension, "index": self.index}, f)
+        os.replace(tmp_path, self.index_path)
+    
+    def _compact(self) -> None:
+        """Réécrit le fichier de vecteurs avec les seules lignes indexées."""
+        item_ids = list(self.index)
+        vectors = np.array(self._matrix()[[self.index[item_id]["row"] for item_id in item_ids]])
+        tmp_path = f"{self.vectors_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(vectors.tobytes())
+        os.replace(tmp_path, self.vectors_path)
+        for row, item_id in enumerate(item_ids):
+            self.index[item_id]["row"] = row
+        self._save_index()
+    
+    def _row_count(self) -> int:
+        """Nombre de lignes écrites dans le fichier de vecteurs."""
+        if not self.dimension or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dimension)
+    
+    def _matrix(self) -> np.ndarray:
+        """Ouvre le fichier de vecteurs en lecture seule (memmap)."""
+        rows = self._row_count()
+        if not rows:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                         shape=(rows, self.dimension))
+    
+    def missing(self, items: Dict[str, str]) -> List[str]:
+        """
+        Liste les identifiants absents du stockage ou dont le texte a changé.
+        
+        Args:
+            items: Dictionnaire {identifiant: texte}
+        """
+        return [
+            item_id for item_id, text in items.items()
+            if self.index.get(item_id, {}).get("hash") != _text_hash(text)
+        ]
+    
+    def add(self, items: Dict[str, str], vectors: np.ndarray) -> None:
+        """
+        Ajoute des vecteurs au stockage, ou remplace ceux des identifiants
+        déjà présents.
+        
+        Args:
+            items: Dictionnaire {identifiant: texte}, dans l'ordre des vecteurs
+            vectors: Matrice des vecteurs (une ligne par identifiant)
+        """
+        if not items:
+            return
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        
+        with self._lock:
+            if not self.dimension:
+                self.dimension = vectors.shape[1]
+            next_row = self._row_count()
+            
+            mode = "r+b" if os.path.exists(self.vectors_path) else "wb"
+            with open(self.vectors_path, mode) as f:
+                for vector, (item_id, text) in zip(vectors, items.items()):
+                    # Texte modifié : la ligne existante est réécrite
+                    row = self.index.get(item_id, {}).get("row")
+                    if row is None:
+                        row = next_row
+                        next_row += 1
+                    f.seek(row * 4 * self.dimension)
+                    f.write(vector.tobytes())
+                    self.index[item_id] = {"row": row, "hash": _text_hash(text)}
+            
+            self._save_index()
+    
+    def similarities(self, item_ids: List[str], query_vector: np.ndarray) -> np.ndarray:
+        """
+        Calcule la similarité cosinus entre un vecteur requête et des offres.
+        
+        Args:
+            item_ids: Identifiants des offres (présents dans le stockage)
+            query_vector: Vecteur de la requête (profil)
+            
+        Returns:
+            Similarités, dans l'ordre des identifiants
+        """
+        query = _normalize(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            all_scores = self._matrix() @ query
+            rows = [self.index[item_id]["row"] for item_id in item_ids]
+        return np.asarray(all_scores[rows])
+
+
+def _text_hash(text: str) -> str:
+    """Empreinte d'un texte, pour détecter les offres modifiées."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def rank_jobs_semantic(store: VectorStore, embedder, job_texts: Dict[str, str],
+                       profile: str) -> Tuple[List[str], np.ndarray]:
+    """
+    Note la proximité sémantique de chaque offre avec le profil, entre 0 et 1.
+    
+    Seules les offres nouvelles ou modifiées sont embeddées ; un changement
+    de profil ne coûte qu'un seul embedding.
+    
+    Args:
+        store: Stockage des vecteurs d'offres
+        embedder: Embedder (GeminiEmbedder, LocalEmbedder ou HashingEmbedder)
+        job_texts: Dictionnaire {identifiant: texte de l'offre}
+        profile: Profil du candidat
+        
+    Returns:
+        Tuple (identifiants, scores relatifs au meilleur score)
+    """
+    missing = store.missing(job_texts)
+    if missing:
+        to_embed = {item_id: job_texts[item_id] for item_id in missing}
+        store.add(to_embed, embedder.embed(list(to_embed.values())))
+    
+    item_ids = list(job_texts)
+    profile_vector = embedder.embed([profile], is_query=True)[0]
+    scores = np.clip(store.similarities(item_ids, profile_vector), 0.0, None)
+    best = scores.max() if scores.size else 0.0
+    return item_ids, (scores / best if best > 0 else scores)
\ No newline at end of file
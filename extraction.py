@@ -0,0 +1,207 @@
+"""
+Moteur d'extraction du texte utile des pages d'offres d'emploi
+"""
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from condenser import normalize_lines
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+# Balises sans contenu utile pour l'analyse
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "footer", "header", "aside", "form"]
+
+# Sélecteurs CSS du corps de l'offre, par site (essayés dans l'ordre)
+SITE_SELECTORS: Dict[str, List[str]] = {
+    "reliefweb.int": [
+        "article.rw-article .rw-entity-text",
+        "article.rw-article .rw-article__content",
+        "article.rw-article",
+        "main"
+    ]
+}
+
+# En dessous de cette longueur, un bloc sélectionné est jugé vide
+MIN_CONTENT_LENGTH = 200
+
+
+class _SoupBackend:
+    """Backend BeautifulSoup (parseur html.parser ou lxml)."""
+    
+    def __init__(self, parser: str):
+        self.parser = parser
+    
+    def parse(self, html: bytes):
+        soup = BeautifulSoup(html, self.parser)
+        for tag in soup(BOILERPLATE_TAGS):
+            tag.decompose()
+        return soup
+    
+    def select_first(self, doc, selector: str):
+        return doc.select_one(selector)
+    
+    def paragraphs(self, doc):
+        return doc.find_all(["p", "li"])
+    
+    def parent(self, node):
+        return node.parent
+    
+    def key(self, node):
+        return id(node)
+    
+    def text(self, node) -> str:
+        return node.get_text(separator='\n', strip=True)
+    
+    def link_text_length(self, node) -> int:
+        return sum(len(a.get_text(strip=True)) for a in node.find_all("a"))
+    
+    def root(self, doc):
+        return doc.body or doc
+
+
+class _SelectolaxBackend:
+    """Backend selectolax (moteur lexbor, écrit en C)."""
+    
+    def parse(self, html: bytes):
+        doc = LexborHTMLParser(html)
+        doc.strip_tags(BOILERPLATE_TAGS)
+        return doc
+    
+    def select_first(self, doc, selector: str):
+        return doc.css_first(selector)
+    
+    def paragraphs(self, doc):
+        return doc.css("p, li")
+    
+    def parent(self, node):
+        return node.parent
+    
+    def key(self, node):
+        return node.mem_id
+    
+    def text(self, node) -> str:
+        return node.text(separator='\n', strip=True)
+    
+    def link_text_length(self, node) -> int:
+        return sum(len(a.text(strip=True)) for a in node.css("a"))
+    
+    def root(self, doc):
+        return doc.body or doc.root
+
+
+def available_backends() -> List[str]:
+    """
+    Liste les backends d'extraction installés, du plus rapide au plus lent.
+    """
+    backends = []
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    if HAS_LXML:
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+
+def _get_backend(name: Optional[str]):
+    """Instancie un backend par son nom ("auto" ou None = le plus rapide disponible)."""
+    if name in (None, "auto"):
+        name = available_backends()[0]
+    if name not in available_backends():
+        raise ValueError(f"Backend d'extraction indisponible: {name}")
+    if name == "selectolax":
+        return _SelectolaxBackend()
+    return _SoupBackend(name)
+
+
+def _main_content(backend, doc):
+    """
+    Repère le bloc principal d'une page générique (approche type readability).
+    
+    Chaque paragraphe apporte sa longueur de texte à son parent et la moitié
+    à son grand-parent ; le bloc le mieux noté, pondéré par sa densité de
+    liens, est retenu.
+    """
+    scores = {}
+    nodes = {}
+    for paragraph in backend.paragraphs(doc):
+        length = len(backend.text(paragraph))
+        if length < 25:
+            continue
+        parent = backend.parent(paragraph)
+        grandparent = backend.parent(parent) if parent is not None else None
+        for node, weight in ((parent, 1.0), (grandparent, 0.5)):
+            if node is None:
+                continue
+            key = backend.key(node)
+            nodes[key] = node
+            scores[key] = scores.get(key, 0.0) + length * weight
+    
+    best_node = None
+    best_score = 0.0
+    for key, score in scores.items():
+        node = nodes[key]
+        text_length = len(backend.text(node)) or 1
+        link_density = backend.link_text_length(node) / text_length
+        score *= 1.0 - min(link_density, 1.0)
+        if score > best_score:
+            best_node, best_score = node, score
+    
+    return best_node
+
+
+def extract_text(html: bytes, url: str = "", backend: Optional[str] = None) -> str:
+    """
+    Extrait le texte utile d'une page d'offre d'emploi.
+    
+    Les sélecteurs propres au site sont essayés en premier ; à défaut, le
+    bloc principal est détecté automatiquement, puis la page entière sert
+    de dernier recours.
+    
+    Args:
+        html: Contenu HTML brut
+        url: URL de la page (pour choisir les sélecteurs du site)
+        backend: "selectolax", "lxml", "html.parser" ou "auto"
+        
+    Returns:
+        Texte de l'offre, espaces normalisés (une ligne par bloc de texte)
+    """
+    engine = _get_backend(backend)
+    doc = engine.parse(html)
+    
+    host = urlparse(url).netloc.lower()
+    selectors = next(
+        (selectors for site, selectors in SITE_SELECTORS.items()
+         if host == site or host.endswith("." + site)),
+        []
+    )
+    
+    text = ""
+    for selector in selectors:
+        node = engine.select_first(doc, selector)
+        if node is not None:
+            text = engine.text(node)
+            if len(text) >= MIN_CONTENT_LENGTH:
+                break
+    
+    if len(text) < MIN_CONTENT_LENGTH:
+        node = _main_content(engine, doc)
+        if node is not None:
+            text = engine.text(node)
+    
+    if len(text) < MIN_CONTENT_LENGTH:
+        text = engine.text(engine.root(doc))
+    
+    # Nettoyer les espaces multiples en gardant la structure en lignes
+    return normalize_lines(text)
\ No newline at end of file
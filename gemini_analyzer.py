@@ -2,85 +2,852 @@
 Module d'analyse de compatibilité avec l'API Gemini
 """
 import google.generativeai as genai
+import hashlib
 import json
-from config import CANDIDATE_PROFILE
+import re
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from analysis_cache import AnalysisCache
+from condenser import estimate_tokens
+from config import (
+    GEMINI_MODEL, ANALYSIS_BATCH_TOKEN_BUDGET, ANALYSIS_BATCH_MAX_JOBS,
+    GEMINI_CONTEXT_CACHE, GEMINI_CONTEXT_CACHE_TTL_MINUTES,
+    SCREENING_MODEL, CASCADE_THRESHOLD, HTTP_MAX_RETRIES,
+    GEMINI_OUTPUT_TOKENS_BASE, GEMINI_OUTPUT_TOKENS_PER_JOB,
+    SCREENING_OUTPUT_TOKENS_PER_JOB, ANALYSIS_MAX_ATTEMPTS, GEMINI_CALL_TIMEOUT,
+    ANALYSIS_EXPECTED_OUTPUT_TOKENS, SCREENING_EXPECTED_OUTPUT_TOKENS,
+    GEMINI_HEDGING, GEMINI_HEDGE_BUDGET
+)
+from hedging import get_hedger
+from profiles import DEFAULT_PROFILE, Profile
+from rate_limit import get_limiter
+from token_budget import call_cost, usage_from_metadata
+from tolerant_json import JsonStreamScanner, parse_json_response
 
 
-def get_compatibility_analysis(job_description: str, api_key: str) -> dict:
-    """
-    Analyse la compatibilité entre le profil candidat et une offre d'emploi.
-    
-    Args:
-        job_description: Texte complet de l'offre d'emploi
-        api_key: Clé API Gemini
-        
-    Returns:
-        Dictionnaire contenant l'analyse de compatibilité
-    """
-    try:
-        # Configuration du client Gemini
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-pro')
-        
-        # Construction du prompt
-        prompt = f"""
-Tu es un expert en recrutement. Analyse la compatibilité entre ce profil de candidat et cette offre d'emploi.
+# Version du gabarit de prompt : à incrémenter à chaque modification du prompt
+# pour invalider les analyses en cache
+PROMPT_VERSION = "4"
 
-PROFIL DU CANDIDAT:
-{CANDIDATE_PROFILE}
+# Longueur maximale du texte d'une offre envoyé au modèle
+MAX_JOB_CHARS = 8000
 
-OFFRE D'EMPLOI:
-{job_description[:8000]}
+REQUIRED_KEYS = ["verdict", "score_pertinence", "analyse_succincte",
+                 "points_forts", "points_faibles"]
 
-Fournis une analyse de compatibilité UNIQUEMENT au format JSON suivant (sans texte avant ou après):
-{{
+VERDICTS = ["COMPATIBLE", "NON COMPATIBLE", "MOYENNEMENT COMPATIBLE"]
+
+ANALYSIS_FORMAT = """{
     "verdict": "COMPATIBLE" ou "NON COMPATIBLE" ou "MOYENNEMENT COMPATIBLE",
     "score_pertinence": <nombre entre 0 et 100>,
     "analyse_succincte": "<résumé en 2-3 phrases>",
     "points_forts": ["point1", "point2", "point3"],
     "points_faibles": ["point1", "point2"]
-}}
+}"""
+
+# Format réduit du filtrage rapide (modèle économique)
+SCREENING_PROMPT_VERSION = "screening-3"
+SCREENING_REQUIRED_KEYS = ["verdict", "score_pertinence"]
+SCREENING_FORMAT = """{
+    "verdict": "COMPATIBLE" ou "NON COMPATIBLE" ou "MOYENNEMENT COMPATIBLE",
+    "score_pertinence": <nombre entre 0 et 100>
+}"""
+
+# Schémas de sortie structurée imposés au modèle (mode JSON de Gemini)
+_ANALYSIS_PROPERTIES = {
+    "verdict": {"type": "string", "enum": VERDICTS},
+    "score_pertinence": {"type": "integer"},
+    "analyse_succincte": {"type": "string"},
+    "points_forts": {"type": "array", "items": {"type": "string"}},
+    "points_faibles": {"type": "array", "items": {"type": "string"}}
+}
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": _ANALYSIS_PROPERTIES,
+    "required": REQUIRED_KEYS
+}
+SCREENING_SCHEMA = {
+    "type": "object",
+    "properties": {key: _ANALYSIS_PROPERTIES[key] for key in SCREENING_REQUIRED_KEYS},
+    "required": SCREENING_REQUIRED_KEYS
+}
+
+
+def _system_instruction(analysis_format: str, profiles: List[Profile]) -> str:
+    """
+    Partie statique du prompt (rôle, profils et format), envoyée une seule fois
+    sous forme d'instruction système ou de contexte mis en cache.
+    """
+    if len(profiles) == 1:
+        candidates = f"""le profil de candidat ci-dessous et des offres d'emploi.
+
+PROFIL DU CANDIDAT:
+{profiles[0].text}"""
+    else:
+        profiles_block = "\n\n".join(
+            f"=== PROFIL {profile.id} ({profile.name}) ===\n{profile.text}" for profile in profiles
+        )
+        candidates = f"""les profils de candidats ci-dessous et des offres d'emploi.
+Chaque analyse porte sur un seul profil, désigné par son identifiant.
+
+PROFILS DES CANDIDATS:
+{profiles_block}"""
+    
+    return f"""
+Tu es un expert en recrutement. Tu analyses la compatibilité entre {candidates}
+
+Chaque analyse de compatibilité suit UNIQUEMENT le format JSON suivant:
+{analysis_format}
+
+Réponds UNIQUEMENT avec du JSON, sans texte avant ou après.
+"""
+
+
+# Identifiant des offres dans les requêtes groupées
+_JOB_ID_PATTERN = re.compile(r"^=== OFFRE (job_\d+) ===$", re.MULTILINE)
+
+# Profils à évaluer, indiqués dans les prompts des analyseurs multi-profils
+_PROFILES_PATTERN = re.compile(r"^PROFILS? À ÉVALUER ?: (.+)$", re.MULTILINE)
+
+
+def _batch_schema(schema: dict, multi_profile: bool = False) -> dict:
+    """Schéma d'une réponse groupée : un tableau d'analyses identifiées."""
+    id_keys = ["job_id", "profile_id"] if multi_profile else ["job_id"]
+    return {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                **{key: {"type": "string"} for key in id_keys},
+                **schema["properties"]
+            },
+            "required": id_keys + schema["required"]
+        }
+    }
+
+
+def _is_valid_analysis(analysis, required_keys: List[str] = REQUIRED_KEYS) -> bool:
+    """Vérifie qu'une analyse contient toutes les clés attendues."""
+    return isinstance(analysis, dict) and all(key in analysis for key in required_keys)
+
+
+def _error_analysis(message: str, weakness: str) -> dict:
+    """Construit le résultat renvoyé lorsqu'une analyse a échoué."""
+    return {
+        "verdict": "ERREUR",
+        "score_pertinence": 0,
+        "analyse_succincte": message,
+        "points_forts": [],
+        "points_faibles": [weakness]
+    }
+
+
+def _add_usage(analysis: dict, usage: dict) -> dict:
+    """Ajoute une consommation (tokens et coût) à celle d'une analyse."""
+    analysis["tokens_utilises"] = analysis.get("tokens_utilises", 0) + usage.get("tokens_utilises", 0)
+    analysis["cout_usd"] = analysis.get("cout_usd", 0.0) + usage.get("cout_usd", 0.0)
+    return analysis
 
-Réponds UNIQUEMENT avec le JSON, sans texte supplémentaire.
+
+def _single_prompt(job_description: str, profile_id: Optional[str] = None) -> str:
+    """
+    Prompt d'analyse d'une offre (les profils sont dans l'instruction système).
+    
+    Args:
+        job_description: Texte de l'offre
+        profile_id: Profil à évaluer (analyseur multi-profils uniquement)
+    """
+    target = f"\nPROFIL À ÉVALUER: {profile_id}\n" if profile_id else ""
+    return f"""
+Analyse la compatibilité entre le profil du candidat et cette offre d'emploi.
+{target}
+OFFRE D'EMPLOI:
+{job_description[:MAX_JOB_CHARS]}
+
+Fournis une seule analyse au format JSON indiqué.
+"""
+
+
+def _batch_prompt(job_descriptions: List[str],
+                  profile_ids: Optional[List[List[str]]] = None) -> str:
+    """
+    Prompt d'analyse groupée de plusieurs offres.
+    
+    Args:
+        job_descriptions: Textes des offres
+        profile_ids: Profils à évaluer pour chaque offre (analyseur
+            multi-profils uniquement)
+    """
+    if profile_ids is not None:
+        return _multi_profile_batch_prompt(job_descriptions, profile_ids)
+    
+    jobs_block = "\n\n".join(
+        f"=== OFFRE job_{index} ===\n{job_description[:MAX_JOB_CHARS]}"
+        for index, job_description in enumerate(job_descriptions)
+    )
+    return f"""
+Analyse séparément la compatibilité entre le profil du candidat et chacune des offres d'emploi ci-dessous.
+
+OFFRES D'EMPLOI:
+{jobs_block}
+
+Fournis UNIQUEMENT un tableau JSON contenant une analyse par offre, au format indiqué,
+avec en plus le champ "job_id" de l'offre:
+[
+    {{"job_id": "job_0", ...analyse...}},
+    ...
+]
+"""
+
+
+def _multi_profile_batch_prompt(job_descriptions: List[str],
+                                profile_ids: List[List[str]]) -> str:
+    """Prompt d'analyse groupée de plusieurs offres pour plusieurs profils."""
+    jobs_block = "\n\n".join(
+        f"=== OFFRE job_{index} ===\nPROFILS À ÉVALUER: {', '.join(ids)}\n"
+        f"{job_description[:MAX_JOB_CHARS]}"
+        for index, (job_description, ids) in enumerate(zip(job_descriptions, profile_ids))
+    )
+    return f"""
+Analyse séparément la compatibilité entre chacune des offres d'emploi ci-dessous et
+chacun des profils à évaluer indiqués pour l'offre.
+
+OFFRES D'EMPLOI:
+{jobs_block}
+
+Fournis UNIQUEMENT un tableau JSON contenant une analyse par offre et par profil, au
+format indiqué, avec en plus les champs "job_id" de l'offre et "profile_id" du profil:
+[
+    {{"job_id": "job_0", "profile_id": "...", ...analyse...}},
+    ...
+]
 """
+
+
+class _FakeResponse:
+    """Réponse minimale imitant celle de google.generativeai."""
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """
+    Modèle local déterministe imitant genai.GenerativeModel, pour tester
+    l'application sans clé API ni accès réseau.
+    
+    Le score dépend de la proportion des termes du profil présents dans
+    l'offre : une même offre reçoit toujours la même analyse.
+    """
+    
+    def __init__(self, profiles: Optional[List[Profile]] = None):
+        self.profile_terms = {
+            profile.id: {
+                term for term in re.findall(r"[a-zA-Z][a-zA-Z+#&]{3,}", profile.text.lower())
+            }
+            for profile in (profiles or [DEFAULT_PROFILE])
+        }
+        self.default_profile_id = next(iter(self.profile_terms))
+        self.calls = 0
+    
+    def _analysis(self, job_text: str, profile_id: Optional[str] = None) -> dict:
+        job_terms = set(re.findall(r"[a-zA-Z][a-zA-Z+#&]{3,}", job_text.lower()))
+        profile_terms = self.profile_terms.get(profile_id or self.default_profile_id, set())
+        matched = sorted(profile_terms & job_terms)
+        # Légère variation déterministe pour départager les offres
+        jitter = int(hashlib.sha256(job_text.encode("utf-8")).hexdigest(), 16) % 5
+        score = min(100, len(matched) * 4 + jitter)
+        
+        if score >= 70:
+            verdict = "COMPATIBLE"
+        elif score >= 40:
+            verdict = "MOYENNEMENT COMPATIBLE"
+        else:
+            verdict = "NON COMPATIBLE"
+        
+        return {
+            "verdict": verdict,
+            "score_pertinence": score,
+            "analyse_succincte": f"Analyse simulée : {len(matched)} termes du profil retrouvés dans l'offre.",
+            "points_forts": matched[:3],
+            "points_faibles": [] if matched else ["Aucun terme du profil retrouvé"]
+        }
+    
+    def generate_content(self, contents, **kwargs) -> _FakeResponse:
+        self.calls += 1
+        prompt = contents if isinstance(contents, str) else str(contents)
+        
+        parts = _JOB_ID_PATTERN.split(prompt)
+        if len(parts) > 1:
+            # Requête groupée : parts = [entête, id_0, texte_0, id_1, texte_1, ...]
+            entries = []
+            for job_id, text in zip(parts[1::2], parts[2::2]):
+                match = _PROFILES_PATTERN.search(text)
+                if match is None:
+                    entries.append({"job_id": job_id, **self._analysis(text)})
+                    continue
+                for profile_id in match.group(1).split(", "):
+                    entries.append({"job_id": job_id, "profile_id": profile_id,
+                                    **self._analysis(text, profile_id)})
+            text = json.dumps(entries, ensure_ascii=False)
+            return self._respond(text, kwargs.get("stream", False))
+        
+        match = _PROFILES_PATTERN.search(prompt)
+        analysis = self._analysis(prompt, match.group(1) if match else None)
+        text = json.dumps(analysis, ensure_ascii=False)
+        return self._respond(text, kwargs.get("stream", False))
+    
+    @staticmethod
+    def _respond(text: str, stream: bool):
+        """Réponse complète, ou flux de morceaux si stream=True."""
+        if not stream:
+            return _FakeResponse(text)
+        return iter([_FakeResponse(text[start:start + 64]) for start in range(0, len(text), 64)])
+
+
+class GeminiAnalyzer:
+    """
+    Analyseur de compatibilité réutilisable, à créer une fois par processus.
+    
+    Le client Gemini est configuré une seule fois et la partie statique du
+    prompt (profils, consignes, format) est portée par l'instruction système,
+    ou par un contexte mis en cache côté serveur lorsque le modèle le permet.
+    Chaque offre est évaluée pour tous les profils de l'analyseur, dans la
+    même requête.
+    """
+    analysis_format = ANALYSIS_FORMAT
+    required_keys = REQUIRED_KEYS
+    prompt_version = PROMPT_VERSION
+    response_schema = ANALYSIS_SCHEMA
+    output_tokens_per_job = GEMINI_OUTPUT_TOKENS_PER_JOB
+    expected_output_tokens = ANALYSIS_EXPECTED_OUTPUT_TOKENS
+    
+    def __init__(self, api_key: str, cache: Optional[AnalysisCache] = None,
+                 model=None, context_cache: bool = GEMINI_CONTEXT_CACHE,
+                 model_name: str = GEMINI_MODEL,
+                 profiles: Optional[List[Profile]] = None):
+        """
+        Args:
+            api_key: Clé API Gemini
+            cache: Cache persistant des analyses (optionnel)
+            model: Modèle à utiliser à la place de Gemini (ex: FakeGenerativeModel)
+            context_cache: Mettre en cache le contexte statique côté serveur
+            model_name: Nom du modèle Gemini
+            profiles: Profils de candidats évalués (défaut: profil de config.py)
+        """
+        self.model_name = model_name
+        self.profiles = list(profiles or [DEFAULT_PROFILE])
+        self._profiles_by_id = {profile.id: profile for profile in self.profiles}
+        self.multi_profile = len(self.profiles) > 1
+        self.system_instruction = _system_instruction(self.analysis_format, self.profiles)
+        self.cache = cache
+        self.context_cache = context_cache
+        self._model = model
+        self._model_expires_at = float("inf")
+        self._model_lock = threading.Lock()
+        
+        if model is None:
+            genai.configure(api_key=api_key)
+    
+    def _create_model(self):
+        """Crée le modèle Gemini, avec contexte en cache si possible."""
+        if self.context_cache:
+            try:
+                ttl = timedelta(minutes=GEMINI_CONTEXT_CACHE_TTL_MINUTES)
+                cached_content = genai.caching.CachedContent.create(
+                    model=f"models/{self.model_name}",
+                    system_instruction=self.system_instruction,
+                    ttl=ttl
+                )
+                # Recréer le contexte un peu avant son expiration côté serveur
+                self._model_expires_at = time.monotonic() + ttl.total_seconds() - 60
+                return genai.GenerativeModel.from_cached_content(cached_content)
+            except Exception as e:
+                # Ex: contexte trop court pour le cache du modèle
+                print(f"Cache de contexte Gemini indisponible, instruction système utilisée: {e}")
+                self.context_cache = False
+        
+        self._model_expires_at = float("inf")
+        return genai.GenerativeModel(self.model_name, system_instruction=self.system_instruction)
+    
+    def _get_model(self):
+        """Retourne le modèle partagé, recréé si son contexte en cache expire."""
+        with self._model_lock:
+            if self._model is None or time.monotonic() >= self._model_expires_at:
+                self._model = self._create_model()
+            return self._model
+    
+    def _generation_config(self, job_count: int = 1) -> genai.GenerationConfig:
+        """
+        Configuration de sortie : JSON conforme au schéma de l'analyseur et
+        nombre de tokens borné selon le nombre d'analyses demandées.
         
-        # Appel à l'API
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        Args:
+            job_count: Nombre d'analyses (offre, profil) de la requête
+                (0 = requête individuelle)
+        """
+        schema = (_batch_schema(self.response_schema, self.multi_profile)
+                  if job_count else self.response_schema)
+        return genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=schema,
+            max_output_tokens=GEMINI_OUTPUT_TOKENS_BASE
+            + max(job_count, 1) * self.output_tokens_per_job
+        )
+    
+    def _stream_json(self, prompt: str, generation_config, cancel: threading.Event,
+                     parts: Optional[List[str]] = None) -> Tuple[str, object]:
+        """
+        Lit la réponse du modèle en flux, sous un délai maximal par appel.
         
-        # Nettoyer la réponse (enlever les markdown code blocks si présents)
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-            response_text = response_text.strip()
+        La lecture s'arrête dès que la valeur JSON est fermée, ou dès qu'un
+        autre appel couvrant la même requête a répondu.
         
-        # Parser le JSON
-        analysis = json.loads(response_text)
+        Args:
+            parts: Liste recevant les morceaux de texte au fil de la lecture
+                (permet de compter la sortie d'un appel interrompu)
         
-        # Valider la structure
-        required_keys = ["verdict", "score_pertinence", "analyse_succincte", 
-                        "points_forts", "points_faibles"]
-        if not all(key in analysis for key in required_keys):
-            raise ValueError("Réponse JSON incomplète de l'API")
+        Returns:
+            Tuple (texte de la réponse, dernières usage_metadata reçues)
         
-        return analysis
+        Raises:
+            TimeoutError: Si le délai GEMINI_CALL_TIMEOUT est dépassé
+        """
+        deadline = time.monotonic() + GEMINI_CALL_TIMEOUT
+        response = self._get_model().generate_content(
+            prompt, generation_config=generation_config, stream=True,
+            request_options={"timeout": GEMINI_CALL_TIMEOUT}
+        )
+        scanner = JsonStreamScanner()
+        parts = [] if parts is None else parts
+        usage_metadata = None
+        for chunk in response:
+            usage_metadata = getattr(chunk, "usage_metadata", None) or usage_metadata
+            try:
+                text = chunk.text
+            except ValueError:
+                # Morceau sans texte (ex: raison de fin seule)
+                continue
+            parts.append(text)
+            if scanner.feed(text) or cancel.is_set():
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Délai de {GEMINI_CALL_TIMEOUT}s dépassé")
+        return "".join(parts), usage_metadata
+    
+    def _generate(self, prompt: str, job_count: int = 0) -> Tuple[str, dict]:
+        """
+        Envoie un prompt au modèle et retourne le texte de la réponse avec
+        sa consommation (tokens_utilises, cout_usd).
         
-    except json.JSONDecodeError as e:
-        print(f"Erreur de parsing JSON: {e}")
-        return {
-            "verdict": "ERREUR",
-            "score_pertinence": 0,
-            "analyse_succincte": "Erreur lors de l'analyse de la réponse",
-            "points_forts": [],
-            "points_faibles": ["Erreur d'analyse"]
+        Chaque appel passe par le limiteur adaptatif du modèle : les
+        dépassements de quota (429/503) réduisent le débit et l'appel est
+        retenté après la pause imposée. Un appel plus lent que le p95
+        observé est doublé si le limiteur a une place libre (voir hedging.py).
+        
+        Args:
+            prompt: Prompt de la requête
+            job_count: Nombre d'analyses d'une requête groupée (0 = requête individuelle)
+        """
+        limiter = get_limiter("gemini", self.model_name)
+        hedger = get_hedger(f"{self.model_name}:{'lot' if job_count else 'unitaire'}")
+        generation_config = self._generation_config(job_count)
+        
+        # Texte reçu par chaque appel lancé (initial et doublon éventuel)
+        attempts: List[List[str]] = []
+        
+        def attempt(cancel: threading.Event):
+            parts: List[str] = []
+            attempts.append(parts)
+            return self._stream_json(prompt, generation_config, cancel, parts), parts
+        
+        def hedged_call():
+            attempts.clear()
+            return hedger.call(attempt, limiter)
+        
+        # Le doublon éventuel prend sa propre place dans le limiteur, sans
+        # attendre ; les latences mesurées excluent l'attente du limiteur
+        (response_text, usage_metadata), winner = limiter.call(
+            hedged_call, max_retries=HTTP_MAX_RETRIES
+        )
+        usage = usage_from_metadata(usage_metadata, self.system_instruction + prompt, response_text)
+        prompt_tokens, output_tokens = usage["prompt_tokens"], usage["output_tokens"]
+        
+        # Appel perdant : prompt facturé en entier, sortie reçue avant l'annulation
+        for parts in attempts:
+            if parts is not winner:
+                prompt_tokens += usage["prompt_tokens"]
+                output_tokens += estimate_tokens("".join(parts)) if parts else 0
+        
+        return response_text, {
+            "tokens_utilises": prompt_tokens + output_tokens,
+            "cout_usd": call_cost(self.model_name, prompt_tokens, output_tokens)
         }
-    except Exception as e:
-        print(f"Erreur lors de l'analyse Gemini: {e}")
-        return {
-            "verdict": "ERREUR",
-            "score_pertinence": 0,
-            "analyse_succincte": f"Erreur: {str(e)}",
-            "points_forts": [],
-            "points_faibles": ["Erreur technique"]
-        }
\ No newline at end of file
+    
+    def project(self, job_description: str,
+                prompt_tokens: Optional[int] = None) -> Tuple[int, float]:
+        """
+        Projette la consommation de l'analyse d'une offre.
+        
+        Args:
+            job_description: Texte de l'offre
+            prompt_tokens: Tokens du prompt déjà estimés (None = à estimer)
+            
+        Returns:
+            Tuple (tokens envoyés et générés pour tous les profils, coût en dollars)
+        """
+        if prompt_tokens is None:
+            prompt_tokens = estimate_tokens(_single_prompt(job_description))
+        # Part de l'instruction système, envoyée une fois par lot
+        prompt_tokens += estimate_tokens(self.system_instruction) // ANALYSIS_BATCH_MAX_JOBS
+        # Une analyse générée par profil
+        output_tokens = self.expected_output_tokens * len(self.profiles)
+        # Doublons des appels lents, au plus GEMINI_HEDGE_BUDGET des appels
+        if GEMINI_HEDGING:
+            prompt_tokens = round(prompt_tokens * (1 + GEMINI_HEDGE_BUDGET))
+            output_tokens = round(output_tokens * (1 + GEMINI_HEDGE_BUDGET))
+        return (prompt_tokens + output_tokens,
+                call_cost(self.model_name, prompt_tokens, output_tokens))
+    
+    def _profile(self, profile_id: Optional[str] = None) -> Profile:
+        """Retourne un profil de l'analyseur (le premier si non précisé)."""
+        if profile_id is None:
+            return self.profiles[0]
+        return self._profiles_by_id[profile_id]
+    
+    def _cache_key(self, job_description: str, profile_id: Optional[str] = None) -> str:
+        """Clé de cache d'une analyse pour le profil, le modèle et le prompt courants."""
+        return AnalysisCache.make_key(
+            job_description, self._profile(profile_id).text, self.model_name, self.prompt_version
+        )
+    
+    def _complete(self, analysis: dict) -> dict:
+        """Complète une réponse valide avec les champs propres à l'analyseur."""
+        analysis["modele"] = self.model_name
+        return analysis
+    
+    def analyze(self, job_description: str, profile_id: Optional[str] = None) -> dict:
+        """
+        Analyse la compatibilité entre un profil candidat et une offre d'emploi.
+        
+        Une réponse illisible ou incomplète est redemandée, jusqu'à
+        ANALYSIS_MAX_ATTEMPTS appels au total.
+        
+        Args:
+            job_description: Texte complet de l'offre d'emploi
+            profile_id: Profil à évaluer (défaut: premier profil)
+            
+        Returns:
+            Dictionnaire contenant l'analyse de compatibilité
+        """
+        profile = self._profile(profile_id)
+        prompt = _single_prompt(job_description, profile.id if self.multi_profile else None)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(job_description, profile.id)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._complete(cached)
+        
+        error = None
+        spent = {}
+        for attempt in range(ANALYSIS_MAX_ATTEMPTS):
+            try:
+                # Appel à l'API (sortie JSON imposée par le schéma)
+                response_text, usage = self._generate(prompt)
+                _add_usage(spent, usage)
+                
+                # Parser le JSON, en réparant les défauts courants
+                analysis = parse_json_response(response_text)
+                
+                # Valider la structure
+                if not _is_valid_analysis(analysis, self.required_keys):
+                    raise ValueError("Réponse JSON incomplète de l'API")
+                
+                # Seules les analyses valides sont mises en cache
+                if cache_key is not None:
+                    self.cache.set(cache_key, analysis)
+                
+                return _add_usage(self._complete(analysis), spent)
+                
+            except Exception as e:
+                error = e
+                print(f"Erreur lors de l'analyse Gemini (tentative {attempt + 1}"
+                      f"/{ANALYSIS_MAX_ATTEMPTS}): {e}")
+        
+        return _add_usage(_error_analysis(f"Erreur: {error}", "Erreur technique"), spent)
+    
+    def _pack_batches(self, job_descriptions: List[str],
+                      analysis_counts: Optional[List[int]] = None) -> List[List[int]]:
+        """
+        Regroupe les offres en lots respectant le budget de tokens par requête.
+        
+        Args:
+            job_descriptions: Textes des offres à analyser
+            analysis_counts: Nombre d'analyses (profils) demandées par offre ;
+                un lot compte au plus ANALYSIS_BATCH_MAX_JOBS analyses
+            
+        Returns:
+            Liste de lots, chaque lot étant une liste d'indices d'offres
+        """
+        if analysis_counts is None:
+            analysis_counts = [1] * len(job_descriptions)
+        base_tokens = estimate_tokens(self.system_instruction) + 200
+        batches = []
+        current = []
+        current_tokens = base_tokens
+        current_analyses = 0
+        
+        for index, job_description in enumerate(job_descriptions):
+            job_tokens = estimate_tokens(job_description[:MAX_JOB_CHARS])
+            full = current_analyses + analysis_counts[index] > ANALYSIS_BATCH_MAX_JOBS
+            over_budget = current_tokens + job_tokens > ANALYSIS_BATCH_TOKEN_BUDGET
+            if current and (full or over_budget):
+                batches.append(current)
+                current = []
+                current_tokens = base_tokens
+                current_analyses = 0
+            current.append(index)
+            current_tokens += job_tokens
+            current_analyses += analysis_counts[index]
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _analyze_batch(self, job_descriptions: List[str],
+                       profile_ids: List[List[str]]) -> Tuple[Dict[Tuple[str, str], dict], dict]:
+        """
+        Analyse plusieurs offres, pour un ou plusieurs profils chacune, en
+        une seule requête Gemini.
+        
+        Args:
+            job_descriptions: Textes des offres du lot
+            profile_ids: Profils à évaluer pour chaque offre
+            
+        Returns:
+            Tuple (dictionnaire {(identifiant d'offre, profil): analyse} des
+            entrées valides, consommation de la requête)
+        """
+        response_text, usage = self._generate(
+            _batch_prompt(job_descriptions, profile_ids if self.multi_profile else None),
+            sum(len(ids) for ids in profile_ids)
+        )
+        try:
+            entries = parse_json_response(response_text)
+        except ValueError as e:
+            # La requête a été facturée : sa consommation reste comptée
+            print(f"Erreur de parsing de la réponse groupée: {e}")
+            return {}, usage
+        if isinstance(entries, dict):
+            entries = [entries]
+        if not isinstance(entries, list):
+            print("La réponse groupée n'est pas un tableau JSON")
+            return {}, usage
+        
+        default_profile_id = self.profiles[0].id
+        analyses = {}
+        for entry in entries:
+            if isinstance(entry, dict) and _is_valid_analysis(entry, self.required_keys):
+                job_id = str(entry.pop("job_id", ""))
+                profile_id = str(entry.pop("profile_id", default_profile_id))
+                analyses[(job_id, profile_id)] = entry
+        return analyses, usage
+    
+    def analyze_pairs(self, pairs: List[Tuple[str, str]]) -> List[dict]:
+        """
+        Analyse des couples (offre, profil) en regroupant plusieurs analyses
+        par requête.
+        
+        Les profils et les consignes ne sont envoyés qu'une fois par lot, et
+        chaque offre n'y figure qu'une fois, avec la liste de ses profils à
+        évaluer. Les analyses absentes ou invalides dans la réponse d'un lot
+        sont redemandées individuellement.
+        
+        Args:
+            pairs: Couples (texte de l'offre, identifiant du profil)
+            
+        Returns:
+            Liste des analyses, dans l'ordre des couples
+        """
+        results: List[Optional[dict]] = [None] * len(pairs)
+        
+        # Reprendre les analyses déjà en cache, et regrouper les autres par offre
+        pending: Dict[str, List[int]] = {}
+        for index, (job_description, profile_id) in enumerate(pairs):
+            cached = None
+            if self.cache is not None:
+                cached = self.cache.get(self._cache_key(job_description, profile_id))
+            if cached is not None:
+                results[index] = self._complete(cached)
+            else:
+                pending.setdefault(job_description, []).append(index)
+        
+        pending_jobs = list(pending)
+        for batch in self._pack_batches(pending_jobs,
+                                        [len(pending[job]) for job in pending_jobs]):
+            jobs = [pending_jobs[position] for position in batch]
+            profile_ids = [[pairs[index][1] for index in pending[job]] for job in jobs]
+            try:
+                analyses, usage = self._analyze_batch(jobs, profile_ids)
+            except Exception as e:
+                print(f"Erreur lors de l'analyse Gemini groupée: {e}")
+                analyses, usage = {}, {}
+            
+            # Consommation du lot répartie entre ses analyses
+            analysis_count = sum(len(ids) for ids in profile_ids)
+            share = {key: value / analysis_count for key, value in usage.items()}
+            for position, job_description in enumerate(jobs):
+                for index in pending[job_description]:
+                    profile_id = pairs[index][1]
+                    analysis = analyses.get((f"job_{position}", profile_id))
+                    if analysis is None:
+                        # Repli sur un appel individuel pour les entrées manquantes
+                        results[index] = self.analyze(job_description, profile_id)
+                    else:
+                        if self.cache is not None:
+                            self.cache.set(self._cache_key(job_description, profile_id), analysis)
+                        results[index] = self._complete(analysis)
+                    _add_usage(results[index], share)
+        
+        return results
+    
+    def analyze_batch(self, job_descriptions: List[str]) -> List[Dict[str, dict]]:
+        """
+        Analyse un ensemble d'offres pour tous les profils de l'analyseur.
+        
+        Args:
+            job_descriptions: Textes complets des offres d'emploi
+            
+        Returns:
+            Pour chaque offre, dans l'ordre, un dictionnaire
+            {identifiant du profil: analyse}
+        """
+        pairs = [(job_description, profile.id)
+                 for job_description in job_descriptions for profile in self.profiles]
+        analyses = iter(self.analyze_pairs(pairs))
+        return [{profile.id: next(analyses) for profile in self.profiles}
+                for _ in job_descriptions]
+
+
+class ScreeningAnalyzer(GeminiAnalyzer):
+    """
+    Analyseur de filtrage rapide : verdict et score seulement, avec un
+    modèle économique.
+    """
+    analysis_format = SCREENING_FORMAT
+    required_keys = SCREENING_REQUIRED_KEYS
+    prompt_version = SCREENING_PROMPT_VERSION
+    response_schema = SCREENING_SCHEMA
+    output_tokens_per_job = SCREENING_OUTPUT_TOKENS_PER_JOB
+    expected_output_tokens = SCREENING_EXPECTED_OUTPUT_TOKENS
+    
+    def __init__(self, api_key: str, cache: Optional[AnalysisCache] = None,
+                 model=None, context_cache: bool = GEMINI_CONTEXT_CACHE,
+                 model_name: str = SCREENING_MODEL,
+                 profiles: Optional[List[Profile]] = None):
+        super().__init__(api_key, cache=cache, model=model, context_cache=context_cache,
+                         model_name=model_name, profiles=profiles)
+    
+    def _complete(self, analysis: dict) -> dict:
+        """Ajoute les champs de l'analyse complète absents du filtrage rapide."""
+        if analysis.get("verdict") == "ERREUR":
+            return analysis
+        analysis = {key: analysis[key] for key in SCREENING_REQUIRED_KEYS}
+        analysis["analyse_succincte"] = (
+            f"Écartée au filtrage rapide (score {analysis['score_pertinence']})."
+        )
+        analysis["points_forts"] = []
+        analysis["points_faibles"] = []
+        return super()._complete(analysis)
+
+
+class CascadeAnalyzer:
+    """
+    Cascade à deux niveaux : un modèle rapide filtre toutes les offres, et
+    seules celles au-dessus du seuil reçoivent l'analyse complète. Le
+    filtrage s'applique à chaque couple (offre, profil) : une offre peut
+    être retenue pour un profil et écartée pour un autre.
+    """
+    
+    def __init__(self, screener: ScreeningAnalyzer, scorer: GeminiAnalyzer,
+                 threshold: int = CASCADE_THRESHOLD):
+        """
+        Args:
+            screener: Analyseur de filtrage rapide
+            scorer: Analyseur complet, réservé aux offres retenues
+            threshold: Score de filtrage minimum pour l'analyse complète
+        """
+        self.profiles = scorer.profiles
+        self.screener = screener
+        self.scorer = scorer
+        self.threshold = threshold
+    
+    def project(self, job_description: str,
+                prompt_tokens: Optional[int] = None) -> Tuple[int, float]:
+        """
+        Projette la consommation d'une offre, en supposant prudemment
+        qu'elle passe le filtrage et reçoit aussi l'analyse complète.
+        """
+        projections = [analyzer.project(job_description, prompt_tokens)
+                       for analyzer in (self.screener, self.scorer)]
+        return (sum(tokens for tokens, _ in projections),
+                sum(cost for _, cost in projections))
+    
+    def _passes_screening(self, analysis: dict) -> bool:
+        """Indique si une offre filtrée mérite l'analyse complète."""
+        try:
+            return float(analysis["score_pertinence"]) >= self.threshold
+        except (TypeError, ValueError):
+            return False
+    
+    def analyze_batch(self, job_descriptions: List[str]) -> List[Dict[str, dict]]:
+        """
+        Filtre toutes les offres puis analyse en détail celles retenues.
+        
+        Args:
+            job_descriptions: Textes complets des offres d'emploi
+            
+        Returns:
+            Pour chaque offre, dans l'ordre, un dictionnaire
+            {identifiant du profil: analyse}
+        """
+        pairs = [(job_description, profile.id)
+                 for job_description in job_descriptions for profile in self.profiles]
+        results = self.screener.analyze_pairs(pairs)
+        
+        # Une erreur de filtrage ne doit pas écarter l'offre : analyse complète
+        shortlist = [
+            index for index, analysis in enumerate(results)
+            if analysis["verdict"] == "ERREUR" or self._passes_screening(analysis)
+        ]
+        detailed = self.scorer.analyze_pairs([pairs[index] for index in shortlist])
+        for index, analysis in zip(shortlist, detailed):
+            # Le filtrage a aussi été consommé pour les offres retenues
+            results[index] = _add_usage(analysis, results[index])
+        
+        analyses = iter(results)
+        return [{profile.id: next(analyses) for profile in self.profiles}
+                for _ in job_descriptions]
+
+
+def get_compatibility_analysis(job_description: str, api_key: str,
+                               cache: Optional[AnalysisCache] = None) -> dict:
+    """
+    Analyse la compatibilité entre le profil candidat et une offre d'emploi.
+    
+    Raccourci pour une analyse isolée : pour un grand nombre d'offres,
+    préférer une instance de GeminiAnalyzer réutilisée.
+    
+    Args:
+        job_description: Texte complet de l'offre d'emploi
+        api_key: Clé API Gemini
+        cache: Cache persistant des analyses (optionnel)
+        
+    Returns:
+        Dictionnaire contenant l'analyse de compatibilité
+    """
+    analyzer = GeminiAnalyzer(api_key, cache=cache, context_cache=False)
+    return analyzer.analyze(job_description)
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Suivi des latences et requêtes couvertes (hedging) contre les appels lents
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from config import (
+    GEMINI_HEDGING, GEMINI_HEDGE_BUDGET, GEMINI_HEDGE_PERCENTILE,
+    GEMINI_HEDGE_MIN_SAMPLES, ANALYSIS_WORKERS
+)
+from rate_limit import AdaptiveLimiter, is_throttle_error
+
+
+# Nombre de latences conservées pour le calcul des percentiles
+LATENCY_WINDOW = 200
+
+# Threads partagés par les appels couverts (appel initial et doublon)
+_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS * 4)
+
+
+class LatencyTracker:
+    """Fenêtre glissante des dernières latences, partagée entre threads."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Ajoute la latence d'un appel réussi."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self) -> int:
+        """Nombre de latences dans la fenêtre."""
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Retourne le percentile demandé (None sans mesure)."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = min(int(len(samples) * percent / 100), len(samples) - 1)
+        return samples[rank]
+
+
+class Hedger:
+    """
+    Exécuteur d'appels couverts : si un appel dépasse le percentile de
+    latence observé, un doublon est lancé et la première réponse gagne.
+
+    Les doublons sont limités à une fraction du nombre d'appels et, sous un
+    limiteur, ne partent que s'ils obtiennent leur propre place sans attendre
+    (aucun doublon pendant une pause ou à pleine charge). L'appel perdant est
+    prévenu par l'événement d'annulation qu'il reçoit.
+    """
+
+    def __init__(self, name: str, enabled: bool = GEMINI_HEDGING,
+                 budget: float = GEMINI_HEDGE_BUDGET,
+                 percent: float = GEMINI_HEDGE_PERCENTILE,
+                 min_samples: int = GEMINI_HEDGE_MIN_SAMPLES):
+        """
+        Args:
+            name: Nom affiché de l'exécuteur
+            enabled: Lancer des doublons (sinon, seules les latences sont suivies)
+            budget: Part maximale d'appels supplémentaires (ex: 0.1 = 10 %)
+            percent: Percentile de latence déclenchant un doublon
+            min_samples: Mesures nécessaires avant le premier doublon
+        """
+        self.name = name
+        self.enabled = enabled
+        self.budget = budget
+        self.percent = percent
+        self.min_samples = min_samples
+        self.tracker = LatencyTracker()
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def threshold(self) -> Optional[float]:
+        """Délai au-delà duquel un doublon est lancé (None = pas de doublon)."""
+        if not self.enabled or self.tracker.count() < self.min_samples:
+            return None
+        return self.tracker.percentile(self.percent)
+
+    def _take_budget(self, limiter: Optional[AdaptiveLimiter] = None) -> bool:
+        """Réserve un appel supplémentaire s'il reste du budget et une place."""
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.calls:
+                return False
+            if limiter is not None and not limiter.try_acquire():
+                return False
+            self.hedges += 1
+            return True
+
+    @staticmethod
+    def _timed(func: Callable[[threading.Event], Any], cancel: threading.Event):
+        started = time.monotonic()
+        result = func(cancel)
+        return result, time.monotonic() - started
+
+    @classmethod
+    def _limited(cls, func: Callable[[threading.Event], Any], cancel: threading.Event,
+                 limiter: AdaptiveLimiter):
+        """Exécute le doublon et libère la place qu'il occupe dans le limiteur."""
+        try:
+            result, latency = cls._timed(func, cancel)
+        except Exception as e:
+            limiter.release(throttled=is_throttle_error(e))
+            raise
+        # Un appel interrompu ne renseigne pas sur la latence du service
+        limiter.release(latency=None if cancel.is_set() else latency)
+        return result, latency
+
+    def call(self, func: Callable[[threading.Event], Any],
+             limiter: Optional[AdaptiveLimiter] = None) -> Any:
+        """
+        Exécute un appel, couvert par un doublon s'il tarde.
+
+        Args:
+            func: Appel à effectuer ; reçoit un événement signalant qu'une
+                autre réponse a gagné et que l'appel peut s'interrompre
+            limiter: Limiteur de l'appel initial, dont le doublon doit obtenir
+                sa propre place (None = doublon non limité)
+
+        Returns:
+            Résultat du premier appel réussi
+
+        Raises:
+            Exception: Erreur du dernier appel si aucun n'a réussi
+        """
+        with self._lock:
+            self.calls += 1
+        cancel = threading.Event()
+        threshold = self.threshold()
+
+        if threshold is None:
+            result, latency = self._timed(func, cancel)
+            self.tracker.record(latency)
+            return result
+
+        primary = _executor.submit(self._timed, func, cancel)
+        futures = {primary: False}
+        done, _ = wait([primary], timeout=threshold)
+        if not done and self._take_budget(limiter):
+            if limiter is None:
+                futures[_executor.submit(self._timed, func, cancel)] = True
+            else:
+                futures[_executor.submit(self._limited, func, cancel, limiter)] = True
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result, latency = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                cancel.set()
+                self.tracker.record(latency)
+                if futures[future]:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return result
+        raise error
+
+    def stats(self) -> Dict[str, float]:
+        """Percentiles de latence et compteurs de doublons."""
+        with self._lock:
+            counters = {"calls": self.calls, "hedges": self.hedges,
+                        "hedge_wins": self.hedge_wins}
+        return {
+            "p50": self.tracker.percentile(50),
+            "p95": self.tracker.percentile(95),
+            "p99": self.tracker.percentile(99),
+            **counters
+        }
+
+
+_hedgers: Dict[str, Hedger] = {}
+_hedgers_lock = threading.Lock()
+
+
+def get_hedger(name: str) -> Hedger:
+    """
+    Retourne l'exécuteur couvert partagé d'un type d'appel.
+
+    Args:
+        name: Type d'appel aux latences comparables (ex: modèle et taille de lot)
+
+    Returns:
+        Exécuteur créé au premier appel puis réutilisé
+    """
+    with _hedgers_lock:
+        hedger = _hedgers.get(name)
+        if hedger is None:
+            hedger = Hedger(name)
+            _hedgers[name] = hedger
+        return hedger
+
+
+def hedger_stats() -> Dict[str, Dict[str, float]]:
+    """Retourne les statistiques de tous les exécuteurs créés."""
+    with _hedgers_lock:
+        hedgers = list(_hedgers.values())
+    return {hedger.name: hedger.stats() for hedger in hedgers}
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Couche HTTP partagée : session avec pool de connexions, retries et backoff
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    USER_AGENT, HTTP_TIMEOUT, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR,
+    HTTP_BACKOFF_MAX, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+)
+from rate_limit import THROTTLE_STATUS_CODES, get_limiter
+
+
+# Codes HTTP pour lesquels une nouvelle tentative est pertinente
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _accept_encoding() -> str:
+    """Encodages acceptés : brotli uniquement si un décodeur est installé."""
+    try:
+        import brotli  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return "gzip, deflate, br"
+        except ImportError:
+            return "gzip, deflate"
+
+
+def get_session() -> requests.Session:
+    """
+    Retourne la session HTTP partagée par toute l'application.
+    
+    La session conserve un pool de connexions keep-alive par hôte, ce qui
+    évite une poignée de main TLS à chaque appel vers le même serveur.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": _accept_encoding()
+            })
+            _session = session
+    return _session
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """
+    Lit l'en-tête Retry-After (en secondes ou en date HTTP).
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Délai exponentiel avec gigue pour la tentative `attempt` (0 = première)."""
+    delay = HTTP_BACKOFF_FACTOR * (2 ** attempt)
+    return min(delay, HTTP_BACKOFF_MAX) * random.uniform(0.5, 1.0)
+
+
+def request(method: str, url: str, upstream: str = "pages",
+            max_retries: int = HTTP_MAX_RETRIES, **kwargs) -> requests.Response:
+    """
+    Envoie une requête HTTP via la session partagée, avec retries.
+    
+    Chaque tentative passe par le limiteur adaptatif du service amont et
+    de l'hôte visés. Les erreurs de connexion, timeouts et réponses 429/5xx
+    sont retentés avec un backoff exponentiel, en respectant l'en-tête
+    Retry-After ; les réponses 429/503 réduisent en plus les limites.
+    
+    Args:
+        method: Méthode HTTP ("GET", "POST", ...)
+        url: URL cible
+        upstream: Service amont configuré dans RATE_LIMITS
+        max_retries: Nombre maximal de nouvelles tentatives
+        **kwargs: Arguments transmis à requests (json, headers, timeout, ...)
+        
+    Returns:
+        Réponse HTTP (le statut de la dernière tentative n'est pas vérifié)
+        
+    Raises:
+        requests.exceptions.RequestException: Si toutes les tentatives échouent
+    """
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    session = get_session()
+    limiter = get_limiter(upstream, urlparse(url).hostname or "")
+    
+    for attempt in range(max_retries + 1):
+        is_last_attempt = attempt == max_retries
+        limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            limiter.release()
+            if is_last_attempt:
+                raise
+            time.sleep(_backoff_delay(attempt))
+            continue
+        
+        retry_after = _retry_after_seconds(response)
+        if response.status_code in THROTTLE_STATUS_CODES:
+            limiter.release(throttled=True, retry_after=retry_after)
+        else:
+            limiter.release(latency=time.monotonic() - started)
+        
+        if response.status_code not in RETRY_STATUS_CODES or is_last_attempt:
+            return response
+        
+        delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+        response.close()
+        time.sleep(min(delay, HTTP_BACKOFF_MAX))
+    
+    return response
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Raccourci pour une requête GET via la session partagée."""
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Raccourci pour une requête POST via la session partagée."""
+    return request("POST", url, **kwargs)
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Stockage persistant (SQLite) des offres analysées et de leurs résultats
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Colonnes de tri autorisées, par nom affiché
+SORT_COLUMNS = {
+    "Score": "a.score",
+    "Pré-score": "j.prerank_score",
+    "Date limite": "j.closing_date",
+    "Analysée le": "a.analyzed_at"
+}
+
+# Colonnes des résultats, dans l'ordre du tableau affiché
+_RESULT_COLUMNS = """
+    j.url, j.title, j.organisation, j.closing_date, j.categories, j.prerank_score,
+    a.profile_name, a.verdict, a.score, a.summary, a.strengths, a.weaknesses, a.model,
+    a.tokens_saved, a.tokens_used, a.cost_usd, a.duplicate_of, a.analyzed_at
+"""
+
+
+def text_hash(text: str) -> str:
+    """Empreinte SHA-256 du texte normalisé (espaces) d'une offre."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """
+    Historique des offres et de leurs analyses, conservé entre les exécutions.
+    
+    Chaque offre est enregistrée une fois (métadonnées, empreinte du texte,
+    date de récupération), avec une analyse par profil et par modèle ; seule
+    la dernière analyse d'un couple (offre, profil) est courante. Le filtrage,
+    le tri et les statistiques sont calculés par SQLite sur des colonnes
+    indexées (score, verdict, date limite, catégorie).
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Chemin du fichier SQLite
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Connexion partagée entre les sessions Streamlit, protégée par un verrou
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    url TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    organisation TEXT NOT NULL,
+                    closing_date TEXT NOT NULL,
+                    categories TEXT NOT NULL,
+                    prerank_score REAL NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    scraped_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS job_categories (
+                    url TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    PRIMARY KEY (url, category)
+                );
+                CREATE TABLE IF NOT EXISTS analyses (
+                    url TEXT NOT NULL,
+                    profile_id TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    profile_name TEXT NOT NULL,
+                    verdict TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    summary TEXT NOT NULL,
+                    strengths TEXT NOT NULL,
+                    weaknesses TEXT NOT NULL,
+                    tokens_saved INTEGER NOT NULL,
+                    tokens_used INTEGER NOT NULL,
+                    cost_usd REAL NOT NULL,
+                    duplicate_of TEXT NOT NULL,
+                    analyzed_at REAL NOT NULL,
+                    is_current INTEGER NOT NULL,
+                    PRIMARY KEY (url, profile_id, model)
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_closing ON jobs (closing_date);
+                CREATE INDEX IF NOT EXISTS idx_job_categories ON job_categories (category, url);
+                CREATE INDEX IF NOT EXISTS idx_analyses_score
+                    ON analyses (score) WHERE is_current = 1;
+                CREATE INDEX IF NOT EXISTS idx_analyses_verdict
+                    ON analyses (verdict, score) WHERE is_current = 1;
+                CREATE INDEX IF NOT EXISTS idx_analyses_profile
+                    ON analyses (profile_name, score) WHERE is_current = 1;
+                """
+            )
+    
+    def save_job(self, record: Dict, analyses: Iterable[Tuple[str, str, Dict]],
+                 text_digest: str, duplicate_of: str = "") -> None:
+        """
+        Enregistre une offre et ses analyses, en une seule transaction.
+        
+        Args:
+            record: Fiche de l'offre ("fetched_at" : heure de récupération du
+                texte, à défaut l'heure de l'enregistrement)
+            analyses: Triplets (identifiant du profil, nom du profil, analyse)
+            text_digest: Empreinte du texte condensé analysé (voir text_hash)
+            duplicate_of: URL de l'offre représentante si l'offre est un doublon
+        """
+        now = time.time()
+        url = record["url"]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (url, title, organisation, closing_date, "
+                "categories, prerank_score, text_hash, scraped_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, record["title"], record["source"], record["closing_date"][:10],
+                 ", ".join(record["categories"]), record["prerank_score"], text_digest,
+                 record.get("fetched_at", now))
+            )
+            self._conn.execute("DELETE FROM job_categories WHERE url = ?", (url,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO job_categories (url, category) VALUES (?, ?)",
+                [(url, category) for category in record["categories"]]
+            )
+            
+            for profile_id, profile_name, analysis in analyses:
+                # La nouvelle analyse remplace les précédentes du profil (autres modèles)
+                self._conn.execute(
+                    "UPDATE analyses SET is_current = 0 WHERE url = ? AND profile_id = ?",
+                    (url, profile_id)
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO analyses (url, profile_id, model, profile_name, "
+                    "verdict, score, summary, strengths, weaknesses, tokens_saved, "
+                    "tokens_used, cost_usd, duplicate_of, analyzed_at, is_current) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+                    (url, profile_id, analysis.get("modele", ""), profile_name,
+                     analysis["verdict"], int(analysis["score_pertinence"]),
+                     analysis["analyse_succincte"],
+                     json.dumps(analysis["points_forts"], ensure_ascii=False),
+                     json.dumps(analysis["points_faibles"], ensure_ascii=False),
+                     # Consommation comptée sur l'offre représentante uniquement
+                     0 if duplicate_of else analysis.get("tokens_economises", 0),
+                     0 if duplicate_of else round(analysis.get("tokens_utilises", 0)),
+                     0.0 if duplicate_of else analysis.get("cout_usd", 0.0),
+                     duplicate_of, now)
+                )
+    
+    @staticmethod
+    def _where(profiles: Optional[List[str]] = None, verdicts: Optional[List[str]] = None,
+               min_score: int = 0, categories: Optional[List[str]] = None,
+               closing_after: str = "") -> Tuple[str, list]:
+        """
+        Construit la clause WHERE des filtres (analyses courantes uniquement).
+        
+        Args:
+            profiles: Noms des profils retenus (None = tous)
+            verdicts: Verdicts retenus (None = tous)
+            min_score: Score minimum
+            categories: Catégories de recherche retenues (None = toutes)
+            closing_after: Date limite minimale, au format AAAA-MM-JJ ("" = aucune)
+        """
+        clauses = ["a.is_current = 1"]
+        params: list = []
+        if profiles is not None:
+            clauses.append(f"a.profile_name IN ({', '.join('?' * len(profiles))})")
+            params.extend(profiles)
+        if verdicts is not None:
+            clauses.append(f"a.verdict IN ({', '.join('?' * len(verdicts))})")
+            params.extend(verdicts)
+        if min_score:
+            clauses.append("a.score >= ?")
+            params.append(min_score)
+        if categories is not None:
+            clauses.append(
+                "j.url IN (SELECT url FROM job_categories "
+                f"WHERE category IN ({', '.join('?' * len(categories))}))"
+            )
+            params.extend(categories)
+        if closing_after:
+            # Les offres sans date limite restent ouvertes
+            clauses.append("(j.closing_date >= ? OR j.closing_date = '')")
+            params.append(closing_after)
+        return " AND ".join(clauses), params
+    
+    def query(self, order_by: str = "Score", descending: bool = True,
+              limit: Optional[int] = None, **filters) -> List[Dict]:
+        """
+        Retourne les résultats filtrés et triés, une ligne par offre et par profil.
+        
+        Args:
+            order_by: Colonne de tri (clé de SORT_COLUMNS)
+            descending: Tri décroissant
+            limit: Nombre maximum de lignes (None = toutes)
+            **filters: Filtres acceptés par _where
+        
+        Returns:
+            Lignes du tableau de résultats, avec les colonnes affichées
+        """
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"Colonne de tri inconnue: {order_by}")
+        where, params = self._where(**filters)
+        sql = (
+            f"SELECT {_RESULT_COLUMNS} FROM analyses a JOIN jobs j ON j.url = a.url "
+            f"WHERE {where} ORDER BY {SORT_COLUMNS[order_by]} "
+            f"{'DESC' if descending else 'ASC'}, j.url, a.profile_name"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        
+        return [
+            {
+                "URL": row[0],
+                "Titre": row[1],
+                "Organisation": row[2],
+                "Date limite": row[3],
+                "Catégories": row[4],
+                "Pré-score": round(row[5] * 100),
+                "Profil": row[6],
+                "Verdict": row[7],
+                "Score": row[8],
+                "Analyse": row[9],
+                "Points Forts": ", ".join(json.loads(row[10])),
+                "Points Faibles": ", ".join(json.loads(row[11])),
+                "Modèle": row[12],
+                "Tokens économisés": row[13],
+                "Tokens utilisés": row[14],
+                "Coût ($)": round(row[15], 4),
+                "Doublon de": row[16],
+                "Analysée le": time.strftime("%Y-%m-%d %H:%M", time.localtime(row[17]))
+            }
+            for row in rows
+        ]
+    
+    def summary(self, **filters) -> Dict[str, float]:
+        """
+        Statistiques des résultats filtrés : nombre de lignes et d'offres,
+        score moyen et maximum, verdicts compatibles, tokens économisés.
+        """
+        where, params = self._where(**filters)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT a.url), AVG(a.score), MAX(a.score), "
+                "SUM(a.verdict = 'COMPATIBLE'), SUM(a.tokens_saved) "
+                f"FROM analyses a JOIN jobs j ON j.url = a.url WHERE {where}",
+                params
+            ).fetchone()
+        return {
+            "rows": row[0],
+            "jobs": row[1],
+            "mean_score": row[2] or 0.0,
+            "max_score": row[3] or 0,
+            "compatible": row[4] or 0,
+            "tokens_saved": row[5] or 0
+        }
+    
+    def category_counts(self, **filters) -> Dict[str, int]:
+        """Nombre de lignes de résultats par catégorie de recherche."""
+        where, params = self._where(**filters)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.category, COUNT(*) FROM analyses a "
+                "JOIN jobs j ON j.url = a.url JOIN job_categories c ON c.url = a.url "
+                f"WHERE {where} GROUP BY c.category ORDER BY COUNT(*) DESC",
+                params
+            ).fetchall()
+        return dict(rows)
+    
+    def distinct_values(self) -> Dict[str, List[str]]:
+        """Profils, verdicts et catégories présents, pour les listes de filtres."""
+        with self._lock:
+            profiles = self._conn.execute(
+                "SELECT DISTINCT profile_name FROM analyses WHERE is_current = 1 "
+                "ORDER BY profile_name"
+            ).fetchall()
+            verdicts = self._conn.execute(
+                "SELECT DISTINCT verdict FROM analyses WHERE is_current = 1 ORDER BY verdict"
+            ).fetchall()
+            categories = self._conn.execute(
+                "SELECT DISTINCT category FROM job_categories ORDER BY category"
+            ).fetchall()
+        return {
+            "profiles": [row[0] for row in profiles],
+            "verdicts": [row[0] for row in verdicts],
+            "categories": [row[0] for row in categories]
+        }
\ No newline at end of file
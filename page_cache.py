@@ -0,0 +1,115 @@
+"""
+Cache disque des pages d'offres pour le scraping par GET conditionnel
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class PageCache:
+    """
+    Cache des pages HTML avec leurs validateurs HTTP (ETag, Last-Modified).
+    
+    Le texte extrait est conservé à côté du HTML brut : une réponse 304
+    permet de réutiliser le texte sans nouveau parsing. Au-delà de la taille
+    maximale, les pages les moins récemment utilisées sont évincées (LRU).
+    """
+    
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Args:
+            path: Chemin du fichier SQLite
+            max_bytes: Taille maximale cumulée des pages en cache
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.max_bytes = max_bytes
+        
+        # Connexion partagée entre les workers du pipeline, protégée par un verrou
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body BLOB NOT NULL,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)"
+            )
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Retourne l'entrée en cache d'une URL (etag, last_modified, body, text).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, text FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "body": row[2], "text": row[3]}
+    
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """
+        Construit les en-têtes de revalidation pour une entrée en cache.
+        """
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    def touch(self, url: str) -> None:
+        """
+        Marque une entrée comme récemment utilisée (après une réponse 304).
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+    
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+              body: bytes, text: str) -> None:
+        """
+        Enregistre une page et son texte extrait, puis applique l'éviction LRU.
+        """
+        size = len(body) + len(text.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, etag, last_modified, body, text, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, text, size, time.time())
+            )
+            self._evict()
+    
+    def _evict(self) -> None:
+        """Supprime les pages les moins récemment utilisées au-delà de la taille maximale."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        evicted = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", evicted)
\ No newline at end of file
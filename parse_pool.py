@@ -0,0 +1,84 @@
+"""
+Pool de processus pour le parsing des pages (étape CPU du scraping)
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from config import EXTRACTION_BACKEND, PARSE_WORKERS, PARSE_CHUNKSIZE
+from documents import extract_docx_text, extract_pdf_text
+from extraction import extract_text
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _parse_one(page: Tuple[bytes, str, str]) -> str:
+    """Extrait le texte d'une page (exécuté dans un processus du pool)."""
+    content, url, document_type = page
+    try:
+        if document_type == "pdf":
+            return extract_pdf_text(content)
+        if document_type == "docx":
+            return extract_docx_text(content)
+        return extract_text(content, url, EXTRACTION_BACKEND)
+    except Exception as e:
+        print(f"Erreur de parsing pour {url}: {e}")
+        return ""
+
+
+def _start_method() -> str:
+    """
+    Mode de démarrage des processus du pool.
+    
+    Le processus Streamlit compte de nombreux threads (pipeline, limiteurs,
+    connexions SQLite) : un fork pourrait copier un verrou tenu par l'un
+    d'eux et bloquer le processus enfant. Les processus sont donc lancés
+    par un serveur dédié (forkserver) ou, à défaut (Windows), par spawn.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return "forkserver"
+    return "spawn"
+
+
+def get_parse_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Retourne le pool de processus partagé, ou None si le parsing doit
+    rester dans le processus courant (PARSE_WORKERS = 0).
+    
+    Le pool est arrêté à la sortie du processus.
+    """
+    global _executor
+    if PARSE_WORKERS == 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS or os.cpu_count(),
+                mp_context=multiprocessing.get_context(_start_method())
+            )
+            atexit.register(_executor.shutdown)
+    return _executor
+
+
+def parse_pages(pages: List[Tuple[bytes, str, str]]) -> List[str]:
+    """
+    Extrait le texte d'une liste de pages en parallèle sur tous les cœurs.
+    
+    Les pages sont envoyées aux processus par paquets de PARSE_CHUNKSIZE
+    pour limiter le coût des échanges inter-processus.
+    
+    Args:
+        pages: Liste de tuples (contenu brut, URL, type "html", "pdf" ou "docx")
+        
+    Returns:
+        Textes extraits, dans l'ordre des pages (chaîne vide en cas d'échec)
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return [_parse_one(page) for page in pages]
+    return list(executor.map(_parse_one, pages, chunksize=PARSE_CHUNKSIZE))
\ No newline at end of file
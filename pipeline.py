@@ -0,0 +1,176 @@
+"""
+Moteur d'exécution en pipeline pour le traitement des offres d'emploi
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+# Marqueur de fin de flux transmis d'une étape à la suivante
+_END = object()
+
+
+@dataclass
+class Stage:
+    """
+    Étape du pipeline : une fonction appliquée par un pool borné de workers.
+
+    Une fonction qui renvoie une valeur vide (None, "") ou qui lève une
+    exception retire l'élément du pipeline.
+    
+    Avec batch_size > 1, la fonction reçoit une liste d'au plus batch_size
+    valeurs (regroupées pendant batch_wait secondes au maximum) et doit
+    renvoyer la liste des résultats dans le même ordre.
+    """
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    batch_size: int = 1
+    batch_wait: float = 0.05
+
+
+@dataclass
+class PipelineResult:
+    """Résultat d'un élément sorti du pipeline."""
+    item: Any
+    result: Any = None
+    dropped_at: Optional[str] = None  # Nom de l'étape ayant rejeté l'élément
+
+
+def _put(target: queue.Queue, value: Any, stop: threading.Event) -> bool:
+    """Dépose une valeur dans une file bornée en restant interruptible."""
+    while not stop.is_set():
+        try:
+            target.put(value, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def run_pipeline(items: Iterable[Any], stages: List[Stage]) -> Iterator[PipelineResult]:
+    """
+    Fait passer les éléments à travers une suite d'étapes concurrentes.
+
+    Chaque étape dispose de son propre pool de threads et communique avec la
+    suivante par une file bornée : le traitement de l'élément N+1 par une
+    étape se recouvre avec celui de l'élément N par l'étape suivante.
+
+    Args:
+        items: Éléments d'entrée (ex: URLs des offres)
+        stages: Étapes à enchaîner, dans l'ordre
+
+    Yields:
+        Un PipelineResult par élément d'entrée, dans l'ordre de complétion
+    """
+    stop = threading.Event()
+    # Files bornées entre étapes pour limiter la mémoire (contre-pression)
+    queues = [queue.Queue(maxsize=max(stage.workers * stage.batch_size * 2, 1))
+              for stage in stages]
+    output: queue.Queue = queue.Queue()
+    threads = []
+
+    def feeder():
+        for item in items:
+            if not _put(queues[0], (item, item), stop):
+                return
+        _put(queues[0], _END, stop)
+
+    def make_worker(index: int, stage: Stage, remaining: List[int], lock: threading.Lock):
+        inbox = queues[index]
+        is_last = index == len(stages) - 1
+
+        def forward(item: Any, value: Any) -> None:
+            if not value:
+                output.put(PipelineResult(item=item, dropped_at=stage.name))
+            elif is_last:
+                output.put(PipelineResult(item=item, result=value))
+            else:
+                _put(queues[index + 1], (item, value), stop)
+
+        def process(entries: List[Any]) -> None:
+            items = [item for item, _ in entries]
+            values = [value for _, value in entries]
+            try:
+                if stage.batch_size > 1:
+                    results = stage.func(values)
+                else:
+                    results = [stage.func(values[0])]
+            except Exception as e:
+                print(f"Erreur à l'étape '{stage.name}' pour {items}: {e}")
+                results = [None] * len(items)
+            for item, value in zip(items, results):
+                forward(item, value)
+
+        def collect(first: Any) -> Tuple[List[Any], bool]:
+            # Regroupe les éléments disponibles dans la limite du lot
+            entries = [first]
+            deadline = time.monotonic() + stage.batch_wait
+            while len(entries) < stage.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = inbox.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is _END:
+                    return entries, True
+                entries.append(entry)
+            return entries, False
+
+        def finish() -> None:
+            # Relayer le marqueur aux autres workers de l'étape
+            _put(inbox, _END, stop)
+            with lock:
+                remaining[0] -= 1
+                last_worker = remaining[0] == 0
+            if last_worker:
+                if is_last:
+                    output.put(_END)
+                else:
+                    _put(queues[index + 1], _END, stop)
+
+        def worker():
+            while not stop.is_set():
+                try:
+                    entry = inbox.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                if entry is _END:
+                    finish()
+                    return
+
+                entries, end_reached = collect(entry)
+                process(entries)
+                if end_reached:
+                    finish()
+                    return
+
+        return worker
+
+    threads.append(threading.Thread(target=feeder, daemon=True))
+    for index, stage in enumerate(stages):
+        remaining = [max(stage.workers, 1)]
+        lock = threading.Lock()
+        for _ in range(remaining[0]):
+            threads.append(threading.Thread(
+                target=make_worker(index, stage, remaining, lock),
+                daemon=True
+            ))
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            entry = output.get()
+            if entry is _END:
+                break
+            yield entry
+    finally:
+        # Libère les workers si le consommateur s'arrête avant la fin
+        stop.set()
@@ -0,0 +1,121 @@
+"""
+Pré-classement local des offres (BM25) avant l'analyse par Gemini
+"""
+import re
+from typing import Dict, List
+
+import numpy as np
+from scipy import sparse
+
+
+# Mots vides fréquents (anglais et français) ignorés lors du classement
+STOPWORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "are", "will", "have", "has",
+    "our", "you", "your", "all", "not", "but", "can", "its", "their", "they", "into",
+    "les", "des", "une", "pour", "dans", "avec", "par", "sur", "est", "aux", "qui",
+    "que", "ses", "son", "pas", "plus"
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9&+#]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Découpe un texte en termes normalisés (minuscules, sans mots vides).
+    """
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def bm25_scores(documents: List[str], query_terms: Dict[str, float],
+                k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """
+    Calcule le score BM25 de chaque document pour une requête pondérée.
+    
+    Les documents sont représentés par une matrice creuse (documents ×
+    termes) : le score de toutes les offres est un seul produit
+    matrice-vecteur.
+    
+    Args:
+        documents: Textes des documents
+        query_terms: Poids de chaque terme de la requête
+        k1: Saturation de la fréquence des termes
+        b: Normalisation par la longueur des documents
+        
+    Returns:
+        Tableau des scores, dans l'ordre des documents
+    """
+    if not documents:
+        return np.zeros(0)
+    
+    # Vocabulaire limité aux termes de la requête : les autres ne comptent pas
+    vocabulary = {term: index for index, term in enumerate(query_terms)}
+    rows, cols, lengths = [], [], []
+    for row, document in enumerate(documents):
+        tokens = tokenize(document)
+        lengths.append(len(tokens))
+        for token in tokens:
+            col = vocabulary.get(token)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    
+    shape = (len(documents), len(vocabulary))
+    tf = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=shape
+    )
+    tf.sum_duplicates()
+    
+    lengths = np.asarray(lengths, dtype=float)
+    avg_length = lengths.mean() or 1.0
+    
+    # Fréquence documentaire et IDF de chaque terme
+    document_frequency = np.bincount(tf.indices, minlength=shape[1])
+    n_documents = shape[0]
+    idf = np.log1p((n_documents - document_frequency + 0.5) / (document_frequency + 0.5))
+    
+    # Pondération BM25 appliquée directement aux valeurs non nulles
+    row_lengths = np.repeat(lengths, np.diff(tf.indptr))
+    tf.data = tf.data * (k1 + 1) / (tf.data + k1 * (1 - b + b * row_lengths / avg_length))
+    
+    query_weights = np.fromiter(query_terms.values(), dtype=float, count=shape[1])
+    return tf @ (idf * query_weights)
+
+
+def build_query_terms(profile: str, search_queries: Dict[str, List[str]],
+                      keyword_weight: float = 2.0) -> Dict[str, float]:
+    """
+    Construit la requête pondérée à partir du profil et des mots-clés de recherche.
+    
+    Args:
+        profile: Profil du candidat
+        search_queries: Dictionnaire de catégories avec listes de mots-clés
+        keyword_weight: Poids supplémentaire des termes des mots-clés
+        
+    Returns:
+        Dictionnaire {terme: poids}
+    """
+    query_terms: Dict[str, float] = {}
+    for token in set(tokenize(profile)):
+        query_terms[token] = 1.0
+    for queries in search_queries.values():
+        for token in set(tokenize(" ".join(queries))):
+            query_terms[token] = query_terms.get(token, 0.0) + keyword_weight
+    return query_terms
+
+
+def rank_jobs(job_texts: List[str], profile: str,
+              search_queries: Dict[str, List[str]]) -> np.ndarray:
+    """
+    Note la pertinence locale de chaque offre pour le profil, entre 0 et 1.
+    
+    Args:
+        job_texts: Textes des offres (titre et description)
+        profile: Profil du candidat
+        search_queries: Dictionnaire de catégories avec listes de mots-clés
+        
+    Returns:
+        Scores relatifs au meilleur score (1.0 pour la meilleure offre)
+    """
+    scores = bm25_scores(job_texts, build_query_terms(profile, search_queries))
+    best = scores.max() if scores.size else 0.0
+    return scores / best if best > 0 else scores
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Registre des profils de candidats évalués à chaque exécution
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import List
+
+from config import CANDIDATE_PROFILE, PROFILES_DIR
+
+
+# Extensions des fichiers de profil reconnues
+PROFILE_EXTENSIONS = (".md", ".txt")
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Profil de candidat : identifiant court, nom affiché et texte du profil."""
+    id: str
+    name: str
+    text: str
+
+
+# Profil utilisé lorsqu'aucun fichier de profil n'est présent
+DEFAULT_PROFILE = Profile("principal", "Profil principal", CANDIDATE_PROFILE)
+
+
+def _profile_id(filename: str) -> str:
+    """Identifiant utilisable dans les prompts, dérivé du nom de fichier."""
+    stem = os.path.splitext(filename)[0].lower()
+    return re.sub(r"[^a-z0-9]+", "_", stem).strip("_") or "profil"
+
+
+def load_profiles(directory: str = PROFILES_DIR) -> List[Profile]:
+    """
+    Charge les profils depuis les fichiers .md et .txt d'un répertoire.
+
+    Le nom affiché est le premier titre markdown ("# Nom") du fichier, à
+    défaut le nom du fichier ; le texte complet sert de profil. Si deux
+    fichiers donnent le même identifiant, le second reçoit un suffixe.
+
+    Args:
+        directory: Répertoire des profils
+
+    Returns:
+        Profils triés par nom de fichier, ou le profil de config.py si le
+        répertoire est absent ou vide
+    """
+    if not os.path.isdir(directory):
+        return [DEFAULT_PROFILE]
+
+    profiles = []
+    used_ids = set()
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(PROFILE_EXTENSIONS):
+            continue
+        with open(os.path.join(directory, filename), encoding="utf-8") as f:
+            text = f.read().strip()
+        if not text:
+            continue
+
+        heading = re.match(r"#\s+(.+)", text)
+        name = heading.group(1).strip() if heading else os.path.splitext(filename)[0]
+        
+        # Deux fichiers peuvent donner le même identifiant ("a b.md", "a-b.md")
+        base_id = profile_id = _profile_id(filename)
+        suffix = 2
+        while profile_id in used_ids:
+            profile_id = f"{base_id}_{suffix}"
+            suffix += 1
+        if profile_id != base_id:
+            print(f"Identifiant de profil '{base_id}' déjà utilisé, '{profile_id}' "
+                  f"attribué à {filename}")
+        used_ids.add(profile_id)
+        profiles.append(Profile(profile_id, name, text))
+
+    return profiles or [DEFAULT_PROFILE]
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Planification des requêtes ReliefWeb et attribution locale des catégories
+"""
+import re
+from typing import Dict, List, Tuple
+
+
+def plan_queries(search_queries: Dict[str, List[str]], max_length: int) -> List[str]:
+    """
+    Regroupe les mots-clés de toutes les catégories en quelques requêtes OR.
+    
+    Chaque mot-clé est placé entre parenthèses : avec l'opérateur OR de
+    l'API, "(a b) OR (c)" renvoie exactement l'union des résultats des
+    requêtes "a b" et "c" lancées séparément.
+    
+    Args:
+        search_queries: Dictionnaire de catégories avec listes de mots-clés
+        max_length: Longueur maximale d'une chaîne de requête
+        
+    Returns:
+        Liste de chaînes de requête fusionnées
+    """
+    # Mots-clés uniques (insensible à la casse), dans l'ordre de la configuration
+    keywords = []
+    seen = set()
+    for queries in search_queries.values():
+        for query in queries:
+            if query.lower() not in seen:
+                seen.add(query.lower())
+                keywords.append(query)
+    
+    planned = []
+    current = ""
+    for keyword in keywords:
+        clause = f"({keyword})"
+        candidate = f"{current} OR {clause}" if current else clause
+        if current and len(candidate) > max_length:
+            planned.append(current)
+            candidate = clause
+        current = candidate
+    if current:
+        planned.append(current)
+    
+    return planned
+
+
+def _term_pattern(term: str) -> re.Pattern:
+    """Motif d'un terme isolé, au singulier ou au pluriel."""
+    return re.compile(rf"(?<!\w){re.escape(term)}(?:s|es)?(?!\w)", re.IGNORECASE)
+
+
+def build_keyword_matchers(search_queries: Dict[str, List[str]]) -> List[Tuple[str, str, List[re.Pattern]]]:
+    """
+    Prépare les motifs de correspondance de chaque mot-clé.
+    
+    Args:
+        search_queries: Dictionnaire de catégories avec listes de mots-clés
+        
+    Returns:
+        Liste de tuples (catégorie, mot-clé, motifs des termes du mot-clé)
+    """
+    return [
+        (category, query, [_term_pattern(term) for term in query.split()])
+        for category, queries in search_queries.items()
+        for query in queries
+    ]
+
+
+def attribute_keywords(text: str,
+                       matchers: List[Tuple[str, str, List[re.Pattern]]]) -> Tuple[List[str], List[str]]:
+    """
+    Retrouve les catégories et mots-clés correspondant à une offre.
+    
+    Comme l'API interroge avec l'opérateur OR, un mot-clé correspond dès
+    que l'un de ses termes apparaît dans le texte.
+    
+    Args:
+        text: Titre et texte de l'offre
+        matchers: Motifs préparés par build_keyword_matchers
+        
+    Returns:
+        Tuple (catégories, mots-clés) correspondants, sans doublons
+    """
+    categories = []
+    keywords = []
+    for category, keyword, patterns in matchers:
+        if any(pattern.search(text) for pattern in patterns):
+            if category not in categories:
+                categories.append(category)
+            keywords.append(keyword)
+    return categories, keywords
\ No newline at end of file
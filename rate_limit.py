@@ -0,0 +1,216 @@
+"""
+Limitation adaptative du débit des appels aux services externes
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config import HTTP_BACKOFF_MAX, RATE_LIMITS, RATE_LIMIT_MIN_RATE
+
+
+# Codes HTTP signalant un dépassement de quota ou une surcharge du service
+THROTTLE_STATUS_CODES = {429, 503}
+
+# Gain de débit par seconde d'appels sous la latence cible (appels/s)
+_RATE_STEP = 0.1
+
+# Facteur de réduction appliqué au débit et au parallélisme en cas de limitation
+_DECREASE_FACTOR = 0.5
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """
+    Indique si une exception correspond à un dépassement de quota.
+
+    Les exceptions des clients Google exposent le code HTTP dans `code`.
+    """
+    return getattr(error, "code", None) in THROTTLE_STATUS_CODES
+
+
+class AdaptiveLimiter:
+    """
+    Limiteur partagé entre threads pour un service amont.
+
+    Le débit est imposé par un seau à jetons et le nombre d'appels
+    simultanés par un plafond ajusté en AIMD : augmentation additive tant
+    que les réponses arrivent sous la latence cible, division par deux à
+    chaque limitation (429/503), avec pause éventuelle imposée par
+    Retry-After.
+    """
+
+    def __init__(self, name: str, rate: float, max_rate: float,
+                 concurrency: int, max_concurrency: int, latency_target: float):
+        """
+        Args:
+            name: Nom affiché du limiteur
+            rate: Débit initial (appels par seconde)
+            max_rate: Débit maximal
+            concurrency: Nombre initial d'appels simultanés
+            max_concurrency: Nombre maximal d'appels simultanés
+            latency_target: Latence (s) au-delà de laquelle le débit n'augmente plus
+        """
+        self.name = name
+        self.rate = rate
+        self.max_rate = max_rate
+        self.concurrency = float(concurrency)
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.throttled = 0
+        self._cond = threading.Condition()
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._decrease_until = 0.0
+        self._in_flight = 0
+
+    def _refill(self, now: float) -> None:
+        """Ajoute les jetons accumulés depuis la dernière mise à jour."""
+        self._tokens = min(self._tokens + (now - self._updated) * self.rate, 1.0)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """
+        Bloque jusqu'à ce qu'un appel soit autorisé (jeton et place libre).
+
+        Chaque acquire() doit être suivi d'un release().
+        """
+        with self._cond:
+            while self._in_flight >= int(self.concurrency):
+                self._cond.wait()
+            self._in_flight += 1
+
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                self._cond.wait((1.0 - self._tokens) / self.rate)
+
+    def try_acquire(self) -> bool:
+        """
+        Autorise un appel seulement s'il peut partir sans attendre.
+
+        Returns:
+            True si une place et un jeton ont été réservés (release() à appeler)
+        """
+        with self._cond:
+            now = time.monotonic()
+            if self._in_flight >= int(self.concurrency) or now < self._paused_until:
+                return False
+            self._refill(now)
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self._in_flight += 1
+            return True
+
+    def release(self, latency: Optional[float] = None, throttled: bool = False,
+                retry_after: Optional[float] = None) -> None:
+        """
+        Libère la place d'un appel terminé et ajuste les limites.
+
+        Args:
+            latency: Durée de l'appel réussi (None = pas d'ajustement)
+            throttled: L'appel a été refusé pour dépassement de quota
+            retry_after: Délai imposé par le service avant un nouvel appel
+        """
+        with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                self.throttled += 1
+                self._decrease(now, retry_after)
+            elif latency is not None and latency <= self.latency_target:
+                # Augmentation additive : environ +1 par fenêtre d'appels
+                self.concurrency = min(self.concurrency + 1.0 / self.concurrency,
+                                       float(self.max_concurrency))
+                self.rate = min(self.rate + _RATE_STEP / self.rate, self.max_rate)
+            self._cond.notify_all()
+
+    def _decrease(self, now: float, retry_after: Optional[float]) -> None:
+        """Réduction multiplicative, au plus une fois par fenêtre de pause."""
+        # Retry-After est plafonné comme l'attente des nouvelles tentatives HTTP
+        pause = min(retry_after, HTTP_BACKOFF_MAX) if retry_after is not None else 1.0 / self.rate
+        self._paused_until = max(self._paused_until, now + pause)
+        self._tokens = 0.0
+        self._updated = now
+
+        # Les appels déjà en vol lors d'une limitation ne réduisent pas encore
+        if now >= self._decrease_until:
+            self.rate = max(self.rate * _DECREASE_FACTOR, RATE_LIMIT_MIN_RATE)
+            self.concurrency = max(self.concurrency * _DECREASE_FACTOR, 1.0)
+            self._decrease_until = now + pause
+
+    def call(self, func: Callable[[], Any], max_retries: int = 0) -> Any:
+        """
+        Exécute un appel sous le limiteur.
+
+        Les exceptions de dépassement de quota réduisent les limites et
+        l'appel est retenté après la pause, au plus max_retries fois.
+
+        Args:
+            func: Appel à effectuer, sans argument
+            max_retries: Nombre maximal de nouvelles tentatives
+
+        Returns:
+            Valeur renvoyée par func
+        """
+        for attempt in range(max_retries + 1):
+            self.acquire()
+            started = time.monotonic()
+            try:
+                result = func()
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                self.release(throttled=throttled)
+                if not throttled or attempt == max_retries:
+                    raise
+                continue
+            self.release(latency=time.monotonic() - started)
+            return result
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les limites courantes du limiteur."""
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "concurrency": int(self.concurrency),
+                "in_flight": self._in_flight,
+                "throttled": self.throttled
+            }
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(upstream: str, key: str = "") -> AdaptiveLimiter:
+    """
+    Retourne le limiteur partagé d'un service amont.
+
+    Args:
+        upstream: Service amont configuré dans RATE_LIMITS
+            ("reliefweb", "pages", "gemini")
+        key: Sous-clé optionnelle, un limiteur par valeur (ex: hôte, modèle)
+
+    Returns:
+        Limiteur créé au premier appel puis réutilisé
+    """
+    name = f"{upstream}:{key}" if key else upstream
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = AdaptiveLimiter(name, **RATE_LIMITS[upstream])
+            _limiters[name] = limiter
+        return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, float]]:
+    """Retourne les limites courantes de tous les limiteurs créés."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
\ No newline at end of file
@@ -1,79 +1,249 @@
 """
 Client pour interagir avec l'API ReliefWeb
 """
-import requests
 import time
-from typing import List, Dict
+import requests
+import http_client
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from condenser import normalize_lines
+from config import SYNC_STATE_PATH, QUERY_MAX_LENGTH, RELIEFWEB_MAX_IN_FLIGHT
+from query_planner import plan_queries, build_keyword_matchers, attribute_keywords
+from sync_state import load_sync_state, save_sync_state
 
 
-def find_job_urls(search_queries: Dict[str, List[str]]) -> List[str]:
+# Champs demandés à l'API pour construire des fiches d'offres complètes
+JOB_RECORD_FIELDS = ["url", "title", "date", "body", "source", "country"]
+
+
+def _to_job_record(job: Dict) -> Dict:
     """
-    Recherche des offres d'emploi sur ReliefWeb et retourne leurs URLs uniques.
+    Convertit une entrée brute de l'API en fiche d'offre structurée.
+    
+    Args:
+        job: Élément de la liste "data" renvoyée par l'API
+        
+    Returns:
+        Dictionnaire avec les métadonnées, le texte de l'offre et l'heure
+        de sa récupération ("fetched_at")
+    """
+    fields = job.get("fields", {})
+    dates = fields.get("date", {})
+    body = fields.get("body") or ""
+    
+    return {
+        "id": job.get("id"),
+        "url": fields.get("url"),
+        "title": fields.get("title", ""),
+        "body": normalize_lines(body),
+        "source": ", ".join(s.get("name", "") for s in fields.get("source", [])),
+        "country": ", ".join(c.get("name", "") for c in fields.get("country", [])),
+        "closing_date": dates.get("closing", ""),
+        "date_created": dates.get("created", ""),
+        "date_changed": dates.get("changed", ""),
+        "fetched_at": time.time()
+    }
+
+
+def _build_filter(since: Optional[str]) -> Dict:
+    """
+    Construit le filtre de la requête : offres publiées, modifiées depuis `since`.
+    """
+    status_filter = {"field": "status", "value": "published"}
+    if not since:
+        return status_filter
+    
+    return {
+        "operator": "AND",
+        "conditions": [
+            status_filter,
+            {"field": "date.changed", "value": {"from": since}}
+        ]
+    }
+
+
+def _fetch_page(base_url: str, query: str, since: Optional[str],
+                offset: int, limit: int) -> Dict:
+    """
+    Récupère une page de résultats d'une requête.
+    
+    Args:
+        base_url: URL de l'endpoint jobs de l'API
+        query: Chaîne de requête ReliefWeb
+        since: Date ISO minimale de modification (None = toutes les offres)
+        offset: Position du premier résultat
+        limit: Nombre de résultats par page
+        
+    Returns:
+        Réponse JSON décodée de l'API
+    """
+    # Payload pour l'API ReliefWeb V2
+    payload = {
+        "query": {
+            "value": query,
+            "fields": ["title", "body"],
+            "operator": "OR"
+        },
+        "filter": _build_filter(since),
+        "fields": {
+            "include": JOB_RECORD_FIELDS
+        },
+        "limit": limit,
+        "offset": offset
+    }
+    
+    # Débit et parallélisme réglés par le limiteur adaptatif "reliefweb"
+    response = http_client.post(base_url, json=payload, upstream="reliefweb")
+    response.raise_for_status()
+    return response.json()
+
+
+def _fetch_query(base_url: str, query: str, since: Optional[str]) -> Tuple[List[Dict], bool]:
+    """
+    Parcourt toutes les pages de résultats d'une requête.
+    
+    La première page donne le nombre total de résultats : les pages
+    suivantes sont alors récupérées en parallèle, sous le plafond de
+    requêtes simultanées et du limiteur adaptatif, puis fusionnées dans
+    l'ordre des offsets.
+    
+    Args:
+        base_url: URL de l'endpoint jobs de l'API
+        query: Chaîne de requête ReliefWeb
+        since: Date ISO minimale de modification (None = toutes les offres)
+        
+    Returns:
+        Tuple (fiches d'offres, True si toutes les pages ont été récupérées)
+    """
+    limit = 100  # Maximum par requête
+    
+    try:
+        first_page = _fetch_page(base_url, query, since, 0, limit)
+    except requests.exceptions.RequestException as e:
+        print(f"Erreur lors de la recherche pour '{query}': {e}")
+        return [], False
+    
+    pages = [first_page.get("data", [])]
+    total_count = first_page.get("totalCount", 0)
+    offsets = range(limit, total_count, limit)
+    completed = True
+    
+    if offsets:
+        with ThreadPoolExecutor(max_workers=RELIEFWEB_MAX_IN_FLIGHT) as executor:
+            futures = [
+                executor.submit(_fetch_page, base_url, query, since, offset, limit)
+                for offset in offsets
+            ]
+            # Les futures sont parcourues dans l'ordre des offsets
+            for offset, future in zip(offsets, futures):
+                try:
+                    pages.append(future.result().get("data", []))
+                except requests.exceptions.RequestException as e:
+                    print(f"Erreur lors de la recherche pour '{query}' (offset {offset}): {e}")
+                    completed = False
+    
+    records = [_to_job_record(job) for jobs in pages for job in jobs]
+    return records, completed
+
+
+def find_job_records(search_queries: Dict[str, List[str]],
+                     incremental: bool = False) -> List[Dict]:
+    """
+    Recherche des offres d'emploi sur ReliefWeb et retourne leurs fiches complètes.
+    
+    Les mots-clés de toutes les catégories sont fusionnés en quelques
+    requêtes OR, puis chaque offre est rattachée localement aux catégories
+    et mots-clés qui lui correspondent (clés "categories" et "keywords").
+    
+    Le texte de l'offre (champ "body") est récupéré dans les mêmes appels
+    paginés, ce qui évite de scraper chaque page d'offre.
+    
+    En mode incrémental, seules les offres créées ou modifiées depuis la
+    dernière synchronisation de chaque requête sont demandées. Les marqueurs
+    de synchronisation ne sont pas avancés ici : l'appelant les enregistre
+    avec commit_sync_state() une fois les offres traitées (clé
+    "sync_queries" : requêtes entièrement parcourues ayant renvoyé l'offre).
     
     Args:
         search_queries: Dictionnaire de catégories avec listes de mots-clés
+        incremental: Ne récupérer que les nouveautés depuis la dernière synchronisation
         
     Returns:
-        Liste d'URLs uniques des offres d'emploi trouvées
+        Liste de fiches d'offres uniques (clé "body" vide si l'API n'a pas
+        fourni de texte)
     """
     # API V2 avec appname dans l'URL
     base_url = "https://api.reliefweb.int/v2/jobs?appname=career-assistant"
-    all_urls = set()  # Utiliser un set pour éviter les doublons
-    
-    # Parcourir toutes les catégories et requêtes
-    for category, queries in search_queries.items():
-        for query in queries:
-            print(f"Recherche pour: {query} (catégorie: {category})")
-            
-            offset = 0
-            limit = 100  # Maximum par requête
-            
-            while True:
-                try:
-                    # Payload pour l'API ReliefWeb V2
-                    payload = {
-                        "query": {
-                            "value": query,
-                            "fields": ["title", "body"],
-                            "operator": "OR"
-                        },
-                        "filter": {
-                            "field": "status",
-                            "value": "published"
-                        },
-                        "fields": {
-                            "include": ["url", "title", "date"]
-                        },
-                        "limit": limit,
-                        "offset": offset
-                    }
-                    
-                    response = requests.post(base_url, json=payload, timeout=30)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    jobs = data.get("data", [])
-                    
-                    if not jobs:
-                        break  # Plus de résultats
-                    
-                    # Extraire les URLs
-                    for job in jobs:
-                        url = job.get("fields", {}).get("url")
-                        if url:
-                            all_urls.add(url)
-                    
-                    # Vérifier s'il y a plus de résultats
-                    total_count = data.get("totalCount", 0)
-                    if offset + limit >= total_count:
-                        break
-                    
-                    offset += limit
-                    time.sleep(0.5)  # Pause pour respecter l'API
-                    
-                except requests.exceptions.RequestException as e:
-                    print(f"Erreur lors de la recherche pour '{query}': {e}")
-                    break
+    all_records = {}  # Indexé par URL pour éviter les doublons
+    sync_state = load_sync_state(SYNC_STATE_PATH)
+    
+    # Parcourir les requêtes fusionnées
+    for query in plan_queries(search_queries, QUERY_MAX_LENGTH):
+        since = sync_state.get(query) if incremental else None
+        print(f"Recherche pour: {query}" + (f" depuis {since}" if since else ""))
+        
+        records, completed = _fetch_query(base_url, query, since)
+        for record in records:
+            if not record["url"]:
+                continue
+            record = all_records.setdefault(record["url"], {**record, "sync_queries": []})
+            # Seule une requête parcourue entièrement peut faire avancer son marqueur
+            if completed:
+                record["sync_queries"].append(query)
+    
+    # Attribution locale des catégories et mots-clés
+    matchers = build_keyword_matchers(search_queries)
+    for record in all_records.values():
+        record["categories"], record["keywords"] = attribute_keywords(
+            f"{record['title']} {record['body']}", matchers
+        )
+    
+    print(f"Total d'offres uniques trouvées: {len(all_records)}")
+    return list(all_records.values())
+
+
+def commit_sync_state(job_records: List[Dict], handled_urls: Iterable[str]) -> None:
+    """
+    Avance les marqueurs de synchronisation d'après les offres traitées.
+    
+    Le marqueur d'une requête passe à la plus récente date de modification
+    de ses offres, sauf si certaines n'ont pas été traitées (coupure à
+    max_jobs, budget atteint, hôte indisponible) : il s'arrête alors à la
+    plus ancienne d'entre elles, que la prochaine synchronisation
+    incrémentale redemandera (le filtre "from" est inclusif).
+    
+    Args:
+        job_records: Fiches renvoyées par find_job_records
+        handled_urls: URLs des offres traitées (analysées, rattachées comme
+            doublons ou écartées au pré-classement)
+    """
+    handled_urls = set(handled_urls)
+    latest: Dict[str, str] = {}
+    oldest_pending: Dict[str, str] = {}
+    for record in job_records:
+        date_changed = record["date_changed"]
+        for query in record.get("sync_queries", []):
+            if record["url"] in handled_urls:
+                latest[query] = max(latest.get(query, ""), date_changed)
+            else:
+                oldest_pending[query] = min(oldest_pending.get(query, date_changed), date_changed)
+    
+    sync_state = load_sync_state(SYNC_STATE_PATH)
+    for query in latest.keys() | oldest_pending.keys():
+        mark = oldest_pending.get(query, latest.get(query))
+        if mark:
+            sync_state[query] = mark
+    save_sync_state(SYNC_STATE_PATH, sync_state)
+
+
+def find_job_urls(search_queries: Dict[str, List[str]]) -> List[str]:
+    """
+    Recherche des offres d'emploi sur ReliefWeb et retourne leurs URLs uniques.
     
-    print(f"Total d'offres uniques trouvées: {len(all_urls)}")
-    return list(all_urls)
\ No newline at end of file
+    Args:
+        search_queries: Dictionnaire de catégories avec listes de mots-clés
+        
+    Returns:
+        Liste d'URLs uniques des offres d'emploi trouvées
+    """
+    return [record["url"] for record in find_job_records(search_queries)]
\ No newline at end of file
@@ -2,48 +2,187 @@
 Module de scraping pour extraire le contenu des pages d'offres d'emploi
 """
 import requests
-from bs4 import BeautifulSoup
+import http_client
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from circuit_breaker import CircuitBreaker
+from config import SCRAPER_TIMEOUT, SCRAPER_MAX_RETRIES, SCRAPER_MAX_BYTES, SCRAPER_CHUNK_SIZE
+from documents import detect_document_type
+from page_cache import PageCache
+from parse_pool import parse_pages
 
 
-def scrape_job_description(url: str) -> str:
+def _read_body(response: requests.Response, url: str, document_type: str) -> Optional[bytes]:
     """
-    Extrait le contenu textuel d'une page d'offre d'emploi.
+    Lit le corps d'une réponse en flux, dans la limite de SCRAPER_MAX_BYTES.
+    
+    Une page HTML trop grande est tronquée (le début porte l'essentiel de
+    l'offre) ; un document PDF ou DOCX tronqué étant illisible, il est ignoré.
+    
+    Returns:
+        Contenu lu, ou None si le document dépasse la limite
+    """
+    declared_length = response.headers.get("Content-Length", "")
+    too_large = declared_length.isdigit() and int(declared_length) > SCRAPER_MAX_BYTES
+    if document_type != "html" and too_large:
+        print(f"Document trop volumineux ignoré ({declared_length} octets): {url}")
+        return None
+    
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=SCRAPER_CHUNK_SIZE):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= SCRAPER_MAX_BYTES:
+            if document_type != "html":
+                print(f"Document trop volumineux ignoré (plus de {SCRAPER_MAX_BYTES} octets): {url}")
+                return None
+            print(f"Page tronquée à {SCRAPER_MAX_BYTES} octets: {url}")
+            break
+    return b"".join(chunks)[:SCRAPER_MAX_BYTES]
+
+
+def fetch_job_page(url: str, cache: Optional[PageCache] = None,
+                   breaker: Optional[CircuitBreaker] = None) -> Optional[Dict]:
+    """
+    Télécharge une page d'offre d'emploi (étape I/O du scraping).
+    
+    Avec un cache, la page est revalidée par GET conditionnel : une réponse
+    304 renvoie directement le texte déjà extrait, sans téléchargement.
+    
+    Avec un disjoncteur, les pages d'un hôte en échec sont ignorées sans
+    appel réseau et notées pour une nouvelle tentative.
     
     Args:
         url: URL de la page à scraper
+        cache: Cache disque des pages (optionnel)
+        breaker: Disjoncteur par hôte (optionnel)
         
     Returns:
-        Texte nettoyé de la page, ou chaîne vide en cas d'erreur
+        Dictionnaire avec "url" et soit "text" (page inchangée en cache), soit
+        "content", "content_type" ("html", "pdf" ou "docx"), "etag" et
+        "last_modified" (page à parser) ; None en cas d'erreur, de contenu
+        non pris en charge ou d'hôte ignoré
     """
+    host = urlparse(url).hostname or ""
+    if breaker is not None and not breaker.allow(host):
+        breaker.record_skip(url)
+        return None
+    
+    # Tout appel autorisé doit rendre un verdict au disjoncteur : sinon un
+    # appel d'essai d'un circuit semi-ouvert bloquerait l'hôte indéfiniment
+    settled = breaker is None
     try:
-        # Récupérer le contenu HTML
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        # Parser avec BeautifulSoup
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Supprimer les scripts et styles
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-        
-        # Extraire le texte
-        text = soup.get_text(separator=' ', strip=True)
+        cached = cache.get(url) if cache is not None else None
+        headers = cache.conditional_headers(cached) if cache is not None else {}
         
-        # Nettoyer les espaces multiples
-        text = ' '.join(text.split())
+        # Récupérer la réponse en flux (délais courts, un seul retry) : le
+        # corps n'est lu qu'après vérification de son type
+        try:
+            response = http_client.get(
+                url, headers=headers, timeout=SCRAPER_TIMEOUT,
+                max_retries=SCRAPER_MAX_RETRIES, stream=True
+            )
+        except requests.exceptions.RequestException:
+            if breaker is not None:
+                breaker.record_failure(host)
+                settled = True
+            raise
         
-        return text
+        with response:
+            # Seules les erreurs serveur comptent comme un échec de l'hôte :
+            # une erreur 4xx ou un contenu non pris en charge prouvent qu'il répond
+            if breaker is not None:
+                if response.status_code >= 500:
+                    breaker.record_failure(host)
+                else:
+                    breaker.record_success(host)
+                settled = True
+            
+            if response.status_code == 304 and cached is not None:
+                cache.touch(url)
+                return {"url": url, "text": cached["text"]}
+            
+            response.raise_for_status()
+            
+            document_type = detect_document_type(response.headers.get("Content-Type"), url)
+            if document_type is None:
+                print(f"Type de contenu non pris en charge pour {url}: "
+                      f"{response.headers.get('Content-Type')}")
+                return None
+            
+            try:
+                content = _read_body(response, url, document_type)
+            except requests.exceptions.RequestException:
+                if breaker is not None:
+                    breaker.record_failure(host)
+                raise
+            if content is None:
+                return None
+            
+            return {
+                "url": url,
+                "content": content,
+                "content_type": document_type,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
+            }
         
     except requests.exceptions.Timeout:
         print(f"Timeout lors du scraping de {url}")
-        return ""
+        return None
     except requests.exceptions.RequestException as e:
         print(f"Erreur de requête pour {url}: {e}")
-        return ""
+        return None
     except Exception as e:
         print(f"Erreur inattendue lors du scraping de {url}: {e}")
-        return ""
\ No newline at end of file
+        return None
+    finally:
+        if not settled:
+            breaker.release_trial(host)
+
+
+def parse_job_pages(pages: List[Dict], cache: Optional[PageCache] = None) -> List[str]:
+    """
+    Extrait le texte d'un lot de pages téléchargées (étape CPU du scraping).
+    
+    Le parsing est confié au pool de processus ; les pages déjà extraites
+    (réponses 304) sont reprises telles quelles.
+    
+    Args:
+        pages: Pages renvoyées par fetch_job_page
+        cache: Cache disque où conserver les pages revalidables (optionnel)
+        
+    Returns:
+        Textes nettoyés, dans l'ordre des pages (chaîne vide en cas d'échec)
+    """
+    to_parse = [page for page in pages if "text" not in page]
+    parsed = parse_pages([(page["content"], page["url"], page["content_type"])
+                          for page in to_parse])
+    
+    for page, text in zip(to_parse, parsed):
+        page["text"] = text
+        # Seules les pages revalidables sont conservées
+        if cache is not None and text and (page["etag"] or page["last_modified"]):
+            cache.store(page["url"], page["etag"], page["last_modified"], page["content"], text)
+    
+    return [page["text"] for page in pages]
+
+
+def scrape_job_description(url: str, cache: Optional[PageCache] = None,
+                           breaker: Optional[CircuitBreaker] = None) -> str:
+    """
+    Extrait le contenu textuel d'une page d'offre d'emploi.
+    
+    Args:
+        url: URL de la page à scraper
+        cache: Cache disque des pages (optionnel)
+        breaker: Disjoncteur par hôte (optionnel)
+        
+    Returns:
+        Texte nettoyé de la page, ou chaîne vide en cas d'erreur
+    """
+    page = fetch_job_page(url, cache, breaker)
+    if page is None:
+        return ""
+    return parse_job_pages([page], cache)[0]
\ No newline at end of file
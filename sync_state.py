@@ -0,0 +1,45 @@
+"""
+Persistance des marqueurs de synchronisation incrémentale avec ReliefWeb
+"""
+import json
+import os
+from typing import Dict
+
+
+def load_sync_state(path: str) -> Dict[str, str]:
+    """
+    Charge les dates de dernière synchronisation par requête.
+    
+    Args:
+        path: Chemin du fichier JSON d'état
+        
+    Returns:
+        Dictionnaire {requête: date ISO de la dernière modification vue}
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"État de synchronisation illisible ({path}): {e}")
+        return {}
+
+
+def save_sync_state(path: str, state: Dict[str, str]) -> None:
+    """
+    Enregistre les dates de dernière synchronisation par requête.
+    
+    Args:
+        path: Chemin du fichier JSON d'état
+        state: Dictionnaire {requête: date ISO}
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    # Écriture atomique pour ne pas corrompre l'état en cas d'interruption
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
\ No newline at end of file
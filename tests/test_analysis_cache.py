@@ -0,0 +1,59 @@
+"""
+Tests du cache persistant des analyses
+"""
+import time
+
+from analysis_cache import AnalysisCache
+
+
+ANALYSIS = {"verdict": "COMPATIBLE", "score_pertinence": 81, "analyse_succincte": "Très bon profil",
+            "points_forts": ["EMIS"], "points_faibles": []}
+
+
+def _cache(tmp_path, ttl_seconds=3600, max_entries=100) -> AnalysisCache:
+    return AnalysisCache(str(tmp_path / "analyses.sqlite"), ttl_seconds, max_entries)
+
+
+def test_round_trip_survives_reopening(tmp_path):
+    key = AnalysisCache.make_key("Data analyst", "Profil", "gemini-2.5-pro", "4")
+    _cache(tmp_path).set(key, ANALYSIS)
+
+    cache = _cache(tmp_path)
+    assert cache.get(key) == ANALYSIS
+    assert cache.stats() == {"hits": 1, "misses": 0, "entries": 1}
+
+
+def test_key_ignores_whitespace_but_not_versions():
+    key = AnalysisCache.make_key("Data  analyst\n", "Profil", "gemini-2.5-pro", "4")
+    assert key == AnalysisCache.make_key("Data analyst", " Profil", "gemini-2.5-pro", "4")
+    assert key != AnalysisCache.make_key("Data analyst", "Profil", "gemini-2.5-pro", "5")
+    assert key != AnalysisCache.make_key("Data analyst", "Profil", "gemini-2.5-flash", "4")
+    assert key != AnalysisCache.make_key("Data analyst", "Autre profil", "gemini-2.5-pro", "4")
+
+
+def test_prompt_version_change_misses(tmp_path):
+    cache = _cache(tmp_path)
+    cache.set(AnalysisCache.make_key("Data analyst", "Profil", "gemini-2.5-pro", "3"), ANALYSIS)
+    assert cache.get(AnalysisCache.make_key("Data analyst", "Profil", "gemini-2.5-pro", "4")) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = _cache(tmp_path, ttl_seconds=0.05)
+    cache.set("clé", ANALYSIS)
+    time.sleep(0.1)
+    assert cache.get("clé") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = _cache(tmp_path, max_entries=2)
+    cache.set("a", ANALYSIS)
+    time.sleep(0.01)
+    cache.set("b", ANALYSIS)
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", ANALYSIS)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ANALYSIS and cache.get("c") == ANALYSIS
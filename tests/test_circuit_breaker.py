@@ -0,0 +1,92 @@
+"""
+Tests du disjoncteur par hôte et de son usage par le scraper
+"""
+import pytest
+import requests
+
+import scraper
+from circuit_breaker import CircuitBreaker
+
+
+HOST = "jobs.example.org"
+URL = f"https://{HOST}/offre/1"
+
+
+def _response(status_code: int, content_type: str = "text/html") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers["Content-Type"] = content_type
+    response.url = URL
+    response._content = b""
+    return response
+
+
+@pytest.fixture
+def half_open_breaker():
+    """Disjoncteur dont le circuit de HOST est ouvert, délai écoulé."""
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.record_failure(HOST)
+    return breaker
+
+
+@pytest.mark.parametrize("response", [
+    _response(404),
+    _response(200, "image/png"),
+], ids=["404", "contenu non pris en charge"])
+def test_half_open_trial_answered_by_host_closes_circuit(half_open_breaker, monkeypatch, response):
+    monkeypatch.setattr(scraper.http_client, "get", lambda url, **kwargs: response)
+
+    assert scraper.fetch_job_page(URL, breaker=half_open_breaker) is None
+
+    # L'hôte a répondu : le circuit est refermé, les appels suivants passent
+    assert half_open_breaker.open_hosts() == []
+    assert half_open_breaker.allow(HOST)
+    assert half_open_breaker.allow(HOST)
+
+
+def test_half_open_trial_failing_locally_is_released(half_open_breaker, monkeypatch):
+    def broken_get(url, **kwargs):
+        raise RuntimeError("erreur locale")
+    monkeypatch.setattr(scraper.http_client, "get", broken_get)
+
+    assert scraper.fetch_job_page(URL, breaker=half_open_breaker) is None
+
+    # Aucun verdict : l'essai est libéré et un nouvel essai est permis
+    assert half_open_breaker.allow(HOST)
+    assert not half_open_breaker.allow(HOST)
+
+
+def test_half_open_trial_with_server_error_reopens_circuit(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure(HOST)
+    breaker._open_until[HOST] = 0
+    monkeypatch.setattr(scraper.http_client, "get", lambda url, **kwargs: _response(503))
+
+    assert scraper.fetch_job_page(URL, breaker=breaker) is None
+
+    assert breaker.open_hosts() == [HOST]
+    assert not breaker.allow(HOST)
+
+
+def test_circuit_opens_after_consecutive_failures_only():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+    breaker.record_failure(HOST)
+    breaker.record_failure(HOST)
+    breaker.record_success(HOST)
+    breaker.record_failure(HOST)
+    breaker.record_failure(HOST)
+    assert breaker.allow(HOST)
+
+    breaker.record_failure(HOST)
+    assert breaker.open_hosts() == [HOST]
+    assert not breaker.allow(HOST)
+    assert breaker.allow("autre.example.org")
+
+
+def test_skipped_urls_are_returned_once():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure(HOST)
+
+    assert scraper.fetch_job_page(URL, breaker=breaker) is None
+    assert breaker.pop_skipped() == [URL]
+    assert breaker.pop_skipped() == []
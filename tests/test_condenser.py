@@ -0,0 +1,66 @@
+"""
+Tests de la condensation des offres par sections
+"""
+from condenser import condense_job_text, split_sections
+
+
+BUDGET = 2000
+
+
+def test_only_explicit_headings_split_sections():
+    text = (
+        "**Requirements**\n"
+        "Commitment to safeguarding principles\n"
+        "Master's degree in statistics or a related field\n"
+        "Ability to apply statistical methods\n"
+        "Strong command of Stata and R"
+    )
+    sections = split_sections(text)
+    assert [heading for heading, _ in sections] == ["Requirements"]
+
+    condensed = condense_job_text(text, BUDGET).text
+    assert condensed.splitlines() == [
+        "Requirements:",
+        "Commitment to safeguarding principles",
+        "Master's degree in statistics or a related field",
+        "Ability to apply statistical methods",
+        "Strong command of Stata and R"
+    ]
+
+
+def test_boilerplate_heading_must_match_whole_title():
+    text = (
+        "## Responsibilities\n"
+        "Design household surveys and clean the resulting data.\n"
+        "Salary survey design:\n"
+        "Benchmark national pay scales against UN salary grades.\n"
+        "**How to apply**\n"
+        "Send your CV and cover letter through the online portal.\n"
+        "Salary and benefits:\n"
+        "Competitive package with health insurance."
+    )
+    condensed = condense_job_text(text, BUDGET).text
+    assert "Salary survey design:" in condensed
+    assert "Benchmark national pay scales" in condensed
+    assert "online portal" not in condensed
+    assert "health insurance" not in condensed
+
+
+def test_falls_back_to_original_text_when_almost_everything_is_removed():
+    text = (
+        "**About us**\n"
+        "We are a humanitarian organisation working in forty countries since 1970, "
+        "with a strong focus on education, health and livelihoods for displaced people.\n"
+        "We design and evaluate programmes with local partners and communities.\n"
+        "**Data analyst**\n"
+        "Build dashboards."
+    )
+    condensed = condense_job_text(text, BUDGET)
+    assert "humanitarian organisation" in condensed.text
+    assert "Build dashboards." in condensed.text
+
+
+def test_budget_is_respected_in_fallback():
+    text = "**Disclaimer**\n" + "Long disclaimer sentence. " * 200 + "\nShort job."
+    condensed = condense_job_text(text, 100)
+    assert condensed.condensed_tokens <= 101
@@ -0,0 +1,44 @@
+"""
+Tests de la détection des offres quasi identiques
+"""
+from dedup import find_near_duplicates, group_duplicates, hamming_distance, simhash
+
+
+BASE = (
+    "The Education Cluster is looking for an information management officer to "
+    "collect, clean and analyse education data from partners, maintain the 5W "
+    "matrix, produce dashboards in Power BI and support joint needs assessments "
+    "with KoboToolbox in coordination with the Ministry of Education. The officer "
+    "will design data collection tools, train partner staff on reporting, run "
+    "quality checks on submissions, map school damage and attendance, and write "
+    "monthly situation reports for donors. Candidates hold a degree in statistics, "
+    "information management or a related field, have at least three years of "
+    "experience in humanitarian data work, are fluent in English and French, and "
+    "master Excel, Power BI, KoboToolbox and a GIS package such as QGIS or ArcGIS."
+)
+REPOST = BASE + " Deadline extended."
+OTHER = (
+    "The logistics unit seeks a fleet coordinator to plan vehicle movements, "
+    "supervise drivers and mechanics, track fuel consumption, manage spare parts "
+    "stock and ensure compliance with security procedures for all field missions "
+    "across the northern region."
+)
+
+
+def test_simhash_is_stable_and_close_for_small_edits():
+    assert simhash(BASE) == simhash(BASE)
+    assert hamming_distance(simhash(BASE), simhash(REPOST)) <= 3
+    assert hamming_distance(simhash(BASE), simhash(OTHER)) > 3
+
+
+def test_near_duplicates_are_grouped_under_first_item():
+    texts = {"a": BASE, "b": OTHER, "c": REPOST, "d": BASE}
+    duplicates = find_near_duplicates(texts)
+
+    assert duplicates == {"c": "a", "d": "a"}
+    assert group_duplicates(duplicates) == {"a": ["c", "d"]}
+
+
+def test_distinct_and_short_texts_are_not_grouped():
+    texts = {"a": BASE, "b": OTHER, "c": "Data officer", "d": "Data officer"}
+    assert find_near_duplicates(texts) == {}
@@ -0,0 +1,80 @@
+"""
+Tests du stockage vectoriel et de l'embedder local déterministe
+"""
+import os
+
+import numpy as np
+
+from embeddings import HashingEmbedder, VectorStore, rank_jobs_semantic
+
+
+JOBS = {
+    "job/1": "Data analyst for education programmes, EMIS and Power BI dashboards",
+    "job/2": "Logistics officer managing warehouses and vehicle fleet",
+    "job/3": "Monitoring and evaluation specialist, education data quality"
+}
+PROFILE = "Education data analyst: EMIS, Power BI, monitoring and evaluation"
+
+
+def test_hashing_embedder_is_deterministic():
+    embedder = HashingEmbedder(64)
+    first = embedder.embed(list(JOBS.values()))
+    second = HashingEmbedder(64).embed(list(JOBS.values()))
+    assert first.shape == (3, 64)
+    assert np.array_equal(first, second)
+
+
+def test_round_trip_and_ranking(tmp_path):
+    embedder = HashingEmbedder()
+    store = VectorStore(str(tmp_path), embedder.name)
+    item_ids, scores = rank_jobs_semantic(store, embedder, JOBS, PROFILE)
+
+    assert store.missing(JOBS) == []
+    assert scores.max() == 1.0
+    assert scores[item_ids.index("job/2")] < scores[item_ids.index("job/1")]
+
+
+def test_reopened_store_keeps_vectors(tmp_path):
+    embedder = HashingEmbedder()
+    store = VectorStore(str(tmp_path), embedder.name)
+    store.add(JOBS, embedder.embed(list(JOBS.values())))
+    query = embedder.embed([PROFILE], is_query=True)[0]
+    expected = store.similarities(list(JOBS), query)
+
+    reopened = VectorStore(str(tmp_path), embedder.name)
+    assert reopened.missing(JOBS) == []
+    assert np.allclose(reopened.similarities(list(JOBS), query), expected)
+
+
+def test_changed_text_reuses_its_row(tmp_path):
+    embedder = HashingEmbedder()
+    store = VectorStore(str(tmp_path), embedder.name)
+    store.add(JOBS, embedder.embed(list(JOBS.values())))
+    size = os.path.getsize(store.vectors_path)
+
+    changed = dict(JOBS, **{"job/2": "Education data analyst with EMIS experience"})
+    assert store.missing(changed) == ["job/2"]
+    for _ in range(3):
+        store.add({"job/2": changed["job/2"]}, embedder.embed([changed["job/2"]]))
+    assert os.path.getsize(store.vectors_path) == size
+
+    query = embedder.embed([changed["job/2"]], is_query=True)[0]
+    reopened = VectorStore(str(tmp_path), embedder.name)
+    assert reopened.missing(changed) == []
+    assert np.isclose(reopened.similarities(["job/2"], query)[0], 1.0)
+
+
+def test_orphan_rows_are_compacted_on_open(tmp_path):
+    embedder = HashingEmbedder()
+    store = VectorStore(str(tmp_path), embedder.name)
+    store.add(JOBS, embedder.embed(list(JOBS.values())))
+    query = embedder.embed([PROFILE], is_query=True)[0]
+    expected = store.similarities(list(JOBS), query)
+
+    # Ligne orpheline ajoutée en fin de fichier, comme avant le remplacement en place
+    with open(store.vectors_path, "ab") as f:
+        f.write(np.ones(embedder.dimension, dtype=np.float32).tobytes())
+
+    reopened = VectorStore(str(tmp_path), embedder.name)
+    assert os.path.getsize(reopened.vectors_path) == 3 * 4 * embedder.dimension
+    assert np.allclose(reopened.similarities(list(JOBS), query), expected)
@@ -0,0 +1,135 @@
+"""
+Tests des analyseurs Gemini hors ligne, avec le modèle simulé
+"""
+import json
+
+import pytest
+
+import gemini_analyzer
+from analysis_cache import AnalysisCache
+from gemini_analyzer import (
+    REQUIRED_KEYS, SCREENING_REQUIRED_KEYS, FakeGenerativeModel, GeminiAnalyzer,
+    ScreeningAnalyzer
+)
+from profiles import Profile
+from rate_limit import AdaptiveLimiter
+
+
+JOB = "Data analyst for education programmes: EMIS, Kobotoolbox, Power BI, monitoring."
+OTHER_JOB = "Logistics officer managing warehouses, fleet and procurement."
+
+PROFILES = [
+    Profile("data", "Analyste de données", "Data analyst education EMIS Kobotoolbox Power BI"),
+    Profile("logistique", "Logisticien", "Logistics warehouse fleet procurement officer")
+]
+
+
+class ScriptedModel:
+    """Modèle simulé renvoyant des réponses prédéfinies, dans l'ordre."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def generate_content(self, contents, **kwargs):
+        text = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        return FakeGenerativeModel._respond(text, kwargs.get("stream", False))
+
+
+@pytest.fixture(autouse=True)
+def fast_limiter(monkeypatch):
+    """Limiteur sans attente : les tests n'éprouvent pas le débit de Gemini."""
+    limiter = AdaptiveLimiter("test", rate=1000.0, max_rate=1000.0, concurrency=8,
+                              max_concurrency=8, latency_target=60.0)
+    monkeypatch.setattr(gemini_analyzer, "get_limiter", lambda upstream, key="": limiter)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalysisCache(str(tmp_path / "analyses.sqlite"), ttl_seconds=3600, max_entries=100)
+
+
+def test_analyze_round_trip_is_deterministic():
+    analyzer = GeminiAnalyzer("", model=FakeGenerativeModel())
+    first = analyzer.analyze(JOB)
+    second = analyzer.analyze(JOB)
+
+    assert all(key in first for key in REQUIRED_KEYS)
+    assert first["verdict"] != "ERREUR"
+    assert first["modele"] == analyzer.model_name
+    assert first["score_pertinence"] == second["score_pertinence"]
+
+
+def test_screening_round_trip_completes_missing_fields():
+    analyzer = ScreeningAnalyzer("", model=FakeGenerativeModel())
+    analysis = analyzer.analyze(JOB)
+
+    assert all(key in analysis for key in SCREENING_REQUIRED_KEYS)
+    assert analysis["analyse_succincte"].startswith("Écartée au filtrage rapide")
+    assert analysis["points_forts"] == [] and analysis["points_faibles"] == []
+
+
+def test_batch_scores_every_profile_in_one_request():
+    model = FakeGenerativeModel(PROFILES)
+    analyzer = GeminiAnalyzer("", model=model, profiles=PROFILES)
+    results = analyzer.analyze_batch([JOB, OTHER_JOB])
+
+    assert model.calls == 1
+    assert [set(result) for result in results] == [{"data", "logistique"}] * 2
+    assert results[0]["data"]["score_pertinence"] > results[0]["logistique"]["score_pertinence"]
+    assert results[1]["logistique"]["score_pertinence"] > results[1]["data"]["score_pertinence"]
+
+
+def test_fenced_output_with_trailing_comma_is_repaired():
+    analysis = {"verdict": "COMPATIBLE", "score_pertinence": 80, "analyse_succincte": "Bon profil",
+                "points_forts": ["EMIS"], "points_faibles": []}
+    response = "```json\n" + json.dumps(analysis)[:-1] + ",}\n```"
+    model = ScriptedModel([response])
+    result = GeminiAnalyzer("", model=model).analyze(JOB)
+
+    assert model.calls == 1
+    assert result["verdict"] == "COMPATIBLE" and result["score_pertinence"] == 80
+
+
+def test_truncated_batch_keeps_complete_entries_and_retries_the_rest():
+    entry = {"job_id": "job_0", "verdict": "COMPATIBLE", "score_pertinence": 75,
+             "analyse_succincte": "Bon profil", "points_forts": [], "points_faibles": []}
+    single = {key: value for key, value in entry.items() if key != "job_id"}
+    single["score_pertinence"] = 10
+    truncated = "[" + json.dumps(entry) + ', {"job_id": "job_1", "verdict": "COMP'
+    model = ScriptedModel([truncated, json.dumps(single)])
+    results = GeminiAnalyzer("", model=model).analyze_batch([JOB, OTHER_JOB])
+
+    assert model.calls == 2
+    assert results[0]["principal"]["score_pertinence"] == 75
+    assert results[1]["principal"]["score_pertinence"] == 10
+
+
+def test_unreadable_output_is_retried_then_reported():
+    model = ScriptedModel(["pas de JSON ici"])
+    result = GeminiAnalyzer("", model=model).analyze(JOB)
+
+    assert model.calls == gemini_analyzer.ANALYSIS_MAX_ATTEMPTS
+    assert result["verdict"] == "ERREUR"
+
+
+def test_cache_hits_skip_the_model(cache):
+    model = FakeGenerativeModel(PROFILES)
+    analyzer = GeminiAnalyzer("", cache=cache, model=model, profiles=PROFILES)
+    first = analyzer.analyze_batch([JOB, OTHER_JOB])
+    second = analyzer.analyze_batch([JOB, OTHER_JOB])
+
+    assert model.calls == 1
+    assert cache.stats()["hits"] == 4
+    assert [{pid: a["score_pertinence"] for pid, a in result.items()} for result in first] == \
+        [{pid: a["score_pertinence"] for pid, a in result.items()} for result in second]
+
+
+def test_prompt_version_change_invalidates_cache(cache, monkeypatch):
+    model = FakeGenerativeModel()
+    GeminiAnalyzer("", cache=cache, model=model).analyze(JOB)
+    monkeypatch.setattr(GeminiAnalyzer, "prompt_version", "test-version")
+    GeminiAnalyzer("", cache=cache, model=model).analyze(JOB)
+
+    assert model.calls == 2
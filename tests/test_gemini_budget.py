@@ -0,0 +1,52 @@
+"""
+Tests du comptage de la consommation des appels Gemini
+"""
+import time
+
+import gemini_analyzer
+from condenser import estimate_tokens
+from gemini_analyzer import FakeGenerativeModel, GeminiAnalyzer
+from hedging import Hedger
+from rate_limit import AdaptiveLimiter
+
+
+class SlowFirstCallModel(FakeGenerativeModel):
+    """Modèle simulé dont le premier appel tarde avant de répondre."""
+
+    def generate_content(self, contents, **kwargs):
+        first = self.calls == 0
+        response = super().generate_content(contents, **kwargs)
+        if not first:
+            return response
+
+        def slow_stream():
+            time.sleep(0.3)
+            yield from response
+        return slow_stream()
+
+
+def test_losing_hedged_call_is_charged(monkeypatch):
+    hedger = Hedger("test", enabled=True, budget=1.0, percent=50, min_samples=1)
+    hedger.tracker.record(0.01)
+    monkeypatch.setattr(gemini_analyzer, "get_hedger", lambda name: hedger)
+    limiter = AdaptiveLimiter("test", rate=100.0, max_rate=100.0, concurrency=4,
+                              max_concurrency=4, latency_target=60.0)
+    monkeypatch.setattr(gemini_analyzer, "get_limiter", lambda upstream, key="": limiter)
+
+    analyzer = GeminiAnalyzer("", model=SlowFirstCallModel(), model_name="gemini-2.5-flash")
+    prompt = "Analyse this data analyst job in education."
+    response_text, usage = analyzer._generate(prompt)
+
+    assert hedger.hedges == 1
+    prompt_tokens = estimate_tokens(analyzer.system_instruction + prompt)
+    # Le doublon gagnant et le prompt de l'appel initial, interrompu avant toute sortie
+    assert usage["tokens_utilises"] == 2 * prompt_tokens + estimate_tokens(response_text)
+
+
+def test_projection_includes_hedge_budget(monkeypatch):
+    analyzer = GeminiAnalyzer("", model=FakeGenerativeModel())
+    monkeypatch.setattr(gemini_analyzer, "GEMINI_HEDGING", False)
+    tokens_without, _ = analyzer.project("job", 100)
+    monkeypatch.setattr(gemini_analyzer, "GEMINI_HEDGING", True)
+    tokens_with, _ = analyzer.project("job", 100)
+    assert tokens_with > tokens_without
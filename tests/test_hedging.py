@@ -0,0 +1,72 @@
+"""
+Tests des appels couverts (hedging) et de leur place dans le limiteur
+"""
+import threading
+import time
+
+from hedging import Hedger
+from rate_limit import AdaptiveLimiter
+
+
+def _hedger() -> Hedger:
+    hedger = Hedger("test", enabled=True, budget=1.0, percent=50, min_samples=1)
+    hedger.tracker.record(0.01)
+    return hedger
+
+
+def _limiter(concurrency: int = 4) -> AdaptiveLimiter:
+    return AdaptiveLimiter("test", rate=100.0, max_rate=100.0, concurrency=concurrency,
+                           max_concurrency=concurrency, latency_target=60.0)
+
+
+def _slow_then_fast():
+    """Premier appel lent, appels suivants immédiats."""
+    calls = []
+    lock = threading.Lock()
+
+    def func(cancel: threading.Event):
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.3)
+            return "lent"
+        return "rapide"
+    return func, calls
+
+
+def test_hedge_takes_its_own_limiter_slot():
+    hedger, limiter = _hedger(), _limiter()
+    func, calls = _slow_then_fast()
+
+    limiter.acquire()  # place de l'appel initial
+    assert hedger.call(func, limiter) == "rapide"
+    limiter.release()
+
+    assert len(calls) == 2
+    assert hedger.hedges == 1
+    time.sleep(0.4)
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_no_hedge_while_limiter_is_paused():
+    hedger, limiter = _hedger(), _limiter()
+    func, calls = _slow_then_fast()
+
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=5)
+    assert hedger.call(func, limiter) == "lent"
+
+    assert len(calls) == 1
+    assert hedger.hedges == 0
+
+
+def test_no_hedge_when_limiter_is_full():
+    hedger, limiter = _hedger(), _limiter(concurrency=1)
+    func, calls = _slow_then_fast()
+
+    limiter.acquire()  # seule place, occupée par l'appel initial
+    assert hedger.call(func, limiter) == "lent"
+    limiter.release()
+
+    assert len(calls) == 1
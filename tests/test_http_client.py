@@ -0,0 +1,15 @@
+"""
+Tests de la session HTTP partagée
+"""
+import sys
+
+import http_client
+
+
+def test_brotli_is_advertised_only_with_a_decoder(monkeypatch):
+    monkeypatch.setitem(sys.modules, "brotli", None)
+    monkeypatch.setitem(sys.modules, "brotlicffi", None)
+    assert http_client._accept_encoding() == "gzip, deflate"
+
+    monkeypatch.setitem(sys.modules, "brotli", object())
+    assert http_client._accept_encoding() == "gzip, deflate, br"
@@ -0,0 +1,78 @@
+"""
+Tests de l'historique des offres analysées
+"""
+from job_store import JobStore, text_hash
+
+
+def _record(index: int, closing_date: str = "2030-01-01", categories=("education",)) -> dict:
+    return {
+        "url": f"https://example.org/job/{index}",
+        "title": f"Job {index}",
+        "source": "Org",
+        "closing_date": f"{closing_date}T00:00:00+00:00",
+        "categories": list(categories),
+        "prerank_score": 0.5,
+        "fetched_at": 1_700_000_000.0
+    }
+
+
+def _analysis(score: int, verdict: str = "COMPATIBLE", model: str = "gemini-2.5-pro") -> dict:
+    return {"verdict": verdict, "score_pertinence": score, "analyse_succincte": "Analyse",
+            "points_forts": ["EMIS", "R"], "points_faibles": [], "modele": model,
+            "tokens_utilises": 1000, "cout_usd": 0.01, "tokens_economises": 200}
+
+
+def test_round_trip_survives_reopening(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    JobStore(path).save_job(_record(1), [("data", "Analyste", _analysis(80))], text_hash("texte"))
+
+    rows = JobStore(path).query()
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row["URL"], row["Profil"], row["Score"]) == ("https://example.org/job/1", "Analyste", 80)
+    assert row["Points Forts"] == "EMIS, R"
+    assert row["Date limite"] == "2030-01-01"
+    assert row["Tokens utilisés"] == 1000 and row["Coût ($)"] == 0.01
+
+
+def test_new_model_analysis_replaces_the_current_one(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    store.save_job(_record(1), [("data", "Analyste", _analysis(40, model="gemini-2.5-flash"))], "h")
+    store.save_job(_record(1), [("data", "Analyste", _analysis(85, model="gemini-2.5-pro"))], "h")
+
+    rows = store.query()
+    assert [(row["Modèle"], row["Score"]) for row in rows] == [("gemini-2.5-pro", 85)]
+
+
+def test_duplicates_do_not_count_spend(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    analyses = [("data", "Analyste", _analysis(70))]
+    store.save_job(_record(1), analyses, "h")
+    store.save_job(_record(2), analyses, "h", duplicate_of=_record(1)["url"])
+
+    rows = {row["URL"]: row for row in store.query()}
+    assert rows[_record(2)["url"]]["Doublon de"] == _record(1)["url"]
+    assert rows[_record(2)["url"]]["Coût ($)"] == 0.0
+    assert store.summary()["tokens_saved"] == 200
+
+
+def test_filters_sort_and_summary(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    store.save_job(_record(1, categories=("education", "data")),
+                   [("data", "Analyste", _analysis(90)),
+                    ("log", "Logisticien", _analysis(20, "NON COMPATIBLE"))], "h1")
+    store.save_job(_record(2, closing_date="2020-01-01"),
+                   [("data", "Analyste", _analysis(60, "MOYENNEMENT COMPATIBLE"))], "h2")
+
+    assert [row["Score"] for row in store.query()] == [90, 60, 20]
+    assert [row["Score"] for row in store.query(descending=False, limit=2)] == [20, 60]
+    assert [row["Score"] for row in store.query(profiles=["Analyste"], min_score=70)] == [90]
+    assert [row["Score"] for row in store.query(closing_after="2025-01-01")] == [90, 20]
+    assert [row["Score"] for row in store.query(categories=["data"])] == [90, 20]
+    assert [row["Score"] for row in store.query(verdicts=["MOYENNEMENT COMPATIBLE"])] == [60]
+
+    summary = store.summary(profiles=["Analyste"])
+    assert (summary["rows"], summary["jobs"], summary["max_score"], summary["compatible"]) == \
+        (2, 2, 90, 1)
+    assert store.category_counts() == {"education": 3, "data": 2}
+    assert store.distinct_values()["profiles"] == ["Analyste", "Logisticien"]
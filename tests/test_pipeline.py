@@ -0,0 +1,73 @@
+"""
+Tests du moteur d'exécution en pipeline
+"""
+import threading
+
+from pipeline import Stage, run_pipeline
+
+
+def _run(items, stages):
+    return list(run_pipeline(items, stages))
+
+
+def test_empty_input_ends_immediately():
+    stages = [Stage("double", lambda value: value * 2, workers=3),
+              Stage("lot", lambda values: values, workers=2, batch_size=4)]
+    assert _run([], stages) == []
+
+
+def test_every_item_comes_out_once_in_batches():
+    sizes = []
+    lock = threading.Lock()
+
+    def batch(values):
+        with lock:
+            sizes.append(len(values))
+        return [value + 1 for value in values]
+
+    stages = [Stage("double", lambda value: value * 2, workers=4),
+              Stage("lot", batch, workers=2, batch_size=5, batch_wait=0.2)]
+    results = _run(range(1, 41), stages)
+
+    assert sorted(result.result for result in results) == [2 * item + 1 for item in range(1, 41)]
+    assert all(result.item * 2 + 1 == result.result for result in results)
+    assert max(sizes) <= 5 and sum(sizes) == 40
+
+
+def test_drains_when_workers_raise():
+    def flaky(value):
+        if value % 3 == 0:
+            raise RuntimeError("échec simulé")
+        return value
+
+    def failing_batch(values):
+        if 10 in values:
+            raise RuntimeError("lot en échec")
+        return values
+
+    stages = [Stage("instable", flaky, workers=3),
+              Stage("lot", failing_batch, workers=2, batch_size=4)]
+    results = _run(range(1, 31), stages)
+
+    assert sorted(result.item for result in results) == list(range(1, 31))
+    dropped = {result.item: result.dropped_at for result in results if result.dropped_at}
+    assert all(dropped[item] == "instable" for item in range(3, 31, 3))
+    assert dropped.get(10) == "lot"
+    assert all(result.result == result.item for result in results if not result.dropped_at)
+
+
+def test_empty_results_drop_items():
+    stages = [Stage("filtre", lambda value: value if value % 2 else None, workers=2)]
+    results = _run(range(10), stages)
+
+    kept = sorted(result.item for result in results if result.dropped_at is None)
+    assert kept == [1, 3, 5, 7, 9]
+    assert len(results) == 10
+
+
+def test_consumer_can_stop_early():
+    stages = [Stage("identité", lambda value: value + 1, workers=2)]
+    results = run_pipeline(range(1, 1000), stages)
+    first = next(results)
+    results.close()
+    assert first.result >= 2
@@ -0,0 +1,30 @@
+"""
+Tests du chargement des profils de candidats
+"""
+from profiles import DEFAULT_PROFILE, load_profiles
+
+
+def test_profiles_are_loaded_with_heading_names(tmp_path):
+    (tmp_path / "Marie Dupont.md").write_text("# Marie D.\nAnalyste EMIS", encoding="utf-8")
+    (tmp_path / "jean.txt").write_text("Logisticien senior", encoding="utf-8")
+    (tmp_path / "notes.pdf").write_text("ignoré", encoding="utf-8")
+    (tmp_path / "vide.md").write_text("  \n", encoding="utf-8")
+
+    profiles = load_profiles(str(tmp_path))
+    assert [(profile.id, profile.name) for profile in profiles] == [
+        ("marie_dupont", "Marie D."), ("jean", "jean")
+    ]
+
+
+def test_colliding_ids_get_a_suffix(tmp_path):
+    (tmp_path / "a b.md").write_text("Profil un", encoding="utf-8")
+    (tmp_path / "a-b.md").write_text("Profil deux", encoding="utf-8")
+    (tmp_path / "a_b.txt").write_text("Profil trois", encoding="utf-8")
+
+    profiles = load_profiles(str(tmp_path))
+    assert [profile.id for profile in profiles] == ["a_b", "a_b_2", "a_b_3"]
+    assert len({profile.text for profile in profiles}) == 3
+
+
+def test_missing_directory_falls_back_to_default(tmp_path):
+    assert load_profiles(str(tmp_path / "absent")) == [DEFAULT_PROFILE]
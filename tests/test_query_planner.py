@@ -0,0 +1,40 @@
+"""
+Tests de la planification des requêtes et de l'attribution des catégories
+"""
+from query_planner import attribute_keywords, build_keyword_matchers, plan_queries
+
+
+SEARCH_QUERIES = {
+    "education": ["data analyst education", "EMIS"],
+    "evaluation": ["M&E specialist", "emis", "learning assessment"]
+}
+
+
+def test_keywords_are_merged_once_into_or_queries():
+    assert plan_queries(SEARCH_QUERIES, max_length=1000) == [
+        "(data analyst education) OR (EMIS) OR (M&E specialist) OR (learning assessment)"
+    ]
+
+
+def test_queries_are_split_at_max_length():
+    planned = plan_queries(SEARCH_QUERIES, max_length=40)
+    assert all(len(query) <= 40 for query in planned)
+    assert " OR ".join(planned).count("(") == 4
+
+
+def test_keyword_longer_than_max_length_gets_its_own_query():
+    planned = plan_queries({"a": ["short", "x" * 50, "end"]}, max_length=20)
+    assert planned == ["(short)", f"({'x' * 50})", "(end)"]
+
+
+def test_attribution_matches_whole_terms_and_plurals():
+    matchers = build_keyword_matchers(SEARCH_QUERIES)
+
+    categories, keywords = attribute_keywords("Senior assessments coordinator", matchers)
+    assert categories == ["evaluation"]
+    assert keywords == ["learning assessment"]
+
+    categories, _ = attribute_keywords("EMIS officer for the Ministry", matchers)
+    assert categories == ["education", "evaluation"]
+
+    assert attribute_keywords("Reassessment of premises", matchers) == ([], [])
@@ -0,0 +1,36 @@
+"""
+Tests du limiteur adaptatif de débit
+"""
+import time
+
+import rate_limit
+from rate_limit import AdaptiveLimiter
+
+
+def _limiter() -> AdaptiveLimiter:
+    return AdaptiveLimiter("test", rate=10.0, max_rate=10.0, concurrency=4,
+                           max_concurrency=4, latency_target=1.0)
+
+
+def test_retry_after_pause_is_capped(monkeypatch):
+    monkeypatch.setattr(rate_limit, "HTTP_BACKOFF_MAX", 0.2)
+    limiter = _limiter()
+
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=3600)
+
+    started = time.monotonic()
+    limiter.acquire()
+    limiter.release()
+    assert time.monotonic() - started < 1.0
+
+
+def test_throttle_halves_rate_and_concurrency():
+    limiter = _limiter()
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=0)
+
+    stats = limiter.stats()
+    assert stats["rate"] == 5.0
+    assert stats["concurrency"] == 2
+    assert stats["throttled"] == 1
@@ -0,0 +1,84 @@
+"""
+Tests du téléchargement en flux des pages d'offres
+"""
+import io
+
+import pytest
+import requests
+
+import scraper
+
+
+URL = "https://jobs.example.org/offre/1"
+
+
+class CountingBody(io.BytesIO):
+    """Corps de réponse comptant les octets effectivement lus."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _streamed(content_type: str, body: bytes, declared_length: bool = True) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = URL
+    response.headers["Content-Type"] = content_type
+    if declared_length:
+        response.headers["Content-Length"] = str(len(body))
+    response.raw = CountingBody(body)
+    return response
+
+
+@pytest.fixture
+def small_limit(monkeypatch):
+    monkeypatch.setattr(scraper, "SCRAPER_MAX_BYTES", 1000)
+    monkeypatch.setattr(scraper, "SCRAPER_CHUNK_SIZE", 100)
+
+
+def test_html_page_is_returned_whole(monkeypatch):
+    response = _streamed("text/html; charset=utf-8", b"<html><p>Data analyst</p></html>")
+    monkeypatch.setattr(scraper.http_client, "get", lambda url, **kwargs: response)
+
+    page = scraper.fetch_job_page(URL)
+    assert page["content"] == b"<html><p>Data analyst</p></html>"
+    assert page["content_type"] == "html"
+
+
+def test_large_html_page_is_truncated(small_limit, monkeypatch):
+    response = _streamed("text/html", b"x" * 5000, declared_length=False)
+    monkeypatch.setattr(scraper.http_client, "get", lambda url, **kwargs: response)
+
+    page = scraper.fetch_job_page(URL)
+    assert page["content"] == b"x" * 1000
+    assert response.raw.bytes_read < 5000
+
+
+def test_declared_oversized_pdf_is_skipped_unread(small_limit, monkeypatch):
+    response = _streamed("application/pdf", b"%PDF" + b"0" * 5000)
+    monkeypatch.setattr(scraper.http_client, "get", lambda url, **kwargs: response)
+
+    assert scraper.fetch_job_page(URL) is None
+    assert response.raw.bytes_read == 0
+
+
+def test_undeclared_oversized_pdf_is_skipped(small_limit, monkeypatch):
+    response = _streamed("application/pdf", b"%PDF" + b"0" * 5000, declared_length=False)
+    monkeypatch.setattr(scraper.http_client, "get", lambda url, **kwargs: response)
+
+    assert scraper.fetch_job_page(URL) is None
+    assert response.raw.bytes_read < 5000
+
+
+def test_unsupported_content_is_not_downloaded(monkeypatch):
+    response = _streamed("image/png", b"\x89PNG" + b"0" * 5000)
+    monkeypatch.setattr(scraper.http_client, "get", lambda url, **kwargs: response)
+
+    assert scraper.fetch_job_page(URL) is None
+    assert response.raw.bytes_read == 0
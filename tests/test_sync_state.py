@@ -0,0 +1,69 @@
+"""
+Tests des marqueurs de synchronisation incrémentale avec ReliefWeb
+"""
+import reliefweb_client
+from sync_state import load_sync_state
+
+
+SEARCH_QUERIES = {"education": ["data analyst education"]}
+
+
+def _fake_page_factory(jobs, calls):
+    """Simule l'API : offres modifiées depuis `since` (filtre inclusif)."""
+    def fake_page(base_url, query, since, offset, limit):
+        calls.append(since)
+        selected = [job for job in jobs if since is None or job["changed"] >= since]
+        return {
+            "totalCount": len(selected),
+            "data": [
+                {"id": job["id"], "fields": {
+                    "url": f"https://example.org/job/{job['id']}",
+                    "title": f"Job {job['id']}",
+                    "body": "data analyst education",
+                    "date": {"changed": job["changed"], "closing": "2030-01-01"}
+                }}
+                for job in selected[offset:offset + limit]
+            ]
+        }
+    return fake_page
+
+
+def test_unprocessed_records_come_back_when_max_jobs_is_smaller(tmp_path, monkeypatch):
+    jobs = [{"id": index, "changed": f"2024-02-{index + 1:02d}T00:00:00+00:00"}
+            for index in range(5)]
+    calls = []
+    monkeypatch.setattr(reliefweb_client, "SYNC_STATE_PATH", str(tmp_path / "sync.json"))
+    monkeypatch.setattr(reliefweb_client, "_fetch_page", _fake_page_factory(jobs, calls))
+
+    records = reliefweb_client.find_job_records(SEARCH_QUERIES, incremental=True)
+    assert len(records) == 5
+    # Aucun marqueur enregistré tant que les offres ne sont pas traitées
+    assert load_sync_state(str(tmp_path / "sync.json")) == {}
+
+    # max_jobs = 2 : seules les deux offres les plus récentes sont analysées
+    max_jobs = 2
+    ranked = sorted(records, key=lambda record: record["date_changed"], reverse=True)
+    handled = {record["url"] for record in ranked[:max_jobs]}
+    reliefweb_client.commit_sync_state(records, handled)
+
+    state = load_sync_state(str(tmp_path / "sync.json"))
+    assert list(state.values()) == ["2024-02-01T00:00:00+00:00"]
+
+    # La synchronisation suivante redemande toutes les offres non traitées
+    records = reliefweb_client.find_job_records(SEARCH_QUERIES, incremental=True)
+    assert calls[-1] == "2024-02-01T00:00:00+00:00"
+    returned = {record["url"] for record in records}
+    assert {record["url"] for record in ranked[max_jobs:]} <= returned
+
+
+def test_mark_advances_to_latest_change_when_everything_is_handled(tmp_path, monkeypatch):
+    jobs = [{"id": index, "changed": f"2024-02-{index + 1:02d}T00:00:00+00:00"}
+            for index in range(3)]
+    monkeypatch.setattr(reliefweb_client, "SYNC_STATE_PATH", str(tmp_path / "sync.json"))
+    monkeypatch.setattr(reliefweb_client, "_fetch_page", _fake_page_factory(jobs, []))
+
+    records = reliefweb_client.find_job_records(SEARCH_QUERIES, incremental=True)
+    reliefweb_client.commit_sync_state(records, {record["url"] for record in records})
+
+    state = load_sync_state(str(tmp_path / "sync.json"))
+    assert list(state.values()) == ["2024-02-03T00:00:00+00:00"]
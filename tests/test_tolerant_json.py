@@ -0,0 +1,43 @@
+"""
+Tests de la lecture tolérante des réponses JSON
+"""
+import pytest
+
+from tolerant_json import JsonStreamScanner, parse_json_response
+
+
+def test_fenced_json_with_trailing_commas():
+    text = '```json\n{"verdict": "COMPATIBLE", "points_forts": ["EMIS", "R",],}\n```'
+    assert parse_json_response(text) == {"verdict": "COMPATIBLE", "points_forts": ["EMIS", "R"]}
+
+
+def test_text_around_json_is_ignored():
+    text = 'Voici l\'analyse : [{"job_id": "job_0"}] Bonne journée.'
+    assert parse_json_response(text) == [{"job_id": "job_0"}]
+
+
+def test_truncated_array_keeps_complete_elements():
+    text = '[{"job_id": "job_0", "score": 80}, {"job_id": "job_1", "sco'
+    assert parse_json_response(text) == [{"job_id": "job_0", "score": 80}]
+
+
+def test_truncated_object_keeps_complete_members():
+    text = '{"verdict": "COMPATIBLE", "score_pertinence": 72, "analyse_succincte": "Bon pro'
+    assert parse_json_response(text) == {"verdict": "COMPATIBLE", "score_pertinence": 72}
+
+
+def test_brackets_inside_strings_do_not_confuse_truncation():
+    text = '[{"analyse": "voir [annexe] {b}"}, {"analyse": "coupé'
+    assert parse_json_response(text) == [{"analyse": "voir [annexe] {b}"}]
+
+
+def test_response_without_json_raises():
+    with pytest.raises(ValueError):
+        parse_json_response("Désolé, je ne peux pas répondre.")
+
+
+def test_stream_scanner_detects_closing_across_chunks():
+    scanner = JsonStreamScanner()
+    chunks = ['[{"a": "}]', ' x"}', ', {"b": 1}', ']', ' suite']
+    closed_at = [scanner.feed(chunk) for chunk in chunks]
+    assert closed_at == [False, False, False, True, True]
@@ -0,0 +1,111 @@
+"""
+Comptage des tokens, coût des appels Gemini et budget par exécution
+"""
+import threading
+from typing import Dict, Optional
+
+from condenser import estimate_tokens
+from config import GEMINI_PRICES_PER_MILLION
+
+
+def call_cost(model_name: str, prompt_tokens: int, output_tokens: int) -> float:
+    """
+    Coût en dollars d'un appel, d'après les tarifs de config.py.
+
+    Args:
+        model_name: Nom du modèle Gemini (coût nul si le tarif est inconnu)
+        prompt_tokens: Tokens envoyés
+        output_tokens: Tokens générés (raisonnement compris)
+    """
+    input_price, output_price = GEMINI_PRICES_PER_MILLION.get(model_name, (0.0, 0.0))
+    return (prompt_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def usage_from_metadata(usage_metadata, prompt: str, response_text: str) -> Dict[str, int]:
+    """
+    Lit la consommation réelle d'un appel dans usage_metadata.
+
+    Sans métadonnées (ex: modèle simulé, flux interrompu avant le dernier
+    morceau), les tokens sont estimés localement à partir des textes.
+
+    Returns:
+        Dictionnaire {"prompt_tokens": ..., "output_tokens": ...}
+    """
+    prompt_tokens = getattr(usage_metadata, "prompt_token_count", 0) or 0
+    output_tokens = (
+        (getattr(usage_metadata, "candidates_token_count", 0) or 0)
+        + (getattr(usage_metadata, "thoughts_token_count", 0) or 0)
+    )
+    return {
+        "prompt_tokens": prompt_tokens or estimate_tokens(prompt),
+        "output_tokens": output_tokens or estimate_tokens(response_text)
+    }
+
+
+class RunBudget:
+    """
+    Budget de tokens et/ou de dollars d'une exécution, partagé entre threads.
+
+    Chaque offre est admise sur sa consommation projetée, si elle tient dans
+    le budget restant ; la projection est ensuite remplacée par la
+    consommation réelle, ce qui libère la marge des projections prudentes
+    pour les offres suivantes.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, max_cost: Optional[float] = None):
+        """
+        Args:
+            max_tokens: Nombre maximum de tokens (None = illimité)
+            max_cost: Coût maximum en dollars (None = illimité)
+        """
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.projected_tokens = 0
+        self.projected_cost = 0.0
+        self.actual_tokens = 0
+        self.actual_cost = 0.0
+        self.rejected = 0
+        self._committed_tokens = 0
+        self._committed_cost = 0.0
+        self._lock = threading.Lock()
+
+    def admit(self, tokens: int, cost: float) -> bool:
+        """
+        Réserve la consommation projetée d'une offre si le budget le permet.
+
+        Returns:
+            True si l'offre peut être analysée
+        """
+        with self._lock:
+            over_tokens = (self.max_tokens is not None
+                           and self._committed_tokens + tokens > self.max_tokens)
+            over_cost = (self.max_cost is not None
+                         and self._committed_cost + cost > self.max_cost)
+            if over_tokens or over_cost:
+                self.rejected += 1
+                return False
+            self._committed_tokens += tokens
+            self._committed_cost += cost
+            self.projected_tokens += tokens
+            self.projected_cost += cost
+            return True
+
+    def settle(self, projected_tokens: int, projected_cost: float,
+               actual_tokens: int, actual_cost: float) -> None:
+        """Remplace la projection d'une offre analysée par sa consommation réelle."""
+        with self._lock:
+            self._committed_tokens += actual_tokens - projected_tokens
+            self._committed_cost += actual_cost - projected_cost
+            self.actual_tokens += actual_tokens
+            self.actual_cost += actual_cost
+
+    def stats(self) -> Dict[str, float]:
+        """Consommation projetée (offres admises) et réelle de l'exécution."""
+        with self._lock:
+            return {
+                "projected_tokens": self.projected_tokens,
+                "projected_cost": self.projected_cost,
+                "actual_tokens": self.actual_tokens,
+                "actual_cost": self.actual_cost,
+                "rejected": self.rejected
+            }
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Lecture tolérante des réponses JSON des modèles
+"""
+import json
+import re
+from typing import Any, List
+
+
+# Virgule superflue avant la fermeture d'un objet ou d'un tableau
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def strip_code_fences(text: str) -> str:
+    """Enlève les blocs de code markdown éventuels autour d'une réponse JSON."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("```")[1]
+        if text.startswith("json"):
+            text = text[4:]
+        text = text.strip()
+    return text
+
+
+def _truncate_to_last_element(text: str) -> str:
+    """
+    Referme un JSON tronqué (ex: limite de tokens de sortie atteinte).
+
+    Le texte est coupé après le dernier élément complet du conteneur de
+    premier niveau, qui est ensuite refermé : les éléments entiers sont
+    conservés, l'élément interrompu est abandonné.
+    """
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    last_cut = None
+
+    for position, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(char)
+        elif char in "}]":
+            if not stack:
+                break
+            stack.pop()
+            if len(stack) == 1:
+                last_cut = position + 1
+            elif not stack:
+                return text[:position + 1]
+        elif char == "," and len(stack) == 1:
+            last_cut = position
+
+    if not stack:
+        return text
+    if last_cut is None:
+        return text[:1] + _CLOSERS[stack[0]]
+    return text[:last_cut].rstrip().rstrip(",") + _CLOSERS[stack[0]]
+
+
+class JsonStreamScanner:
+    """
+    Suit une réponse JSON reçue par morceaux et détecte la fermeture de la
+    valeur de premier niveau, pour arrêter la lecture du flux au plus tôt.
+    """
+
+    def __init__(self):
+        self.closed = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> bool:
+        """
+        Ajoute un morceau de réponse.
+
+        Returns:
+            True dès que l'objet ou le tableau de premier niveau est fermé
+        """
+        for char in text:
+            if self.closed:
+                break
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self._depth > 0
+            elif char in _CLOSERS:
+                self._depth += 1
+            elif char in "}]" and self._depth > 0:
+                self._depth -= 1
+                self.closed = self._depth == 0
+        return self.closed
+
+
+def parse_json_response(text: str) -> Any:
+    """
+    Décode une réponse JSON de modèle en corrigeant les défauts courants.
+
+    Les corrections, tentées de la moins à la plus invasive : blocs de code
+    markdown, texte avant ou après le JSON, virgules superflues, et réponse
+    tronquée (seuls les éléments complets sont conservés).
+
+    Args:
+        text: Texte brut de la réponse
+
+    Returns:
+        Valeur JSON décodée
+
+    Raises:
+        ValueError: Si aucun JSON exploitable n'a pu être extrait
+    """
+    text = strip_code_fences(text)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    starts = [position for position in (text.find("{"), text.find("[")) if position >= 0]
+    if not starts:
+        raise ValueError("Aucun JSON dans la réponse")
+    candidate = text[min(starts):]
+
+    decoder = json.JSONDecoder()
+    for repair in (lambda value: value,
+                   lambda value: _TRAILING_COMMA.sub(r"\1", value),
+                   lambda value: _truncate_to_last_element(_TRAILING_COMMA.sub(r"\1", value))):
+        try:
+            # raw_decode ignore le texte qui suit la valeur JSON
+            return decoder.raw_decode(repair(candidate))[0]
+        except json.JSONDecodeError:
+            continue
+
+    raise ValueError("Réponse JSON irréparable")
\ No newline at end of file